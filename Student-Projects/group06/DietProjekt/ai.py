@@ -1,6 +1,10 @@
 import os
 import json
-from typing import Dict, Any, Optional
+import hashlib
+import http.client
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, List, Optional
 
 # --- OpenAI optional ---
 try:
@@ -14,7 +18,25 @@ except Exception:
     OpenAI = None
 
 # --- Ollama local ---
-import urllib.request
+OLLAMA_HOST = "localhost"
+OLLAMA_PORT = 11434
+OLLAMA_MODEL = "llama3"
+# Idle keep-alive connections kept for reuse
+OLLAMA_POOL_SIZE = 4
+
+# Recent answers, so repeated button clicks don't call the model again
+CACHE_SIZE = 128
+_cache: "OrderedDict[str, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+# One OpenAI client per API key, reused across calls
+_client = None
+_client_key = None
+
+# Keep-alive connections to Ollama, shared by the whole app
+# (Streamlit runs every rerun on a new thread, so they can't be per thread)
+_ollama_idle: List[http.client.HTTPConnection] = []
+_ollama_lock = threading.Lock()
 
 
 def _get_key() -> Optional[str]:
@@ -30,39 +52,152 @@ def _get_key() -> Optional[str]:
 
 
 def _openai_client() -> Optional["OpenAI"]:
+    global _client, _client_key
     if OpenAI is None:
         return None
     key = _get_key()
     if not key:
         return None
-    return OpenAI(api_key=key)
+    if _client is None or key != _client_key:
+        _client = OpenAI(api_key=key)
+        _client_key = key
+    return _client
+
+
+def _take_connection() -> http.client.HTTPConnection:
+    with _ollama_lock:
+        if _ollama_idle:
+            return _ollama_idle.pop()
+    return http.client.HTTPConnection(OLLAMA_HOST, OLLAMA_PORT, timeout=60)
+
 
+def _release_connection(conn: http.client.HTTPConnection) -> None:
+    with _ollama_lock:
+        if len(_ollama_idle) < OLLAMA_POOL_SIZE:
+            _ollama_idle.append(conn)
+            return
+    conn.close()
 
-def _ollama_generate(prompt: str, model: str = "llama3") -> str:
+
+def _ollama_stream(prompt: str, model: str = OLLAMA_MODEL) -> Iterator[str]:
     """
     Call local Ollama server: http://localhost:11434/api/generate
+    Streams the answer chunk by chunk over a reused keep-alive connection.
     """
-    url = "http://localhost:11434/api/generate"
-    payload = {"model": model, "prompt": prompt, "stream": False}
-    data = json.dumps(payload).encode("utf-8")
-
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={"Content-Type": "application/json"},
-        method="POST",
+    payload = json.dumps({
+        "model": model,
+        "prompt": prompt,
+        "stream": True,
+        # Keep the model loaded between requests
+        "keep_alive": "30m",
+    }).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+
+    conn = _take_connection()
+    try:
+        try:
+            conn.request("POST", "/api/generate", body=payload, headers=headers)
+            resp = conn.getresponse()
+        except (http.client.HTTPException, OSError):
+            # Server closed the idle connection: reconnect once
+            conn.close()
+            conn.request("POST", "/api/generate", body=payload, headers=headers)
+            resp = conn.getresponse()
+
+        if resp.status != 200:
+            body = resp.read().decode("utf-8", "replace")
+            raise RuntimeError(f"Ollama HTTP {resp.status}: {body}")
+
+        # One JSON object per line, the last one has "done": true.
+        # Reading to the end leaves the connection ready for the next request.
+        done = False
+        for line in resp:
+            if not line.strip():
+                continue
+            out = json.loads(line)
+            if out.get("error"):
+                raise RuntimeError(f"Ollama: {out['error']}")
+            if out.get("response"):
+                yield out["response"]
+            if out.get("done"):
+                done = True
+        if not done:
+            raise RuntimeError("Ollama closed the stream before the answer was complete")
+    except BaseException:
+        # Failed or abandoned mid-answer: the connection can't be reused
+        conn.close()
+        raise
+    _release_connection(conn)
+
+
+def _openai_stream(client: "OpenAI", prompt: str, temperature: float) -> Iterator[str]:
+    stream = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "Educational nutrition helper. No medical advice."},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=temperature,
+        stream=True,
     )
-    with urllib.request.urlopen(req, timeout=60) as resp:
-        out = json.loads(resp.read().decode("utf-8"))
-    return out.get("response", "").strip()
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def _cache_key(*parts: Any) -> str:
+    data = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _generate(key: str, prompt: str, temperature: float, error_hint: str) -> Iterator[str]:
+    # Cached answer first, then OpenAI, then Ollama; only complete answers are cached
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            yield _cache[key]
+            return
+
+    parts = []
+    sources = []
+
+    client = _openai_client()
+    if client is not None:
+        sources.append(lambda: _openai_stream(client, prompt, temperature))
+    sources.append(lambda: _ollama_stream(prompt))
+
+    error: Optional[Exception] = None
+    for source in sources:
+        try:
+            for piece in source():
+                parts.append(piece)
+                yield piece
+        except Exception as e:
+            error = e
+            if parts:
+                # Failed mid-answer: keep what was shown, say it is incomplete,
+                # don't cache it
+                yield "\n\n" + _safe_text(e)
+                return
+            continue
+        break
+    else:
+        yield error_hint + "\n" + _safe_text(error)
+        return
+
+    text = "".join(parts).strip()
+    with _cache_lock:
+        _cache[key] = text
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
 
 
 def _safe_text(err: Exception) -> str:
     return f"❌ خطا: {type(err).__name__} — {err}"
 
 
-def explain_plan_fa(profile: Dict[str, Any], plan: Dict[str, Any]) -> str:
-    prompt = f"""
+def _explain_prompt(profile: Dict[str, Any], plan: Dict[str, Any]) -> str:
+    return f"""
 تو یک دستیار آموزشی هستی (نه پزشک).
 به زبان فارسی خیلی ساده توضیح بده:
 1) این برنامه برای هدف کاربر به طور کلی مناسب هست یا نه (آموزشی)
@@ -79,32 +214,22 @@ def explain_plan_fa(profile: Dict[str, Any], plan: Dict[str, Any]) -> str:
 {plan}
 """.strip()
 
-    # 1) try OpenAI
-    client = _openai_client()
-    if client is not None:
-        try:
-            resp = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "Educational nutrition helper. No medical advice."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.4,
-            )
-            return resp.choices[0].message.content.strip()
-        except Exception:
-            # fallback to ollama
-            pass
 
-    # 2) fallback Ollama
-    try:
-        return _ollama_generate(prompt)
-    except Exception as e:
-        return "❌ KI فعال نیست. (نه OpenAI quota داری، نه Ollama اجرا شده)\n" + _safe_text(e)
+def explain_plan_fa_stream(profile: Dict[str, Any], plan: Dict[str, Any]) -> Iterator[str]:
+    return _generate(
+        _cache_key("explain", profile, plan),
+        _explain_prompt(profile, plan),
+        temperature=0.4,
+        error_hint="❌ KI فعال نیست. (نه OpenAI quota داری، نه Ollama اجرا شده)",
+    )
 
 
-def swap_meal_suggestion_fa(day_plan: Dict[str, Any], meal_type_fa: str) -> str:
-    prompt = f"""
+def explain_plan_fa(profile: Dict[str, Any], plan: Dict[str, Any]) -> str:
+    return "".join(explain_plan_fa_stream(profile, plan)).strip()
+
+
+def _swap_prompt(day_plan: Dict[str, Any], meal_type_fa: str) -> str:
+    return f"""
 تو یک دستیار آموزشی تغذیه هستی.
 برای وعده «{meal_type_fa}» در برنامه زیر، 3 جایگزین ساده پیشنهاد بده.
 - غذاها ساده و در دسترس باشند
@@ -115,24 +240,15 @@ def swap_meal_suggestion_fa(day_plan: Dict[str, Any], meal_type_fa: str) -> str:
 {day_plan}
 """.strip()
 
-    # 1) try OpenAI
-    client = _openai_client()
-    if client is not None:
-        try:
-            resp = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "Educational nutrition helper. No medical advice."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.6,
-            )
-            return resp.choices[0].message.content.strip()
-        except Exception:
-            pass
 
-    # 2) fallback Ollama
-    try:
-        return _ollama_generate(prompt)
-    except Exception as e:
-        return "❌ KI فعال نیست. (Ollama اجرا نشده یا مدل نصب نیست)\n" + _safe_text(e)
+def swap_meal_suggestion_fa_stream(day_plan: Dict[str, Any], meal_type_fa: str) -> Iterator[str]:
+    return _generate(
+        _cache_key("swap", day_plan, meal_type_fa),
+        _swap_prompt(day_plan, meal_type_fa),
+        temperature=0.6,
+        error_hint="❌ KI فعال نیست. (Ollama اجرا نشده یا مدل نصب نیست)",
+    )
+
+
+def swap_meal_suggestion_fa(day_plan: Dict[str, Any], meal_type_fa: str) -> str:
+    return "".join(swap_meal_suggestion_fa_stream(day_plan, meal_type_fa)).strip()
@@ -2,8 +2,8 @@ import json
 import streamlit as st
 
 from diet_logic import UserProfile, generate_week_plan
-from utils import save_plan
-from ai import explain_plan_fa, swap_meal_suggestion_fa
+from utils import save_plan, list_plans, load_plan
+from ai import explain_plan_fa_stream, swap_meal_suggestion_fa_stream
 
 st.set_page_config(page_title="DietBot", page_icon="🥗")
 
@@ -29,6 +29,28 @@ with st.sidebar:
     goal_fa = st.selectbox("هدف", ["کاهش وزن", "حفظ وزن", "افزایش وزن"])
     meals = st.selectbox("تعداد وعده در روز", [3, 4, 5], index=1)
 
+    # --- Saved plans ---
+    with st.expander("📂 برنامه‌های ذخیره‌شده"):
+        saved = list_plans()
+        if saved:
+            choice = st.selectbox(
+                "انتخاب برنامه",
+                saved,
+                format_func=lambda p: f"{p['created_at']} — {p['kcal_target']} kcal",
+            )
+            if st.button("📥 بارگذاری"):
+                loaded = load_plan(choice["id"])
+                if loaded is None:
+                    # Deleted meanwhile (or the store was reset)
+                    st.warning("این برنامه دیگر وجود ندارد.")
+                else:
+                    loaded_plan, loaded_profile = loaded
+                    st.session_state["plan"] = loaded_plan
+                    st.session_state["profile_dict"] = loaded_profile
+                    st.session_state["plan_id"] = choice["id"]
+        else:
+            st.caption("هنوز برنامه‌ای ذخیره نشده است.")
+
 def map_inputs():
     gender = "male" if gender_fa == "مرد" else "female"
     activity = {"کم": "low", "متوسط": "medium", "زیاد": "high"}[activity_fa]
@@ -64,11 +86,14 @@ with col1:
         plan = generate_week_plan(profile)
         st.session_state["plan"] = plan
         st.session_state["profile_dict"] = profile_dict
+        # Saved once per generated plan, not on every rerun
+        st.session_state["plan_id"] = save_plan(plan, profile_dict)
 
 with col2:
     if st.button("🗑️ پاک کردن برنامه", use_container_width=True):
         st.session_state.pop("plan", None)
         st.session_state.pop("profile_dict", None)
+        st.session_state.pop("plan_id", None)
 
 # ---------- If plan exists, show it ----------
 plan = st.session_state.get("plan")
@@ -83,18 +108,15 @@ if plan:
     c1, c2 = st.columns([1, 1])
     with c1:
         if st.button("💡 توضیح بده این برنامه چطوره؟", use_container_width=True):
-            with st.spinner("در حال تولید توضیح..."):
-                txt = explain_plan_fa(saved_profile, plan)
-            st.write(txt)
+            # Streamed as it is generated; repeated clicks are served from cache
+            st.write_stream(explain_plan_fa_stream(saved_profile, plan))
 
     with c2:
         day_index = st.number_input("شماره روز (۱ تا ۷)", min_value=1, max_value=7, value=1)
         meal_choice = st.selectbox("کدام وعده؟", ["صبحانه", "ناهار", "شام", "میان‌وعده"])
         if st.button("✨ 3 جایگزین پیشنهاد بده", use_container_width=True):
-            with st.spinner("در حال تولید جایگزین‌ها..."):
-                day = plan["days"][int(day_index) - 1]
-                sug = swap_meal_suggestion_fa(day, meal_choice)
-            st.write(sug)
+            day = plan["days"][int(day_index) - 1]
+            st.write_stream(swap_meal_suggestion_fa_stream(day, meal_choice))
 
     st.divider()
 
@@ -114,9 +136,8 @@ if plan:
         st.write(f"جمع کالری این روز: **{day['total_kcal']}** (هدف: {day['target_kcal']})")
         st.divider()
 
-    # --- Save + download ---
-    path = save_plan(plan)
-    st.info(f"برنامه در فایل ذخیره شد: {path}")
+    # --- Saved id + download ---
+    st.info(f"برنامه ذخیره شد (شناسه: {st.session_state.get('plan_id')})")
 
     st.download_button(
         label="⬇️ دانلود خروجی JSON",
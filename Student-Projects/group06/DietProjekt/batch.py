@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from diet_logic import ACTIVITY_FACTORS, UserProfile
+from planner import plan_week
+
+CSV_FIELDS = ("age", "gender", "height_cm", "weight_kg", "activity", "goal", "meals_per_day")
+
+# Profiles sent to a worker process per task
+CHUNK_SIZE = 500
+
+
+def _parse_row(row: Dict[str, Optional[str]]) -> UserProfile:
+    # Raises ValueError with a readable message for empty or invalid cells
+    values = {c: (row.get(c) or "").strip() for c in CSV_FIELDS}
+    empty = [c for c in CSV_FIELDS if not values[c]]
+    if empty:
+        raise ValueError(f"empty {', '.join(empty)}")
+
+    profile = UserProfile(
+        age=int(values["age"]),
+        gender=values["gender"],
+        height_cm=float(values["height_cm"]),
+        weight_kg=float(values["weight_kg"]),
+        activity=values["activity"],
+        goal=values["goal"],
+        meals_per_day=int(values["meals_per_day"]),
+    )
+
+    if profile.gender not in ("male", "female"):
+        raise ValueError(f"invalid gender {profile.gender!r}")
+    if profile.activity not in ACTIVITY_FACTORS:
+        raise ValueError(f"invalid activity {profile.activity!r}")
+    if profile.goal not in ("lose", "maintain", "gain"):
+        raise ValueError(f"invalid goal {profile.goal!r}")
+    if profile.meals_per_day not in (3, 4, 5):
+        raise ValueError(f"invalid meals_per_day {profile.meals_per_day!r}")
+    return profile
+
+
+def load_profiles_csv(path: str) -> Tuple[List[str], List[UserProfile], List[str]]:
+    # Columns: CSV_FIELDS, plus an optional "id" column (row number otherwise).
+    # Invalid rows are skipped and returned as "Row N: reason" messages,
+    # so one bad cell does not stop the whole batch.
+    ids: List[str] = []
+    profiles: List[UserProfile] = []
+    skipped: List[str] = []
+
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        missing = [c for c in CSV_FIELDS if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"CSV is missing columns: {', '.join(missing)}")
+
+        for row_no, row in enumerate(reader, start=1):
+            try:
+                profile = _parse_row(row)
+            except ValueError as e:
+                skipped.append(f"Row {row_no}: {e}")
+                continue
+
+            ids.append((row.get("id") or "").strip() or str(row_no))
+            profiles.append(profile)
+
+    return ids, profiles, skipped
+
+
+def target_calories_batch(profiles: List[UserProfile]) -> np.ndarray:
+    # Vectorized diet_logic.calc_bmr / target_calories (same formulas, same rounding)
+    n = len(profiles)
+    age = np.fromiter((p.age for p in profiles), dtype=float, count=n)
+    height = np.fromiter((p.height_cm for p in profiles), dtype=float, count=n)
+    weight = np.fromiter((p.weight_kg for p in profiles), dtype=float, count=n)
+    male = np.fromiter((p.gender == "male" for p in profiles), dtype=bool, count=n)
+    factor = np.fromiter((ACTIVITY_FACTORS[p.activity] for p in profiles), dtype=float, count=n)
+    goal_adjust = np.fromiter(
+        ({"lose": -400, "gain": 300}.get(p.goal, 0) for p in profiles), dtype=float, count=n
+    )
+
+    # Mifflin-St Jeor
+    bmr = 10 * weight + 6.25 * height - 5 * age + np.where(male, 5, -161)
+    tdee = np.maximum(bmr * factor + goal_adjust, 1200)
+    return np.rint(tdee).astype(int)
+
+
+def _profile_rng(seed: int, index: int) -> random.Random:
+    # Deterministic per-profile stream: the same (seed, index) gives the same
+    # plan regardless of worker count or chunking
+    return random.Random(f"{seed}:{index}")
+
+
+def _plan_chunk(args: Tuple[int, List[int], List[int], int]) -> List[Dict]:
+    start, kcals, meals, seed = args
+    return [
+        {"kcal_target": kcal, "days": plan_week(kcal, m, _profile_rng(seed, start + i))}
+        for i, (kcal, m) in enumerate(zip(kcals, meals))
+    ]
+
+
+def _plan_chunk_jsonl(args: Tuple[int, List[int], List[int], int, List[str], List[Dict]]) -> str:
+    # Serialized in the worker too, so JSON encoding scales with the pool
+    *plan_args, ids, profiles = args
+    lines = [
+        json.dumps({"id": pid, "profile": profile, **plan}, ensure_ascii=False)
+        for pid, profile, plan in zip(ids, profiles, _plan_chunk(tuple(plan_args)))
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _tasks(profiles: List[UserProfile], seed: int, chunk_size: int) -> List[Tuple]:
+    kcals = target_calories_batch(profiles).tolist()
+    meals = [p.meals_per_day for p in profiles]
+    return [
+        (start, kcals[start:start + chunk_size], meals[start:start + chunk_size], seed)
+        for start in range(0, len(profiles), chunk_size)
+    ]
+
+
+def write_plans_jsonl(
+    ids: List[str],
+    profiles: List[UserProfile],
+    out_path: str,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    # One JSON object per line: {"id", "profile", "kcal_target", "days"},
+    # appended chunk by chunk as the workers finish them.
+    tasks = [
+        task + (ids[task[0]:task[0] + chunk_size],
+                [asdict(p) for p in profiles[task[0]:task[0] + chunk_size]])
+        for task in _tasks(profiles, seed, chunk_size)
+    ]
+
+    with open(out_path, "w", encoding="utf-8") as f, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        for lines in pool.map(_plan_chunk_jsonl, tasks):
+            f.write(lines)
+
+    return len(profiles)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate weekly diet plans for every client in a CSV")
+    parser.add_argument("csv", help=f"input CSV with columns: {', '.join(CSV_FIELDS)} (+ optional id)")
+    parser.add_argument("-o", "--output", default=os.path.join("outputs", "plans.jsonl"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    try:
+        ids, profiles, skipped = load_profiles_csv(args.csv)
+    except ValueError as e:
+        parser.error(f"{args.csv}: {e}")
+
+    for message in skipped:
+        print(f"Skipped {message}", file=sys.stderr)
+    if not profiles:
+        parser.error(f"{args.csv}: no valid rows")
+
+    out_dir = os.path.dirname(args.output)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    count = write_plans_jsonl(ids, profiles, args.output, args.seed, args.workers)
+    elapsed = time.perf_counter() - started
+
+    print(f"{count} plans written to {args.output} in {elapsed:.2f}s ({count / max(elapsed, 1e-9):.0f} profiles/s)")
+    if skipped:
+        print(f"{len(skipped)} invalid rows skipped (listed above)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import random
 from dataclasses import dataclass
-from typing import Literal, Dict, List
+from typing import Literal, Dict, List, Optional
 
-from foods import FOODS
+from planner import plan_week
 
 Gender = Literal["male", "female"]
 Goal = Literal["lose", "maintain", "gain"]
@@ -30,8 +30,11 @@ def calc_bmr(profile: UserProfile) -> float:
     return 10 * profile.weight_kg + 6.25 * profile.height_cm - 5 * profile.age - 161
 
 
+ACTIVITY_FACTORS: Dict[str, float] = {"low": 1.2, "medium": 1.55, "high": 1.725}
+
+
 def activity_factor(activity: Activity) -> float:
-    return {"low": 1.2, "medium": 1.55, "high": 1.725}[activity]
+    return ACTIVITY_FACTORS[activity]
 
 
 def target_calories(profile: UserProfile) -> int:
@@ -46,49 +49,12 @@ def target_calories(profile: UserProfile) -> int:
     return int(round(tdee))
 
 
-def _pick_item(items: List[dict], used: set[str]) -> dict:
-
-    candidates = [x for x in items if x["name"] not in used]
-    if not candidates:
-        candidates = items
-    return random.choice(candidates)
-
-
-def generate_day_plan(profile: UserProfile, kcal_target: int, used: set[str]) -> Dict:
-    meals = []
-    total = 0
-
-    if profile.meals_per_day == 3:
-        types = ["breakfast", "lunch", "dinner"]
-    elif profile.meals_per_day == 4:
-        types = ["breakfast", "lunch", "dinner", "snack"]
-    else:
-        types = ["breakfast", "lunch", "dinner", "snack", "snack"]
-
-    for meal_type in types:
-        item = _pick_item(FOODS[meal_type], used)
-        used.add(item["name"])
-        meals.append({"type": meal_type, "name": item["name"], "kcal": item["kcal"]})
-        total += item["kcal"]
-
-
-    safety = 0
-    while (kcal_target - total) > 200 and safety < 3:
-        snack = _pick_item(FOODS["snack"], used)
-        used.add(snack["name"])
-        meals.append({"type": "snack", "name": snack["name"], "kcal": snack["kcal"]})
-        total += snack["kcal"]
-        safety += 1
-
-    return {"meals": meals, "total_kcal": total, "target_kcal": kcal_target}
-
-
-def generate_week_plan(profile: UserProfile) -> Dict:
+def generate_week_plan(profile: UserProfile, rng: Optional[random.Random] = None) -> Dict:
     kcal = target_calories(profile)
-    used: set[str] = set()
+    days = plan_week(kcal, profile.meals_per_day, rng)
+    return {"kcal_target": kcal, "days": days}
 
-    days = []
-    for _ in range(7):
-        days.append(generate_day_plan(profile, kcal, used))
 
-    return {"kcal_target": kcal, "days": days}
+def generate_week_plans(profiles: List[UserProfile], seed: Optional[int] = None) -> List[Dict]:
+    rng = random.Random(seed)
+    return [generate_week_plan(p, rng) for p in profiles]
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import random
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import combinations
+from math import ceil
+from typing import Dict, List, Optional, Tuple
+
+from foods import FOODS
+
+DAYS = 7
+MAIN_TYPES = ("breakfast", "lunch", "dinner")
+
+# Snacks always served per meals_per_day, plus up to EXTRA_SNACKS more
+# the planner may add to reach the calorie target.
+BASE_SNACKS = {3: 0, 4: 1, 5: 2}
+EXTRA_SNACKS = 3
+
+# Precomputed per-meal-type arrays: item index -> name / kcal
+NAMES = {t: tuple(x["name"] for x in items) for t, items in FOODS.items()}
+KCAL = {t: tuple(x["kcal"] for x in items) for t, items in FOODS.items()}
+
+# Every (breakfast, lunch, dinner) combination, sorted by total kcal
+# so a calorie window is a contiguous slice found with bisect.
+MAINS: Tuple[Tuple[int, Tuple[int, int, int]], ...] = tuple(sorted(
+    (b_kcal + l_kcal + d_kcal, (b, l, d))
+    for b, b_kcal in enumerate(KCAL["breakfast"])
+    for l, l_kcal in enumerate(KCAL["lunch"])
+    for d, d_kcal in enumerate(KCAL["dinner"])
+))
+MAIN_TOTALS = tuple(kcal for kcal, _ in MAINS)
+
+# (total_kcal, (breakfast, lunch, dinner), (snack, ...)) as item indices
+Combo = Tuple[int, Tuple[int, int, int], Tuple[int, ...]]
+
+
+def _snack_range(meals_per_day: int) -> Tuple[int, int]:
+    base = BASE_SNACKS[meals_per_day]
+    return base, min(base + EXTRA_SNACKS, len(KCAL["snack"]))
+
+
+@lru_cache(maxsize=None)
+def snack_sets(meals_per_day: int) -> Tuple[Tuple[int, ...], Tuple[Tuple[int, ...], ...]]:
+    # Subset sums of the snack menu (distinct snacks, allowed snack count),
+    # sorted by kcal: the snacks that best fill any calorie gap are a bisect away.
+    base, top = _snack_range(meals_per_day)
+    sets = sorted(
+        (sum(KCAL["snack"][i] for i in s), s)
+        for k in range(base, top + 1)
+        for s in combinations(range(len(KCAL["snack"])), k)
+    )
+    return tuple(kcal for kcal, _ in sets), tuple(s for _, s in sets)
+
+
+def _weekly_cap(n_items: int, max_per_day: int, min_per_day: int, blocked: int) -> int:
+    # Spread usage evenly over the menu, but keep the cap high enough that
+    # the last day of the week can always still be filled.
+    cap = ceil(DAYS * max_per_day / n_items)
+    while cap < DAYS and n_items - blocked - (DAYS - 1) * max_per_day // cap < min_per_day:
+        cap += 1
+    return cap
+
+
+@lru_cache(maxsize=None)
+def _usage_caps(meals_per_day: int) -> Tuple[Tuple[int, int, int], int]:
+    # Each item may appear at most this many times per week, so the
+    # week is spread over the whole menu instead of repeating favourites.
+    # (One main dish per day, and yesterday's dish is blocked.)
+    mains = tuple(_weekly_cap(len(KCAL[t]), 1, 1, 1) for t in MAIN_TYPES)
+
+    base, top = _snack_range(meals_per_day)
+    snack = _weekly_cap(len(KCAL["snack"]), top, base, 0)
+    return mains, snack
+
+
+class _Week:
+    # Days chosen so far plus per-item usage counts for the constraints:
+    #   - a main dish is never served on two consecutive days
+    #   - no item is used more often than its weekly cap
+
+    def __init__(self, meals_per_day: int):
+        self.main_caps, self.snack_cap = _usage_caps(meals_per_day)
+        self.main_used = [[0] * len(KCAL[t]) for t in MAIN_TYPES]
+        self.snack_used = [0] * len(KCAL["snack"])
+        self.days: List[Combo] = []
+
+    def mains_fit(self, mains: Tuple[int, int, int]) -> bool:
+        prev = self.days[-1][1] if self.days else None
+        for j, i in enumerate(mains):
+            if self.main_used[j][i] >= self.main_caps[j]:
+                return False
+            if prev is not None and prev[j] == i:
+                return False
+        return True
+
+    def snacks_fit(self, snacks: Tuple[int, ...]) -> bool:
+        return all(self.snack_used[i] < self.snack_cap for i in snacks)
+
+    def add(self, combo: Combo) -> None:
+        _, mains, snacks = combo
+        for j, i in enumerate(mains):
+            self.main_used[j][i] += 1
+        for i in snacks:
+            self.snack_used[i] += 1
+        self.days.append(combo)
+
+
+def _nearest_first(totals: Tuple[int, ...], lo_kcal: int, hi_kcal: int, lo: int, hi: int):
+    # Indices outside [lo, hi), ordered by distance to [lo_kcal, hi_kcal]
+    left, right = lo - 1, hi
+    while left >= 0 or right < len(totals):
+        if right < len(totals) and (
+            left < 0 or totals[right] - hi_kcal <= lo_kcal - totals[left]
+        ):
+            yield right
+            right += 1
+        else:
+            yield left
+            left -= 1
+
+
+def _pick_mains(week: _Week, lo_kcal: int, hi_kcal: int, rng: random.Random) -> int:
+    # Any main combination inside the window leaves a gap the snacks can fill.
+    # Walk the window from a random offset for variety between plans, then
+    # fall back to the combinations closest to the window.
+    lo, hi = bisect_left(MAIN_TOTALS, lo_kcal), bisect_right(MAIN_TOTALS, hi_kcal)
+
+    if hi > lo:
+        start = rng.randrange(hi - lo)
+        for step in range(hi - lo):
+            i = lo + (start + step) % (hi - lo)
+            if week.mains_fit(MAINS[i][1]):
+                return i
+
+    for i in _nearest_first(MAIN_TOTALS, lo_kcal, hi_kcal, lo, hi):
+        if week.mains_fit(MAINS[i][1]):
+            return i
+
+    raise ValueError("No weekly plan satisfies the menu constraints")
+
+
+def _pick_snacks(week: _Week, gap: int, totals: Tuple[int, ...], sets) -> int:
+    # Snack set whose kcal is closest to the remaining gap
+    i = bisect_left(totals, gap)
+    for j in _nearest_first(totals, gap, gap, i, i):
+        if week.snacks_fit(sets[j]):
+            return j
+
+    raise ValueError("No weekly plan satisfies the menu constraints")
+
+
+def solve_week(
+    kcal_target: int, meals_per_day: int, rng: Optional[random.Random] = None
+) -> List[Combo]:
+    # Two-stage search per day:
+    #   1) main meals whose kcal leaves a gap inside the snack subset-sum range
+    #   2) the snack subset whose kcal is closest to that gap
+    # Each day's total therefore lands as close to the target as the menu
+    # allows, while the weekly constraints hold across all 7 days.
+    rng = rng or random.Random()
+    week = _Week(meals_per_day)
+    s_totals, s_sets = snack_sets(meals_per_day)
+
+    lo_kcal = kcal_target - s_totals[-1]
+    hi_kcal = kcal_target - s_totals[0]
+
+    for _ in range(DAYS):
+        main_kcal, mains = MAINS[_pick_mains(week, lo_kcal, hi_kcal, rng)]
+        j = _pick_snacks(week, kcal_target - main_kcal, s_totals, s_sets)
+        week.add((main_kcal + s_totals[j], mains, s_sets[j]))
+
+    return week.days
+
+
+def _day_plan(combo: Combo, kcal_target: int) -> Dict:
+    total, mains, snacks = combo
+
+    meals = [
+        {"type": t, "name": NAMES[t][i], "kcal": KCAL[t][i]}
+        for t, i in zip(MAIN_TYPES, mains)
+    ]
+    meals += [
+        {"type": "snack", "name": NAMES["snack"][i], "kcal": KCAL["snack"][i]}
+        for i in snacks
+    ]
+
+    return {"meals": meals, "total_kcal": total, "target_kcal": kcal_target}
+
+
+def plan_week(
+    kcal_target: int, meals_per_day: int, rng: Optional[random.Random] = None
+) -> List[Dict]:
+    week = solve_week(kcal_target, meals_per_day, rng)
+    return [_day_plan(combo, kcal_target) for combo in week]
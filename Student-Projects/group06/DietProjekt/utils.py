@@ -1,14 +1,67 @@
+import hashlib
 import json
+import sqlite3
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 OUTPUT_DIR = Path("outputs")
+DB_PATH = OUTPUT_DIR / "plans.db"
 
 
-def save_plan(plan: Dict[str, Any]) -> str:
+def _connect() -> sqlite3.Connection:
     OUTPUT_DIR.mkdir(exist_ok=True)
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    path = OUTPUT_DIR / f"plan_{ts}.json"
-    path.write_text(json.dumps(plan, ensure_ascii=False, indent=2), encoding="utf-8")
-    return str(path)
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS plans (
+            id TEXT PRIMARY KEY,
+            created_at TEXT NOT NULL,
+            kcal_target INTEGER NOT NULL,
+            plan TEXT NOT NULL,
+            profile TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_plans_created_at ON plans (created_at)")
+    return conn
+
+
+def plan_id(plan: Dict[str, Any]) -> str:
+    # Content hash: the same plan always gets the same id
+    data = json.dumps(plan, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def save_plan(plan: Dict[str, Any], profile: Optional[Dict[str, Any]] = None) -> str:
+    # Append-only and idempotent: saving a plan that is already stored is a no-op
+    pid = plan_id(plan)
+    data = json.dumps(plan, ensure_ascii=False, separators=(",", ":"))
+    profile_data = json.dumps(profile, ensure_ascii=False) if profile is not None else None
+
+    with _connect() as conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO plans (id, created_at, kcal_target, plan, profile) VALUES (?, ?, ?, ?, ?)",
+            (pid, datetime.now().isoformat(timespec="seconds"), plan["kcal_target"], data, profile_data),
+        )
+    conn.close()
+    return pid
+
+
+def list_plans(limit: int = 20) -> List[Dict[str, Any]]:
+    # Newest first (uses the created_at index)
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT id, created_at, kcal_target FROM plans ORDER BY created_at DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+    conn.close()
+    return [{"id": r[0], "created_at": r[1], "kcal_target": r[2]} for r in rows]
+
+
+def load_plan(pid: str) -> Optional[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+    # Returns (plan, profile) or None if the id is unknown
+    with _connect() as conn:
+        row = conn.execute("SELECT plan, profile FROM plans WHERE id = ?", (pid,)).fetchone()
+    conn.close()
+    if row is None:
+        return None
+    return json.loads(row[0]), json.loads(row[1]) if row[1] else None
@@ -0,0 +1,186 @@
+
+# benchmark_backends.py
+# Compares the inference backends of model.py ("torch", "int8", "onnx")
+# on the fixed Persian corpus in benchmark_corpus.json.
+#
+# For every backend it reports:
+#   - model load time
+#   - average summarization latency
+#   - peak memory (RSS) of the process
+#   - ROUGE-1 / ROUGE-2 / ROUGE-L F1 against the reference summaries
+#   - ROUGE-L F1 against the fp32 "torch" outputs (agreement with the current model)
+#
+# Usage:
+#   python benchmark_backends.py
+#   python benchmark_backends.py --backends torch int8 --mode medium --runs 3
+
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from preprocess import normalize_persian_text
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CORPUS_PATH = os.path.join(HERE, "benchmark_corpus.json")
+
+
+# ---------- ROUGE ----------
+# Implemented here because the common `rouge_score` tokenizer drops
+# every non-Latin character, which leaves Persian text empty.
+
+def _tokens(text):
+    text = normalize_persian_text(text).replace(".", " ").replace("?", " ")
+    return text.split()
+
+
+def _ngrams(tokens, n):
+    counts = {}
+    for i in range(len(tokens) - n + 1):
+        gram = tuple(tokens[i:i + n])
+        counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+def _f1(overlap, pred_total, ref_total):
+    if overlap == 0 or pred_total == 0 or ref_total == 0:
+        return 0.0
+    precision = overlap / pred_total
+    recall = overlap / ref_total
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_n(prediction, reference, n):
+    pred = _ngrams(_tokens(prediction), n)
+    ref = _ngrams(_tokens(reference), n)
+    overlap = sum(min(count, ref.get(gram, 0)) for gram, count in pred.items())
+    return _f1(overlap, sum(pred.values()), sum(ref.values()))
+
+
+def rouge_l(prediction, reference):
+    pred, ref = _tokens(prediction), _tokens(reference)
+
+    # Longest common subsequence (dynamic programming, one row at a time)
+    prev = [0] * (len(ref) + 1)
+    for p in pred:
+        row = [0]
+        for j, r in enumerate(ref):
+            row.append(prev[j] + 1 if p == r else max(prev[j + 1], row[j]))
+        prev = row
+
+    return _f1(prev[-1], len(pred), len(ref))
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+# ---------- Worker (one backend per process) ----------
+
+def run_backend(backend, mode, runs):
+    """
+    Load one backend and summarize the corpus with it.
+    Runs in its own process so load time and memory are measured cleanly.
+    """
+    import resource
+
+    os.environ["SUMMARIZER_BACKEND"] = backend
+
+    started = time.perf_counter()
+    from chunk_summarizer import summarize_chunked
+    from direct_summarizer import summarize_direct
+    load_seconds = time.perf_counter() - started
+
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    # Short texts go through the direct path; all texts
+    # joined together form one long text for the chunked path.
+    jobs = [(summarize_direct, item["text"]) for item in corpus]
+    jobs.append((summarize_chunked, " ".join(item["text"] for item in corpus)))
+
+    summaries, latencies = [], []
+    for summarize, text in jobs:
+        timings = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            summary = summarize(text, mode)
+            timings.append(time.perf_counter() - t0)
+        summaries.append(summary)
+        latencies.append(_mean(timings))
+
+    # ru_maxrss is in KB on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    return {
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "direct_latency": _mean(latencies[:-1]),
+        "chunked_latency": latencies[-1],
+        "peak_rss_mb": peak_rss_mb,
+        "summaries": summaries,
+    }
+
+
+# ---------- Main ----------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare summarization backends on a fixed Persian corpus")
+    parser.add_argument("--backends", nargs="+", default=["torch", "int8", "onnx"])
+    parser.add_argument("--mode", default="medium")
+    parser.add_argument("--runs", type=int, default=1,
+                        help="timed runs per text (latency is averaged)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_backend(args.worker, args.mode, args.runs)
+        print(json.dumps(result, ensure_ascii=False))
+        return
+
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = json.load(f)
+    references = [item["summary"] for item in corpus]
+    references.append(" ".join(references))
+
+    results = []
+    for backend in args.backends:
+        print(f"Running backend: {backend} ...", file=sys.stderr)
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", backend,
+             "--mode", args.mode, "--runs", str(args.runs)],
+            cwd=HERE, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f"  {backend} failed:\n{proc.stderr.strip()}", file=sys.stderr)
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    baseline = next((r for r in results if r["backend"] == "torch"), None)
+
+    header = (f"{'backend':<8} {'load(s)':>8} {'direct(s)':>10} {'chunked(s)':>11} "
+              f"{'peak MB':>8} {'R-1':>6} {'R-2':>6} {'R-L':>6} {'R-L vs fp32':>12}")
+    print(header)
+    print("-" * len(header))
+
+    for r in results:
+        pairs = list(zip(r["summaries"], references))
+        r1 = _mean([rouge_n(p, ref, 1) for p, ref in pairs])
+        r2 = _mean([rouge_n(p, ref, 2) for p, ref in pairs])
+        rl = _mean([rouge_l(p, ref) for p, ref in pairs])
+
+        agreement = "-"
+        if baseline is not None:
+            agreement = f"{_mean([rouge_l(p, b) for p, b in zip(r['summaries'], baseline['summaries'])]):.3f}"
+
+        print(f"{r['backend']:<8} {r['load_seconds']:>8.1f} {r['direct_latency']:>10.2f} "
+              f"{r['chunked_latency']:>11.2f} {r['peak_rss_mb']:>8.0f} "
+              f"{r1:>6.3f} {r2:>6.3f} {rl:>6.3f} {agreement:>12}")
+
+
+if __name__ == "__main__":
+    main()
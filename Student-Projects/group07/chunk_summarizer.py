@@ -8,30 +8,20 @@
 
 
 from model import tokenizer, model
-from preprocess import normalize_persian_text
+from pipeline import EncodedText, strip_special_tokens, to_tensors
 import math
 
 
-# Split text into overlapping token chunks
-def split_to_chunks(text, max_tokens=450, overlap=50):
-    # Tokenize full text
-    tokens = tokenizer.encode(text)
-    chunks = []
+# Maximum number of chunks generated together in one batch.
+# Each extra chunk multiplies beam-search memory, so keep this small on CPU.
+MAX_BATCH_SIZE = 8
 
-    # Sliding window over tokens
-    start = 0
-    while start < len(tokens):
-        end = start + max_tokens
-        chunk_tokens = tokens[start:end]
 
-        # Decode tokens back to text for the model
-        chunk_text = tokenizer.decode(chunk_tokens, skip_special_tokens=True)
-        chunks.append(chunk_text)
-
-        # Move window with overlap
-        start += max_tokens - overlap
-
-    return chunks
+# Split encoded text into overlapping token-id chunks
+def split_to_chunks(encoded, max_tokens=450, overlap=50):
+    # Windows are taken directly from the token ids,
+    # no decode / re-tokenize round trip per chunk
+    return encoded.windows(max_tokens=max_tokens, overlap=overlap)
 
 
 # Output length controller for different modes
@@ -70,36 +60,40 @@ def get_chunk_lengths(mode, input_len=None):
 
 # Two-stage chunk-based summarization
 
-def summarize_chunked(text, mode):
+def summarize_chunked(text, mode, max_batch_size=MAX_BATCH_SIZE):
     """
     Stage 1: Summarize each chunk separately
     Stage 2: Summarize all chunk summaries into final output
 
+    `text` may be a raw string or an already `EncodedText`.
+    Chunks are generated in padded batches of up to `max_batch_size`
+    instead of one `model.generate` call per chunk.
+
     """
 
-    # Normalize Persian text
-    text = normalize_persian_text(text)
+    # Normalize and tokenize once (skipped if already encoded)
+    if not isinstance(text, EncodedText):
+        text = EncodedText(text)
 
-    # Split text into chunks
+    # Split token ids into chunks
     chunks = split_to_chunks(text)
 
     intermediate_summaries = []
 
     # Total token count for auto mode
-    total_tokens = len(tokenizer.encode(text))
+    total_tokens = len(text)
 
     (chunk_min, chunk_max), (final_min, final_max) = get_chunk_lengths(
         mode, input_len=total_tokens
     )
 
     # -------- Stage 1: Chunk summaries --------
-    for chunk in chunks:
-        inputs = tokenizer(
-            chunk,
-            return_tensors="pt",
-            truncation=True,
-            max_length=512
-        )
+    # All chunks are padded and generated together, at most
+    # `max_batch_size` at a time to bound CPU memory.
+    for start in range(0, len(chunks), max_batch_size):
+        batch = chunks[start:start + max_batch_size]
+
+        inputs = to_tensors(batch)
 
         summary_ids = model.generate(
             inputs["input_ids"],
@@ -111,20 +105,20 @@ def summarize_chunked(text, mode):
             early_stopping=True
         )
 
-        intermediate_summaries.append(
-            tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+        # Keep summaries as token ids for stage 2
+        intermediate_summaries.extend(
+            strip_special_tokens(ids.tolist()) for ids in summary_ids
         )
 
     # -------- Stage 2: Final summary --------
-    merged_text = " ".join(intermediate_summaries)
-
-    inputs = tokenizer(
-        merged_text,
-        return_tensors="pt",
-        truncation=True,
-        max_length=512
+    # Merge the intermediate summaries' token ids directly
+    # (the encoder and decoder share one vocabulary)
+    merged = EncodedText.from_token_ids(
+        [t for ids in intermediate_summaries for t in ids]
     )
 
+    inputs = to_tensors([merged.model_input(max_length=512)])
+
     final_ids = model.generate(
         inputs["input_ids"],
         attention_mask=inputs["attention_mask"],
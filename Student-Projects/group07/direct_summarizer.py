@@ -8,8 +8,8 @@
 import math
 # Import shared model and tokenizer (loaded once globally)
 from model import tokenizer, model
-# Import Persian preprocessing utilities
-from preprocess import normalize_persian_text
+# Normalize-and-tokenize-once helpers
+from pipeline import EncodedText, to_tensors
 
 
 # Direct (Single‑Pass) Summarization Function
@@ -19,8 +19,9 @@ def summarize_direct(text, mode):
 
     Parameters
     ----------
-    text : str
-        Input Persian text.
+    text : str or EncodedText
+        Input Persian text, or a text already normalized and
+        tokenized by `pipeline.EncodedText`.
     mode : str
         Controls the output summary length:
             - "short"  : very concise summary
@@ -30,17 +31,12 @@ def summarize_direct(text, mode):
 
     """
 
-#  Persian preprocessing
-    text = normalize_persian_text(text)
+    # Persian preprocessing and tokenization (skipped if already encoded)
+    if not isinstance(text, EncodedText):
+        text = EncodedText(text)
 
-    # Tokenization
     # The input is truncated to 512 tokens to match the model limit.
-    inputs = tokenizer(
-        text,
-        return_tensors="pt",
-        truncation=True,
-        max_length=512
-    )
+    inputs = to_tensors([text.model_input(max_length=512)])
 
     input_len = inputs["input_ids"].shape[1]
 
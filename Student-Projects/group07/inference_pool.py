@@ -0,0 +1,200 @@
+
+# inference_pool.py
+# This module runs summarization in a pool of worker processes.
+# Each worker loads the model once and serves jobs from a shared queue,
+# so CPU-heavy beam search never blocks the Telegram bot's event loop.
+
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Number of worker processes, each holding its own copy of the model.
+NUM_WORKERS = int(os.environ.get("SUMMARIZER_WORKERS", "2"))
+
+
+class JobCancelled(Exception):
+    """Raised when a job was replaced by a newer job of the same user."""
+
+
+# ---------- Worker side ----------
+
+def _init_worker(num_threads):
+    # Split CPU cores between workers to avoid thread oversubscription
+    import torch
+    torch.set_num_threads(num_threads)
+
+    # Importing here (not at module level) loads model.py
+    # inside the worker process only, never in the bot process.
+    import model  # noqa: F401
+
+
+def _summarize_job(text, mode):
+    from chunk_summarizer import summarize_chunked
+    from direct_summarizer import summarize_direct
+    from length_router import is_long_text
+    from model import tokenizer
+    from pipeline import EncodedText
+
+    # Normalize and tokenize once, shared by routing and summarization
+    encoded = EncodedText(text)
+
+    if is_long_text(encoded, tokenizer):
+        return summarize_chunked(encoded, mode=mode)
+    return summarize_direct(encoded, mode=mode)
+
+
+# ---------- Bot side ----------
+
+class InferencePool:
+    """
+    Dispatch summarization jobs to worker processes.
+
+    Parameters
+    ----------
+    num_workers : int, optional (default=NUM_WORKERS)
+        Number of worker processes.
+
+    Notes
+    -----
+    Each user has at most one active job. Submitting a new job for the
+    same user cancels the previous one: a queued job is dropped, and a
+    job already running is left to finish but its result is discarded.
+
+    Job completions arrive on the executor's management thread, so the
+    job bookkeeping is guarded by a lock.
+    """
+
+    def __init__(self, num_workers=NUM_WORKERS):
+        self.num_workers = num_workers
+        num_threads = max(1, (os.cpu_count() or 1) // num_workers)
+
+        # "spawn" gives every worker a clean interpreter; forking a
+        # process with PyTorch threads running can deadlock.
+        self._executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(num_threads,),
+        )
+
+        # Reentrant: future.cancel() runs _on_done right away, in the same thread
+        self._lock = threading.RLock()
+
+        # user_id -> latest job future
+        self._jobs = {}
+        # Futures submitted and not finished yet
+        self._outstanding = set()
+        # Running futures whose result will be ignored
+        self._discarded = set()
+
+        self._completed = 0
+        self._cancelled = 0
+        self._total_seconds = 0.0
+
+    def submit(self, user_id, text, mode):
+        # Replace (and cancel) any previous job of this user
+        self.cancel(user_id)
+
+        started = time.perf_counter()
+        with self._lock:
+            future = self._executor.submit(_summarize_job, text, mode)
+            self._jobs[user_id] = future
+            self._outstanding.add(future)
+        future.add_done_callback(
+            lambda f: self._on_done(f, started)
+        )
+        return future
+
+    async def summarize(self, user_id, text, mode):
+        """
+        Summarize `text` in a worker process without blocking the event loop.
+
+        Raises
+        ------
+        JobCancelled
+            If the job was cancelled or replaced before its result arrived.
+        """
+        future = self.submit(user_id, text, mode)
+
+        try:
+            summary = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # wrap_future turns a job cancelled by the pool into
+            # asyncio.CancelledError too; the pool has dropped it from _jobs
+            with self._lock:
+                replaced = self._jobs.get(user_id) is not future
+            if replaced:
+                raise JobCancelled()
+            # The awaiting task itself was cancelled (e.g. bot shutdown):
+            # drop the job and let the cancellation propagate
+            self.cancel(user_id)
+            raise
+        finally:
+            # A newer job may have replaced this one while it was running
+            with self._lock:
+                replaced = self._jobs.get(user_id) is not future
+                if not replaced:
+                    del self._jobs[user_id]
+
+        if replaced:
+            raise JobCancelled()
+        return summary
+
+    def cancel(self, user_id):
+        # Drop the user's current job; returns True if there was one
+        with self._lock:
+            future = self._jobs.pop(user_id, None)
+            # Not outstanding: _on_done has already counted it
+            if future is None or future not in self._outstanding:
+                return False
+
+            if not future.cancel():
+                # Already running in a worker: its result will be ignored
+                self._discarded.add(future)
+            return True
+
+    def _on_done(self, future, started):
+        # Runs on the executor's thread (or in cancel())
+        with self._lock:
+            self._outstanding.discard(future)
+
+            if future.cancelled() or future in self._discarded:
+                self._discarded.discard(future)
+                self._cancelled += 1
+                return
+
+            self._completed += 1
+            self._total_seconds += time.perf_counter() - started
+
+    def stats(self):
+        """
+        Returns
+        -------
+        dict
+            Queue depth and job counters of the pool.
+        """
+        with self._lock:
+            outstanding = list(self._outstanding)
+            completed = self._completed
+            cancelled = self._cancelled
+            total_seconds = self._total_seconds
+
+        running = sum(1 for f in outstanding if f.running())
+        avg = total_seconds / completed if completed else 0.0
+
+        return {
+            "workers": self.num_workers,
+            "queued": len(outstanding) - running,
+            "running": running,
+            "completed": completed,
+            "cancelled": cancelled,
+            "avg_seconds": round(avg, 2),
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
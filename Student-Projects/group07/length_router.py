@@ -3,6 +3,7 @@
 # It determines whether a given Persian text should be processed by the direct summarization pipeline or the chunk-based one.
 
 
+from pipeline import EncodedText
 from preprocess import normalize_persian_text
 
 
@@ -11,8 +12,10 @@ def is_long_text(text, tokenizer, threshold_tokens=450):
 
     Parameters
     ----------
-    text : str
-        The original Persian input text.
+    text : str or EncodedText
+        The original Persian input text, or a text already
+        normalized and tokenized by `pipeline.EncodedText`
+        (in which case its token ids are reused).
     tokenizer : object
         The tokenizer associated with the summarization model,
         used to count tokens accurately.
@@ -26,11 +29,15 @@ def is_long_text(text, tokenizer, threshold_tokens=450):
         False -> otherwise.
     """
 
-    # Step 1. Normalize text before tokenization
-    text = normalize_persian_text(text)
+    if isinstance(text, EncodedText):
+        # Already normalized and tokenized
+        token_count = len(text)
+    else:
+        # Step 1. Normalize text before tokenization
+        text = normalize_persian_text(text)
 
-    # Step 2. Count tokens using the model's tokenizer
-    token_count = len(tokenizer.encode(text))
+        # Step 2. Count tokens using the model's tokenizer
+        token_count = len(tokenizer.encode(text))
 
     # Step 3. Return routing decision
     # If the token count exceeds 450 (by default), the system routes the text to the chunk-based summarizer.
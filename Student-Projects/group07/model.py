@@ -2,6 +2,8 @@
 # model.py
 # This module loads the Persian summarization model and tokenizer.
 # It serves as the central NLP backbone shared across all other modules.
+import os
+
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 
 
@@ -11,9 +13,60 @@ from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 MODEL_NAME = "m3hrdadfi/bert2bert-fa-wiki-summary"
 
 
+# Inference backend, selected once at startup via SUMMARIZER_BACKEND:
+#   "torch" : full fp32 PyTorch model (default)
+#   "int8"  : PyTorch with dynamic int8 quantization of the Linear layers
+#   "onnx"  : ONNX Runtime encoder-decoder exported with Hugging Face Optimum
+BACKENDS = ("torch", "int8", "onnx")
+BACKEND = os.environ.get("SUMMARIZER_BACKEND", "torch")
+
+# The ONNX export is done on first use and reused from this directory.
+ONNX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "onnx_model")
+
+
+def load_model(backend=BACKEND):
+    """
+    Load the summarization model for the given backend.
+
+    All backends expose the same `generate` API,
+    so the summarizers work unchanged on any of them.
+    """
+
+    if backend == "torch":
+        return AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
+
+    elif backend == "int8":
+        import torch
+
+        fp32_model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
+        # Weights of Linear layers stored as int8, activations
+        # quantized on the fly; fastest win for CPU inference.
+        return torch.quantization.quantize_dynamic(
+            fp32_model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+    elif backend == "onnx":
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError:
+            raise ImportError(
+                'The "onnx" backend requires: pip install optimum[onnxruntime]'
+            )
+
+        if os.path.isdir(ONNX_DIR):
+            return ORTModelForSeq2SeqLM.from_pretrained(ONNX_DIR)
+
+        onnx_model = ORTModelForSeq2SeqLM.from_pretrained(MODEL_NAME, export=True)
+        onnx_model.save_pretrained(ONNX_DIR)
+        return onnx_model
+
+    else:
+        raise ValueError(f"Invalid backend! Choose: {' | '.join(BACKENDS)}")
+
+
 # Load the tokenizer and model from Hugging Face Transformers.
 # The tokenizer converts input Persian text into tokens usable by the model.
 # The model generates the summarization output sequence.
 # They are loaded here once and imported by other modules,
 tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
+model = load_model(BACKEND)
@@ -0,0 +1,102 @@
+
+# pipeline.py
+# This module normalizes and tokenizes a Persian text exactly once.
+# The resulting token ids are shared by the length router and both
+# summarizers, so no stage has to re-normalize, re-tokenize or
+# decode tokens back to text before feeding them to the model.
+
+
+from model import tokenizer
+from preprocess import normalize_persian_text
+
+
+class EncodedText:
+    """
+    A normalized Persian text together with its token ids.
+
+    Parameters
+    ----------
+    text : str
+        The original Persian input text.
+
+    Attributes
+    ----------
+    text : str
+        The normalized text.
+    token_ids : list of int
+        Content token ids, without special tokens ([CLS] / [SEP]).
+        Special tokens are added per model input by `build_input`.
+    """
+
+    def __init__(self, text):
+        self.text = normalize_persian_text(text)
+        self.token_ids = tokenizer.encode(self.text, add_special_tokens=False)
+
+    @classmethod
+    def from_token_ids(cls, token_ids, text=""):
+        """
+        Wrap content token ids that are already available
+        (e.g. generated summaries) without re-tokenizing them.
+        """
+        encoded = cls.__new__(cls)
+        encoded.text = text
+        encoded.token_ids = list(token_ids)
+        return encoded
+
+    def __len__(self):
+        # Same count as `tokenizer.encode(text)`, special tokens included
+        return len(self.token_ids) + tokenizer.num_special_tokens_to_add()
+
+    def windows(self, max_tokens=450, overlap=50):
+        """
+        Split the token ids into overlapping windows.
+
+        Each window holds at most `max_tokens` tokens once special
+        tokens are added, and consecutive windows share `overlap` tokens.
+
+        Returns
+        -------
+        list of list of int
+            Model-ready token ids (special tokens included) per window.
+        """
+        size = max_tokens - tokenizer.num_special_tokens_to_add()
+        step = max_tokens - overlap
+
+        windows = []
+        start = 0
+        while start < len(self.token_ids):
+            windows.append(build_input(self.token_ids[start:start + size]))
+            start += step
+
+        return windows
+
+    def model_input(self, max_length=512):
+        """
+        Return the whole text as model-ready token ids,
+        truncated to `max_length` tokens including special tokens.
+        """
+        size = max_length - tokenizer.num_special_tokens_to_add()
+        return build_input(self.token_ids[:size])
+
+
+def build_input(token_ids):
+    # Wrap content token ids with the model's special tokens
+    return tokenizer.build_inputs_with_special_tokens(token_ids)
+
+
+def strip_special_tokens(token_ids):
+    # Drop [CLS] / [SEP] / [PAD] etc. from generated token ids
+    special_ids = set(tokenizer.all_special_ids)
+    return [t for t in token_ids if t not in special_ids]
+
+
+def to_tensors(batch):
+    """
+    Pad a list of token id lists into model inputs.
+
+    Returns
+    -------
+    dict
+        `input_ids` and `attention_mask` as PyTorch tensors.
+    """
+    return tokenizer.pad({"input_ids": batch}, return_tensors="pt")
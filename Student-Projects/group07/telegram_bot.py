@@ -10,15 +10,30 @@ from telegram.ext import (
 from datetime import datetime
 
 # --- NLP imports ---
-from direct_summarizer import summarize_direct
-from chunk_summarizer import summarize_chunked
-from length_router import is_long_text
-from model import tokenizer
+# The model lives in the worker processes of the pool, not in the bot process
+from inference_pool import InferencePool, JobCancelled
 
 
 # In-memory user storage
 user_data_store = {}
 
+# Worker processes running summarization (created in main)
+pool = None
+
+
+def mode_keyboard(*extra_rows):
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton("Short", callback_data="mode_short"),
+            InlineKeyboardButton("Medium", callback_data="mode_medium"),
+        ],
+        [
+            InlineKeyboardButton("Long", callback_data="mode_long"),
+            InlineKeyboardButton("Auto", callback_data="mode_auto"),
+        ],
+        *extra_rows,
+    ])
+
 
 # /start
 
@@ -35,25 +50,17 @@ async def receive_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     text = update.message.text
     user_id = update.message.from_user.id
 
+    # A new text replaces the summary still being generated
+    context.user_data.pop("job_message", None)
+    pool.cancel(user_id)
     context.user_data["current_text"] = text
 
     if user_id not in user_data_store:
         user_data_store[user_id] = []
 
-    keyboard = [
-        [
-            InlineKeyboardButton("Short", callback_data="mode_short"),
-            InlineKeyboardButton("Medium", callback_data="mode_medium"),
-        ],
-        [
-            InlineKeyboardButton("Long", callback_data="mode_long"),
-            InlineKeyboardButton("Auto", callback_data="mode_auto"),
-        ],
-    ]
-
     await update.message.reply_text(
         " Mode خلاصه‌سازی را انتخاب کن:",
-        reply_markup=InlineKeyboardMarkup(keyboard),
+        reply_markup=mode_keyboard(),
     )
 
 
@@ -70,14 +77,30 @@ async def handle_mode(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.edit_message_text(" متنی برای خلاصه‌سازی یافت نشد.")
         return
 
+    user_id = query.from_user.id
+
+    # The mode buttons stay, so another mode can be picked while waiting
+    message_id = query.message.message_id
+    context.user_data["job_message"] = message_id
+    await query.edit_message_text(
+        f"⏳ در حال خلاصه‌سازی ({mode})...",
+        reply_markup=mode_keyboard(
+            [InlineKeyboardButton("❌ لغو", callback_data="cancel_job")]),
+    )
+
     # --- Summarization ---
-    if is_long_text(text, tokenizer):
-        summary = summarize_chunked(text, mode=mode)
-    else:
-        summary = summarize_direct(text, mode=mode)
+    # Runs in a worker process; picking another mode cancels this job
+    try:
+        summary = await pool.summarize(user_id, text, mode)
+    except JobCancelled:
+        # Replaced by another mode in this message: the new job updates it
+        if context.user_data.get("job_message") != message_id:
+            await query.edit_message_text(
+                "⛔ خلاصه‌سازی لغو شد.", reply_markup=mode_keyboard())
+        return
+    context.user_data.pop("job_message", None)
 
     # --- Save history ---
-    user_id = query.from_user.id
     timestamp = datetime.now().strftime("%H:%M | %Y-%m-%d")
 
     user_data_store[user_id].append({
@@ -109,26 +132,24 @@ async def change_mode(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    keyboard = [
-        [
-            InlineKeyboardButton("Short", callback_data="mode_short"),
-            InlineKeyboardButton("Medium", callback_data="mode_medium"),
-        ],
-        [
-            InlineKeyboardButton("Long", callback_data="mode_long"),
-            InlineKeyboardButton("Auto", callback_data="mode_auto"),
-        ],
-        [
-            InlineKeyboardButton("🔙 بازگشت", callback_data="back_to_summary"),
-        ],
-    ]
-
     await query.edit_message_text(
         " Mode جدید را انتخاب کن:",
-        reply_markup=InlineKeyboardMarkup(keyboard),
+        reply_markup=mode_keyboard(
+            [InlineKeyboardButton("🔙 بازگشت", callback_data="back_to_summary")]),
     )
 
 
+# Cancel the running summary
+
+async def cancel_job(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    query = update.callback_query
+    await query.answer()
+
+    # handle_mode sees the cancellation and updates the message
+    context.user_data.pop("job_message", None)
+    pool.cancel(query.from_user.id)
+
+
 # Back to last summary
 
 async def back_to_summary(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -215,6 +236,7 @@ async def new_summary(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
+    pool.cancel(query.from_user.id)
     context.user_data.clear()
 
     await query.edit_message_text(
@@ -222,17 +244,45 @@ async def new_summary(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 
+# /stats : inference queue metrics
+
+async def show_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    stats = pool.stats()
+
+    await update.message.reply_text(
+        "📊 Inference pool\n"
+        f"workers: {stats['workers']}\n"
+        f"queued: {stats['queued']}\n"
+        f"running: {stats['running']}\n"
+        f"completed: {stats['completed']}\n"
+        f"cancelled: {stats['cancelled']}\n"
+        f"avg time: {stats['avg_seconds']}s"
+    )
+
+
 # Main
 
 def main():
-    app = ApplicationBuilder().token("YOUR_TELEGRAM_BOT_TOKEN").build()
+    global pool
+    pool = InferencePool()
+
+    # concurrent_updates lets other users' updates be handled
+    # while a summary is being generated in the pool
+    app = (
+        ApplicationBuilder()
+        .token("YOUR_TELEGRAM_BOT_TOKEN")
+        .concurrent_updates(True)
+        .build()
+    )
 
     app.add_handler(CommandHandler("start", start))
+    app.add_handler(CommandHandler("stats", show_stats))
     app.add_handler(MessageHandler(
         filters.TEXT & ~filters.COMMAND, receive_text))
 
     app.add_handler(CallbackQueryHandler(handle_mode, pattern="^mode_"))
     app.add_handler(CallbackQueryHandler(change_mode, pattern="^change_mode$"))
+    app.add_handler(CallbackQueryHandler(cancel_job, pattern="^cancel_job$"))
     app.add_handler(CallbackQueryHandler(
         back_to_summary, pattern="^back_to_summary$"))
 
@@ -241,7 +291,10 @@ def main():
     app.add_handler(CallbackQueryHandler(new_summary, pattern="^new$"))
 
     print("Bot is running...")
-    app.run_polling()
+    try:
+        app.run_polling()
+    finally:
+        pool.shutdown()
 
 
 if __name__ == "__main__":
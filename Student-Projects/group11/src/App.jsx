@@ -25,6 +25,9 @@ export default function App() {
   // State to control user input value
   const [input, setInput] = useState("");
 
+  // Chat session id given by the server (keeps this chat's memory separate)
+  const [sessionId, setSessionId] = useState(null);
+
   // Function to send user message and receive AI response
   const sendMessage = async () => {
     if (!input.trim()) return;
@@ -39,10 +42,11 @@ export default function App() {
       const response = await fetch("http://localhost:8000/generate", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ prompt: userMessage }),
+        body: JSON.stringify({ prompt: userMessage, session_id: sessionId }),
       });
 
       const data = await response.json();
+      setSessionId(data.session_id);
 
       // Add AI response to state
       setMessages((prev) => [
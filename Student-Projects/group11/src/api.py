@@ -1,14 +1,46 @@
-import requests
+import httpx
 import random
+import time
+from collections import OrderedDict, deque
 from dotenv import load_dotenv
+from keyword_matcher import KeywordMatcher
 load_dotenv()
 
 # ================= MEMORY =================
-conversation_memory = []
+# Every chat session (one per browser tab) has its own memory
 max_memory = 5
+SESSION_TTL = 30 * 60        # forget sessions idle for 30 minutes
+MAX_SESSIONS = 10000         # and never keep more than this many
 
-last_emotion = None
-is_first_message = True
+
+class SessionMemory:
+    def __init__(self):
+        self.messages = deque(maxlen=max_memory)
+        self.last_emotion = None
+        self.is_first_message = True
+        self.last_seen = time.monotonic()
+
+
+# session id -> SessionMemory, least recently used first
+sessions = OrderedDict()
+
+
+def get_session(session_id):
+    now = time.monotonic()
+
+    # Evict idle sessions (the oldest are at the front)
+    while sessions:
+        oldest = next(iter(sessions.values()))
+        if now - oldest.last_seen < SESSION_TTL and len(sessions) < MAX_SESSIONS:
+            break
+        sessions.popitem(last=False)
+
+    session = sessions.get(session_id)
+    if session is None:
+        session = sessions[session_id] = SessionMemory()
+    sessions.move_to_end(session_id)
+    session.last_seen = now
+    return session
 
 # ================= EMOTION KEYWORDS =================
 EMOTION_KEYWORDS = {
@@ -22,6 +54,11 @@ EMOTION_KEYWORDS = {
     "hate": ["نفرت", "بدم میاد", "اعصابم", "تنفر"],
 }
 
+DANGER_KEYWORDS = ["خودکشی", "آسیب به خود", "نمی‌خوام زنده باشم"]
+
+# All emotion and danger keywords, found in one pass over the text
+KEYWORD_MATCHER = KeywordMatcher({**EMOTION_KEYWORDS, "danger": DANGER_KEYWORDS})
+
 # ================= RESPONSES =================
 excitement_responses = [
     "چه عالی! انرژی مثبتت حتی از پشت متن هم حس می‌شه .دوست داری راجبش حرف بزنیم؟✨🥰😊",
@@ -140,21 +177,35 @@ RESPONSE_MAP = {
 
 # ================= AGENTS =================
 
+# Keyword Agent
+# Finds every emotion and danger keyword once, for all the agents below
+def keyword_agent(text):
+    found = {}  # group -> {keyword: first position}
+    for hit in KEYWORD_MATCHER.find(text):
+        for group in hit.groups:
+            found.setdefault(group, {}).setdefault(hit.keyword, hit.start)
+    return found
+
+
+def emotion_scores(found):
+    return {emotion: len(found[emotion]) for emotion in EMOTION_KEYWORDS if emotion in found}
+
+
 # Emotion Analyzer Agent
-def emotion_analyzer_agent(text):
-    for emotion, keywords in EMOTION_KEYWORDS.items():
-        for key in keywords:
-            if key in text:
-                return emotion
-    return None
+# The emotion with the most keywords wins; on a tie, the one mentioned first
+def emotion_analyzer_agent(found):
+    scores = emotion_scores(found)
+    if not scores:
+        return None
+    return min(scores, key=lambda emotion: (-scores[emotion], min(found[emotion].values())))
 
 
 # Confidence Agent
-def confidence_agent(text, emotion):
+def confidence_agent(found, emotion):
     if emotion is None:
         return 0.0
 
-    matches = sum(1 for k in EMOTION_KEYWORDS[emotion] if k in text)
+    matches = len(found[emotion])
 
     if matches >= 2:
         return 0.9
@@ -173,11 +224,9 @@ def strategy_agent(emotion, confidence):
 
 
 # Safety Agent
-def safety_agent(text):
-    danger_keywords = ["خودکشی", "آسیب به خود", "نمی‌خوام زنده باشم"]
-    for key in danger_keywords:
-        if key in text:
-            return "danger"
+def safety_agent(found):
+    if "danger" in found:
+        return "danger"
     return "safe"
 
 # ================= NAME CALL DETECTOR =================
@@ -200,12 +249,37 @@ import os
 API_KEY = os.getenv("OPENAI_API_KEY")
 if not API_KEY:
     raise ValueError("OPENAI_API_KEY is not set")
-URL = "https://api.openai.com/v1/chat/completions"
+URL = os.getenv("OPENAI_API_URL", "https://api.openai.com/v1/chat/completions")
 HEADERS = {
     "Content-Type": "application/json",
     "Authorization": f"Bearer {API_KEY}",
 }
 
+# One pooled client for all requests (connections to the API are reused)
+MAX_CONNECTIONS = 100
+http_client = None
+
+
+def get_http_client():
+    global http_client
+    if http_client is None:
+        http_client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=20,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_CONNECTIONS,
+            ),
+        )
+    return http_client
+
+
+async def close_http_client():
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+
 SYSTEM_PROMPT = """
 تو یک دستیار سلامت روان صمیمی و همدل و مهربون هستی .
 اسمت نکست مایند هست(next mind)
@@ -227,20 +301,21 @@ SYSTEM_PROMPT = """
 """
 
 # ================= MAIN (Coordinator Agent) =================
-def get_ai_response(user_text):
-    global last_emotion
+async def get_ai_response(user_text, session_id):
+    session = get_session(session_id)
+    memory = session.messages
+    session.is_first_message = False
 
-    conversation_memory.append(f"کاربر: {user_text}")
-    if len(conversation_memory) > max_memory:
-        conversation_memory.pop(0)
+    memory.append({"role": "user", "content": user_text})
 
     text = user_text.lower()
 
     # Multi-Agent Decisions
-    emotion = emotion_analyzer_agent(text)
-    confidence = confidence_agent(text, emotion)
+    found = keyword_agent(text)
+    emotion = emotion_analyzer_agent(found)
+    confidence = confidence_agent(found, emotion)
     strategy = strategy_agent(emotion, confidence)
-    safety = safety_agent(text)
+    safety = safety_agent(found)
 
     # Safety First
     if safety == "danger":
@@ -249,35 +324,27 @@ def get_ai_response(user_text):
             "تنها نیستی و کمک گرفتن خیلی مهمه. "
             "دوست داری بیشتر حرف بزنیم؟"
         )
-        conversation_memory.append(f"دستیار: {reply}")
+        memory.append({"role": "assistant", "content": reply})
         return reply
 
     # Rule-Based Response
     if strategy == "rule" and emotion in RESPONSE_MAP:
         reply = random.choice(RESPONSE_MAP[emotion])
-        conversation_memory.append(f"دستیار: {reply}")
-        last_emotion = emotion
+        memory.append({"role": "assistant", "content": reply})
+        session.last_emotion = emotion
         return reply
 
     # Fallback to AI
-    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-
-    for msg in conversation_memory:
-        if msg.startswith("کاربر:"):
-            messages.append({"role": "user", "content": msg[6:].strip()})
-        else:
-            messages.append({"role": "assistant", "content": msg[8:].strip()})
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}, *memory]
 
     try:
-        response = requests.post(
+        response = await get_http_client().post(
             URL,
-            headers=HEADERS,
             json={"model": "gpt-4o-mini", "messages": messages},
-            timeout=20,
         )
         reply = response.json()["choices"][0]["message"]["content"]
     except Exception:
         reply = "متاسفم، مشکلی در ارتباط با سرور پیش آمد."
 
-    conversation_memory.append(f"دستیار: {reply}")
-    return reply
\ No newline at end of file
+    memory.append({"role": "assistant", "content": reply})
+    return reply
@@ -0,0 +1,132 @@
+"""
+Benchmark of the keyword matcher against the old keyword loops.
+
+A corpus of Persian messages is generated (fixed seed) from everyday words,
+with emotion and danger keywords mixed in. For each message the old agents
+scanned the text once per keyword (emotion, confidence and safety separately);
+the new agents use one KeywordMatcher pass, with pyahocorasick (if installed)
+and with the regex fallback.
+
+Usage:
+    python benchmark_matcher.py --messages 50000
+"""
+
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import api  # noqa: E402
+from api import (  # noqa: E402
+    DANGER_KEYWORDS, EMOTION_KEYWORDS,
+    confidence_agent, emotion_analyzer_agent, keyword_agent, safety_agent,
+)
+from keyword_matcher import KeywordMatcher, ahocorasick  # noqa: E402
+
+WORDS = (
+    "امروز من یک روز خیلی طولانی داشتم و بعد از کار به خانه رفتم "
+    "با دوستم درباره زندگی و درس صحبت کردم فکر می‌کنم باید بیشتر "
+    "استراحت کنم ولی نمی‌دونم چرا این هفته همه چیز سخت شده"
+).split()
+KEYWORDS = [k for keywords in EMOTION_KEYWORDS.values() for k in keywords] + DANGER_KEYWORDS
+
+
+def make_corpus(size, seed=1):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(5, 60))]
+        for _ in range(rng.choice([0, 0, 1, 1, 2, 3])):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(KEYWORDS))
+        corpus.append(" ".join(words))
+    return corpus
+
+
+# The agents before KeywordMatcher (first match wins, one scan per keyword)
+def old_agents(text):
+    emotion = None
+    for name, keywords in EMOTION_KEYWORDS.items():
+        if any(key in text for key in keywords):
+            emotion = name
+            break
+    matches = sum(1 for k in EMOTION_KEYWORDS[emotion] if k in text) if emotion else 0
+    confidence = 0.0 if emotion is None else 0.9 if matches >= 2 else 0.6
+    safety = "danger" if any(key in text for key in DANGER_KEYWORDS) else "safe"
+    return emotion, confidence, safety
+
+
+def new_agents(text):
+    found = keyword_agent(text)
+    emotion = emotion_analyzer_agent(found)
+    return emotion, confidence_agent(found, emotion), safety_agent(found)
+
+
+def all_occurrences(text):
+    """Every (position, keyword) found by brute force, to check the matcher."""
+    hits = set()
+    for keyword in KEYWORDS:
+        start = text.find(keyword)
+        while start != -1:
+            hits.add((start, keyword))
+            start = text.find(keyword, start + 1)
+    return hits
+
+
+def timed(function, corpus, repeat=3):
+    """Best of `repeat` runs (seconds), and the results."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [function(text) for text in corpus]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=50000)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.messages)
+    chars = sum(len(text) for text in corpus)
+    # Without keywords the old loops cannot stop at a first match
+    long_text = " ".join(WORDS * 250)
+
+    groups = {**EMOTION_KEYWORDS, "danger": DANGER_KEYWORDS}
+    matchers = [("KeywordMatcher, regex", KeywordMatcher(groups, use_ahocorasick=False))]
+    if ahocorasick is not None:
+        matchers.append(("KeywordMatcher, pyahocorasick", KeywordMatcher(groups)))
+    else:
+        print("pyahocorasick is not installed: only the regex fallback is measured")
+
+    print(f"messages: {len(corpus)} ({chars / len(corpus):.0f} characters on average)\n")
+    print(f"{'':<31} {'us/message':>10} {f'{len(long_text)} chars, no keywords':>28}")
+
+    old_time, old = timed(old_agents, corpus)
+    long_time, _ = timed(old_agents, [long_text] * 20)
+    print(f"{'old keyword loops':<31} {old_time * 1e6 / len(corpus):>10.1f} "
+          f"{long_time / 20 * 1e3:>25.2f} ms")
+
+    for name, matcher in matchers:
+        for text in corpus[:2000]:
+            found = {(hit.start, hit.keyword) for hit in matcher.find(text)}
+            assert found == all_occurrences(text), (name, text)
+
+        api.KEYWORD_MATCHER = matcher
+        new_time, new = timed(new_agents, corpus)
+        long_time, _ = timed(new_agents, [long_text] * 20)
+        print(f"{name:<31} {new_time * 1e6 / len(corpus):>10.1f} "
+              f"{long_time / 20 * 1e3:>25.2f} ms")
+
+    safety_same = all(o[2] == n[2] for o, n in zip(old, new))
+    changed = sum(o[0] != n[0] for o, n in zip(old, new))
+    print(f"\nsame safety flags: {'yes' if safety_same else 'NO'}")
+    print(f"emotion changed:   {changed} messages "
+          f"(mixed emotions, now the strongest instead of the first in the dict)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Multi-keyword matcher
+
+Finds every occurrence of every keyword in one pass, with its position,
+including keywords inside or overlapping other keywords ("ترس" in "می‌ترسم").
+
+Uses an Aho-Corasick automaton from pyahocorasick when it is installed
+(pip install pyahocorasick). Otherwise all keywords are compiled into one
+regular expression shaped like a trie, which is slower than the automaton
+(and than plain `in` checks for a few dozen keywords; see benchmark_matcher.py).
+"""
+
+import re
+from typing import NamedTuple
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class Hit(NamedTuple):
+    keyword: str
+    start: int
+    end: int
+    groups: tuple
+
+
+def _trie_pattern(keywords):
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # a keyword ends here
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy: the longest keyword at a position is matched
+        return "(?:" + pattern + ")?" if "" in node else pattern
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    def __init__(self, groups, use_ahocorasick=True):
+        """
+        groups: {group name: [keywords]}; a keyword may be in several groups
+        use_ahocorasick: use pyahocorasick if installed (False: always the regex)
+        """
+        self.groups = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                if keyword:
+                    self.groups.setdefault(keyword, ())
+                    self.groups[keyword] += (group,)
+
+        # The regex reports the longest keyword at each position; the keywords
+        # that are prefixes of it start at the same position too
+        self.prefixes = {
+            keyword: sorted(
+                (other for other in self.groups if other != keyword and keyword.startswith(other)),
+                key=len, reverse=True,
+            )
+            for keyword in self.groups
+        }
+
+        self.pattern = re.compile(_trie_pattern(self.groups))
+
+        self.automaton = None
+        if use_ahocorasick and ahocorasick is not None and self.groups:
+            self.automaton = ahocorasick.Automaton()
+            for keyword, keyword_groups in self.groups.items():
+                self.automaton.add_word(keyword, (keyword, keyword_groups))
+            self.automaton.make_automaton()
+
+    def find(self, text):
+        """
+        All keyword occurrences in text, by position (longest first)
+        """
+        if self.automaton is not None:
+            hits = [
+                Hit(keyword, end + 1 - len(keyword), end + 1, keyword_groups)
+                for end, (keyword, keyword_groups) in self.automaton.iter(text)
+            ]
+            # The automaton reports hits by end position
+            hits.sort(key=lambda hit: (hit.start, -len(hit.keyword)))
+            return hits
+
+        hits = []
+        search = self.pattern.search
+        match = search(text)
+        while match:
+            start = match.start()
+            longest = match.group()
+            for keyword in (longest, *self.prefixes[longest]):
+                hits.append(Hit(keyword, start, start + len(keyword), self.groups[keyword]))
+            # Continue right after the start (not the end), so keywords
+            # overlapping this one are found too
+            match = search(text, start + 1)
+        return hits
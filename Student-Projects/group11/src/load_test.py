@@ -0,0 +1,106 @@
+"""
+Concurrency check for the /generate endpoint.
+
+Many simulated users chat at the same time with the FastAPI app (in process,
+no network). The language model API is replaced by a fake one that answers
+after a fixed delay, so the numbers show how well the server overlaps the
+waiting, and every request it receives is checked to contain only the
+history of the user who sent it.
+
+Usage:
+    python load_test.py --users 200 --messages 5 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import httpx
+
+os.environ.setdefault("OPENAI_API_KEY", "load-test")
+
+import api  # noqa: E402
+from server import app  # noqa: E402
+
+
+def fake_model(latency, received):
+    async def handler(request):
+        messages = json.loads(request.content)["messages"]
+        received.append(messages)
+        await asyncio.sleep(latency)
+        # Echo the last user message, so the user's history stays traceable
+        reply = "پاسخ به " + messages[-1]["content"]
+        return httpx.Response(200, json={"choices": [{"message": {"content": reply}}]})
+
+    return handler
+
+
+async def chat(client, user, messages):
+    session_id = None
+    for i in range(messages):
+        response = await client.post(
+            "/generate",
+            json={"prompt": f"کاربر {user} پیام {i}", "session_id": session_id},
+        )
+        data = response.json()
+        session_id = data["session_id"]
+        assert data["response"] == f"پاسخ به کاربر {user} پیام {i}", data
+    return session_id
+
+
+def check_isolation(received):
+    """Every model request must hold the messages of a single user only."""
+    for messages in received:
+        users = {
+            m["content"].split()[-3] for m in messages[1:]
+        }
+        if len(users) != 1:
+            return False
+        if len(messages) - 1 > api.max_memory:
+            return False
+    return True
+
+
+async def run(users, messages, latency):
+    received = []
+    api.http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(fake_model(latency, received)))
+    api.sessions.clear()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        start = time.perf_counter()
+        session_ids = await asyncio.gather(
+            *(chat(client, user, messages) for user in range(users)))
+        elapsed = time.perf_counter() - start
+
+    await api.close_http_client()
+
+    total = users * messages
+    print(f"users:            {users}")
+    print(f"messages:         {total}")
+    print(f"time:             {elapsed:.2f}s "
+          f"(one at a time: {total * latency:.1f}s)")
+    print(f"throughput:       {total / elapsed:.1f} msg/s")
+    print(f"sessions:         {len(set(session_ids))} (kept: {len(api.sessions)})")
+    isolated = check_isolation(received) and len(set(session_ids)) == users
+    print(f"memory isolated:  {'yes' if isolated else 'NO'}")
+    return isolated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.5,
+                        help="seconds the fake model takes to answer")
+    args = parser.parse_args()
+
+    ok = asyncio.run(run(args.users, args.messages, args.latency))
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
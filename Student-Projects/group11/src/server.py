@@ -1,10 +1,21 @@
+import uuid
+from contextlib import asynccontextmanager
+from typing import Optional
+
 from fastapi import FastAPI
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-from api import get_ai_response   # AI response handler
+from api import close_http_client, get_ai_response   # AI response handler
+
+
+# Close the pooled HTTP client on shutdown
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await close_http_client()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Allow access from frontend (CORS)
 app.add_middleware(
@@ -18,12 +29,15 @@ app.add_middleware(
 # Request model
 class UserMessage(BaseModel):
     prompt: str
+    session_id: Optional[str] = None   # omitted on the first message
 
 # Generate AI response
+# (async, so one worker serves many users while they wait for the AI)
 @app.post("/generate")
-def generate_response(data: UserMessage):
-    reply = get_ai_response(data.prompt)
-    return {"response": reply}
+async def generate_response(data: UserMessage):
+    session_id = data.session_id or uuid.uuid4().hex
+    reply = await get_ai_response(data.prompt, session_id)
+    return {"response": reply, "session_id": session_id}
 
 # Run server
 if __name__ == "__main__":
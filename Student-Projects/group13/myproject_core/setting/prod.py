@@ -35,6 +35,16 @@ DATABASES = {
     }
 }
 
+# -------------------------
+# CACHE (shared by all gunicorn workers on this machine)
+# -------------------------
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get("DJANGO_CACHE_DIR", "/var/tmp/django_cache"),
+    }
+}
+
 # -------------------------
 # SECURE COOKIES & SSL
 # -------------------------
@@ -143,6 +143,44 @@ STATICFILES_DIRS = [
 LOGIN_REDIRECT_URL = '/'
 ACCOUNT_LOGOUT_REDIRECT_URL = '/'
 
+# Cache (used for summaries, keyed by a hash of the input text)
+# Local memory by default; dev.py and prod.py switch to a file-based cache
+# so cached summaries survive restarts and are shared between workers.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# How long a summary stays in the cache (seconds)
+SUMMARY_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# Summarization backend
+# "remote": HuggingFace Inference API (facebook/bart-large-cnn)
+# "local":  local model in a worker process, started with
+#           `python manage.py run_local_summarizer` (needs transformers + torch)
+SUMMARY_BACKEND = "remote"
+
+# Local backend settings
+LOCAL_SUMMARY_MODEL = "sshleifer/distilbart-cnn-12-6"
+LOCAL_SUMMARY_HOST = "127.0.0.1"
+LOCAL_SUMMARY_PORT = 8765
+LOCAL_SUMMARY_MAX_BATCH = 8       # texts per forward pass
+LOCAL_SUMMARY_MAX_WAIT = 0.02     # seconds to wait for more requests to batch
+
+# Summary jobs
+# "thread":  jobs run in a background thread pool inside the web process
+# "command": jobs are only queued; run `python manage.py process_summary_jobs`
+SUMMARY_JOB_RUNNER = "thread"
+
+# Background threads per web process (SUMMARY_JOB_RUNNER = "thread")
+SUMMARY_JOB_WORKERS = 4
+
+# Seconds a job may stay "running" before it is assumed lost (its worker
+# died) and reclaimed; it is retried until it has been started this many times
+SUMMARY_JOB_TIMEOUT = 10 * 60
+SUMMARY_JOB_MAX_ATTEMPTS = 2
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
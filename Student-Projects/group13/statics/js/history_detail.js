@@ -0,0 +1,19 @@
+  // Loads the full input text of a history entry the first time it is opened
+  document.querySelectorAll(".history-detail").forEach(detail => {
+    detail.addEventListener("show.bs.collapse", () => {
+      if (detail.dataset.loaded) {
+        return;
+      }
+      const input = detail.querySelector(".history-input");
+      fetch(detail.dataset.detailUrl)
+        .then(response => response.json())
+        .then(history => {
+          input.textContent = history.input_text;
+          detail.dataset.loaded = "true";
+        })
+        // Network error: try again next time the entry is opened
+        .catch(() => {
+          input.textContent = "Could not load the text.";
+        });
+    });
+  });
@@ -0,0 +1,26 @@
+  // Polls the summary job until it is finished, then shows the result
+  const statusBox = document.getElementById("summaryStatus");
+  const POLL_INTERVAL = 1000; // 1 second
+
+  function pollSummary() {
+    fetch(statusBox.dataset.statusUrl)
+      .then(response => response.json())
+      .then(job => {
+        if (job.status === "done") {
+          document.getElementById("summary").value = job.summary;
+          statusBox.classList.add("d-none");
+        } else if (job.status === "failed") {
+          document.getElementById("summaryErrorText").textContent = job.error;
+          document.getElementById("summaryError").classList.remove("d-none");
+          statusBox.classList.add("d-none");
+        } else {
+          setTimeout(pollSummary, POLL_INTERVAL);
+        }
+      })
+      // Network error: try again later
+      .catch(() => setTimeout(pollSummary, POLL_INTERVAL));
+  }
+
+  if (statusBox.dataset.finished === "false") {
+    setTimeout(pollSummary, POLL_INTERVAL);
+  }
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import SummaryHistory
+from .models import SummaryCacheStats, SummaryHistory
 
 
 @admin.register(SummaryHistory)
@@ -25,4 +25,23 @@ class SummaryHistoryAdmin(admin.ModelAdmin):
     list_filter = ('user', 'created_at')
 
     # Optional improvement: make list searchable
-    search_fields = ('user__username', 'input_text', 'summary_text')
\ No newline at end of file
+    search_fields = ('user__username', 'input_text', 'summary_text')
+
+
+@admin.register(SummaryCacheStats)
+class SummaryCacheStatsAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the daily summary cache metrics.
+    """
+    list_display = ('date', 'cache_hits', 'history_hits', 'misses', 'hit_rate_display')
+    date_hierarchy = 'date'
+
+    # Counters are written by the app only
+    readonly_fields = ('date', 'cache_hits', 'history_hits', 'misses')
+
+    @admin.display(description='Hit rate')
+    def hit_rate_display(self, obj):
+        return f"{obj.hit_rate:.1%}"
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,133 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import SummaryJob
+from .services import cached_summary, save_history, summarize_text
+
+# Background threads that run summary jobs inside the web process.
+# Only used when SUMMARY_JOB_RUNNER = "thread"; with "command" the jobs
+# are left in the database for `manage.py process_summary_jobs`.
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.SUMMARY_JOB_WORKERS,
+                    thread_name_prefix="summary-job"
+                )
+    return _executor
+
+
+def _finish(job, summary):
+    job.status = SummaryJob.DONE
+    job.summary_text = summary
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "summary_text", "finished_at"])
+
+    # Save history for logged-in users
+    if job.user_id is not None:
+        save_history(job.user, job.input_text, summary)
+
+
+def submit_job(text, user=None):
+    """
+    Creates a summary job and returns it without waiting for the model.
+    Texts that are already in the cache are finished right away.
+    """
+    job = SummaryJob.objects.create(user=user, input_text=text)
+
+    summary = cached_summary(text)
+    if summary is not None:
+        _finish(job, summary)
+    else:
+        schedule_job(job.pk)
+
+    return job
+
+
+def schedule_job(job_id):
+    """
+    Hands a pending job to the background threads (SUMMARY_JOB_RUNNER = "thread").
+    With "command" the job stays in the database for process_summary_jobs.
+    """
+    if settings.SUMMARY_JOB_RUNNER == "thread":
+        # Start only after the job row is committed, so the thread can see it
+        transaction.on_commit(lambda: _get_executor().submit(run_job, job_id))
+
+
+def run_job(job_id):
+    """
+    Runs one pending job. Safe to call from several threads or processes:
+    only the caller that moves the job from pending to running does the work.
+    """
+    try:
+        claimed = SummaryJob.objects.filter(
+            pk=job_id, status=SummaryJob.PENDING).update(
+                status=SummaryJob.RUNNING,
+                started_at=timezone.now(),
+                attempts=F("attempts") + 1)
+        if not claimed:
+            return
+
+        job = SummaryJob.objects.select_related("user").get(pk=job_id)
+        try:
+            summary = summarize_text(job.input_text)
+        except Exception as error:
+            job.status = SummaryJob.FAILED
+            job.error = str(error) or error.__class__.__name__
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "error", "finished_at"])
+        else:
+            _finish(job, summary)
+    finally:
+        # Worker threads are not part of a request, so close their connections here
+        close_old_connections()
+
+
+def reclaim_stale_jobs(**filters):
+    """
+    Finds running jobs whose worker has died (running for longer than
+    SUMMARY_JOB_TIMEOUT) and puts them back to pending, or marks them failed
+    once they have been tried SUMMARY_JOB_MAX_ATTEMPTS times.
+    Returns how many jobs were reclaimed.
+    """
+    now = timezone.now()
+    stale = SummaryJob.objects.filter(status=SummaryJob.RUNNING, **filters).filter(
+        Q(started_at__lt=now - timedelta(seconds=settings.SUMMARY_JOB_TIMEOUT))
+        | Q(started_at__isnull=True)
+    )
+
+    failed = stale.filter(attempts__gte=settings.SUMMARY_JOB_MAX_ATTEMPTS).update(
+        status=SummaryJob.FAILED,
+        error="The summary was interrupted, please try again.",
+        finished_at=now,
+    )
+    retried = stale.update(status=SummaryJob.PENDING, started_at=None)
+    return failed + retried
+
+
+def run_pending_jobs():
+    """
+    Reclaims lost jobs, then runs every pending job (oldest first).
+    Returns how many were processed.
+    """
+    reclaim_stale_jobs()
+    job_ids = list(
+        SummaryJob.objects.filter(status=SummaryJob.PENDING)
+        .order_by("created_at")
+        .values_list("pk", flat=True)
+    )
+    for job_id in job_ids:
+        run_job(job_id)
+    return len(job_ids)
@@ -0,0 +1,173 @@
+"""
+Local (on-box) summarization backend.
+
+The model runs in one dedicated worker process, started with:
+
+    python manage.py run_local_summarizer
+
+Django workers connect to it over a local socket (multiprocessing.connection)
+and send one text per request. The worker collects the requests that arrive
+within a few milliseconds of each other and summarizes them in one batch,
+so concurrent requests from several Django workers share a single forward pass.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from django.conf import settings
+
+
+def _authkey():
+    # Only processes that know the Django SECRET_KEY may use the worker
+    return settings.SECRET_KEY.encode("utf-8")
+
+
+def _address():
+    return (settings.LOCAL_SUMMARY_HOST, settings.LOCAL_SUMMARY_PORT)
+
+
+# ---------- Model (worker process only) ----------
+
+def load_model_summarizer(model_name):
+    """
+    Loads the model and returns a function that summarizes a list of texts
+    with one padded batch. Imports transformers/torch lazily, so the Django
+    web process never needs them.
+    """
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    model.eval()
+
+    def summarize_batch(texts):
+        inputs = tokenizer(
+            texts, padding=True, truncation=True,
+            max_length=tokenizer.model_max_length, return_tensors="pt")
+        with torch.inference_mode():
+            # Generation settings (beams, lengths) come from the model config
+            output_ids = model.generate(**inputs)
+        return tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+
+    return summarize_batch
+
+
+# ---------- Worker process ----------
+
+class SummaryWorker:
+    """
+    Serves summarize requests with micro-batching.
+
+    - One thread per connected Django worker reads its requests
+    - Requests go into a shared queue
+    - The batching thread takes the first waiting request, then waits up to
+      max_wait seconds for more (at most max_batch) and runs them together
+    """
+
+    def __init__(self, summarize_batch, address=None, max_batch=None, max_wait=None):
+        self.summarize_batch = summarize_batch
+        self.max_batch = max_batch or settings.LOCAL_SUMMARY_MAX_BATCH
+        self.max_wait = settings.LOCAL_SUMMARY_MAX_WAIT if max_wait is None else max_wait
+        self.requests = queue.Queue()
+        # The default backlog (1) stalls Django workers that connect at the same time
+        self.listener = Listener(address or _address(), backlog=64, authkey=_authkey())
+        # Sizes of the most recent batches (for the benchmark and tests)
+        self.batch_sizes = deque(maxlen=1000)
+        self.closed = False
+
+    @property
+    def address(self):
+        return self.listener.address
+
+    def serve_forever(self):
+        threading.Thread(target=self._batch_loop, daemon=True).start()
+        while not self.closed:
+            try:
+                conn = self.listener.accept()
+            except (OSError, AuthenticationError):
+                # Listener closed, or a client failed authentication
+                continue
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def close(self):
+        self.closed = True
+        self.listener.close()
+
+    def _handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    text = conn.recv()
+                except (EOFError, OSError):
+                    return
+
+                future = Future()
+                self.requests.put((text, future))
+                try:
+                    conn.send(("ok", future.result()))
+                except Exception as error:
+                    conn.send(("error", str(error) or error.__class__.__name__))
+
+    def _batch_loop(self):
+        while True:
+            batch = [self.requests.get()]
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self.batch_sizes.append(len(batch))
+            try:
+                summaries = self.summarize_batch([text for text, _ in batch])
+            except Exception as error:
+                for _, future in batch:
+                    future.set_exception(error)
+            else:
+                for (_, future), summary in zip(batch, summaries):
+                    future.set_result(summary)
+
+
+# ---------- Django side ----------
+
+# One connection per thread, kept open between requests
+_local = threading.local()
+
+
+def _connection():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = Client(_address(), authkey=_authkey())
+        _local.conn = conn
+    return conn
+
+
+def summarize(text):
+    """
+    Summarizes `text` with the local worker process.
+    Reconnects once if the worker was restarted since the last request.
+    """
+    for attempt in range(2):
+        try:
+            conn = _connection()
+            conn.send(text)
+            status, result = conn.recv()
+            break
+        except (EOFError, OSError):
+            _local.conn = None
+            if attempt:
+                raise
+
+    if status != "ok":
+        raise RuntimeError(f"Local summarizer failed: {result}")
+    return result
@@ -0,0 +1,88 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from summarizer import local_backend
+from summarizer.services import summarize_remote
+
+BACKENDS = {
+    "remote": summarize_remote,
+    "local": local_backend.summarize,
+}
+
+# English sample paragraphs; every request gets a different numbered copy
+SAMPLE_TEXTS = [
+    "The city council met on Tuesday to discuss the new public transport plan. "
+    "Under the proposal, bus routes would be redesigned around a small number of "
+    "frequent lines, and fares would be capped for passengers who ride more than "
+    "twice a day. Supporters said the change would cut travel times for most "
+    "residents, while critics worried that some neighbourhoods would lose direct "
+    "service. A final vote is expected next month after a round of public hearings.",
+
+    "Researchers have found that short walks after meals can noticeably lower "
+    "blood sugar levels. In a study of several hundred adults, participants who "
+    "walked for ten to fifteen minutes after eating had smaller spikes in glucose "
+    "than those who sat down. The effect was strongest after dinner. The authors "
+    "say the habit is easy to adopt and could help people at risk of type 2 "
+    "diabetes, although longer studies are still needed.",
+
+    "The company reported higher than expected profits for the third quarter, "
+    "driven by strong sales of its new laptop line and growth in its cloud "
+    "services business. Revenue rose twelve percent compared with the same period "
+    "last year. Executives warned, however, that rising component costs and weaker "
+    "demand in some regions could slow growth in the coming months. Shares rose "
+    "four percent in early trading.",
+]
+
+
+class Command(BaseCommand):
+    """
+    Compares the summarization backends (no cache involved):
+    per-request latency (mean, p50, p95) and throughput under concurrency.
+    The local backend needs `manage.py run_local_summarizer` running.
+    """
+    help = "Benchmark remote vs local summarization latency and throughput"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backends", nargs="+", default=["remote", "local"],
+                            choices=sorted(BACKENDS))
+        parser.add_argument("--requests", type=int, default=16,
+                            help="Requests per backend")
+        parser.add_argument("--concurrency", type=int, default=4,
+                            help="Requests in flight at the same time (like several Django workers)")
+
+    def handle(self, *args, **options):
+        texts = [
+            f"Report {i + 1}. {SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]}"
+            for i in range(options["requests"])
+        ]
+
+        self.stdout.write(
+            f"{'backend':<8} {'mean(s)':>8} {'p50(s)':>8} {'p95(s)':>8} {'req/s':>8}")
+
+        for name in options["backends"]:
+            summarize = BACKENDS[name]
+
+            def timed(text):
+                started = time.perf_counter()
+                summarize(text)
+                return time.perf_counter() - started
+
+            # One warm-up request (connection setup, model load on the remote side)
+            try:
+                summarize(texts[0])
+            except Exception as error:
+                raise CommandError(f"{name} backend failed: {error}")
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+                latencies = sorted(pool.map(timed, texts))
+            total = time.perf_counter() - started
+
+            p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+            self.stdout.write(
+                f"{name:<8} {statistics.mean(latencies):>8.2f} "
+                f"{statistics.median(latencies):>8.2f} {p95:>8.2f} "
+                f"{len(texts) / total:>8.2f}")
@@ -0,0 +1,73 @@
+import re
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from langdetect import DetectorFactory, LangDetectException, detect
+
+from summarizer import validators
+from summarizer.forms import SummaryForm
+from summarizer.management.commands.benchmark_summarizer import SAMPLE_TEXTS
+
+OTHER_TEXTS = [
+    # Persian
+    "شورای شهر روز سه‌شنبه برای بررسی طرح جدید حمل‌ونقل عمومی تشکیل جلسه داد. "
+    "بر اساس این طرح، مسیرهای اتوبوس حول تعداد کمی خط پرتکرار بازطراحی می‌شوند.",
+    # French (Latin script, needs langdetect)
+    "Le conseil municipal s'est réuni mardi pour discuter du nouveau plan de "
+    "transport public. Selon la proposition, les lignes de bus seraient réorganisées.",
+]
+
+
+def old_validation(value):
+    # The validators as they were: full re.findall + langdetect on every submit
+    words = re.findall(r'\b\w+\b', value)
+    if len(words) > 500:
+        return False
+    try:
+        return detect(value) == 'en'
+    except LangDetectException:
+        return False
+
+
+def new_validation(value):
+    return SummaryForm({"text": value}).is_valid()
+
+
+class Command(BaseCommand):
+    """
+    Micro-benchmark of the per-submit form validation cost:
+    old validators vs new ones (cold = empty cache, warm = repeated text).
+    Runs against its own in-memory cache, so the project's cache is not touched.
+    """
+    help = "Benchmark summary form validation"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=50)
+
+    def handle(self, *args, **options):
+        runs = options["runs"]
+        texts = SAMPLE_TEXTS + OTHER_TEXTS
+
+        # Load langdetect profiles before timing (both versions load them once)
+        DetectorFactory.seed = 0
+        detect(texts[0])
+        validators._get_factory()
+
+        def per_submit(validate, unique):
+            started = time.perf_counter()
+            for run in range(runs):
+                for text in texts:
+                    # unique=True: a new text every time, so nothing is cached
+                    validate(f"{run} {text}" if unique else text)
+            return (time.perf_counter() - started) / (runs * len(texts)) * 1000
+
+        benchmark_cache = {"default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "benchmark-validators",
+        }}
+        with override_settings(CACHES=benchmark_cache):
+            self.stdout.write(f"{'validation':<18} {'ms/submit':>10}")
+            self.stdout.write(f"{'old':<18} {per_submit(old_validation, True):>10.3f}")
+            self.stdout.write(f"{'new (cold cache)':<18} {per_submit(new_validation, True):>10.3f}")
+            self.stdout.write(f"{'new (warm cache)':<18} {per_submit(new_validation, False):>10.3f}")
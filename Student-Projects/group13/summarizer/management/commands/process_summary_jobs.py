@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from summarizer.jobs import run_pending_jobs
+
+
+class Command(BaseCommand):
+    """
+    Processes pending summary jobs from the database.
+    Used when SUMMARY_JOB_RUNNER = "command" (jobs are not run inside
+    the web workers), or to pick up jobs left behind by a restart
+    (running jobs older than SUMMARY_JOB_TIMEOUT are reclaimed first).
+    """
+    help = "Process pending summary jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Process the current pending jobs and exit")
+        parser.add_argument(
+            "--interval", type=float, default=1.0,
+            help="Seconds between checks for new jobs")
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_pending_jobs()
+            if processed:
+                self.stdout.write(f"Processed {processed} job(s)")
+
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
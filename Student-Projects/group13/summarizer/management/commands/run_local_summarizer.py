@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from summarizer.local_backend import SummaryWorker, load_model_summarizer
+
+
+class Command(BaseCommand):
+    """
+    Starts the local summarization worker (SUMMARY_BACKEND = "local").
+    Loads the model once and serves all Django workers, batching
+    requests that arrive at the same time.
+    """
+    help = "Run the local summarization model worker"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model", default=settings.LOCAL_SUMMARY_MODEL,
+            help="HuggingFace model name or local path")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Loading {options['model']} ...")
+        worker = SummaryWorker(load_model_summarizer(options["model"]))
+
+        host, port = worker.address
+        self.stdout.write(f"Local summarizer listening on {host}:{port}")
+        try:
+            worker.serve_forever()
+        except KeyboardInterrupt:
+            worker.close()
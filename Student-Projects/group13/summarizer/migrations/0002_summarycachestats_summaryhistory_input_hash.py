@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:41
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def fill_input_hash(apps, schema_editor):
+    SummaryHistory = apps.get_model('summarizer', 'SummaryHistory')
+    for history in SummaryHistory.objects.only('id', 'input_text').iterator():
+        history.input_hash = hashlib.sha256(history.input_text.encode('utf-8')).hexdigest()
+        history.save(update_fields=['input_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('summarizer', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SummaryCacheStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('cache_hits', models.PositiveIntegerField(default=0)),
+                ('history_hits', models.PositiveIntegerField(default=0)),
+                ('misses', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'summary cache stats',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='summaryhistory',
+            name='input_hash',
+            field=models.CharField(db_index=True, default='', max_length=64),
+        ),
+        migrations.RunPython(fill_input_hash, migrations.RunPython.noop),
+    ]
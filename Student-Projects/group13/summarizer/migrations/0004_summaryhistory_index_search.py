@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+from summarizer.search import create_search_index, drop_search_index
+
+
+def create_search(apps, schema_editor):
+    # FTS5 table on SQLite, tsvector GIN index on PostgreSQL
+    create_search_index(schema_editor)
+
+
+def drop_search(apps, schema_editor):
+    drop_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('summarizer', '0003_summaryjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='summaryhistory',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='summary_user_created_idx'),
+        ),
+        migrations.RunPython(create_search, drop_search),
+    ]
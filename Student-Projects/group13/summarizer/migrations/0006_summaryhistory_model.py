@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:35
+
+from django.db import migrations, models
+
+from summarizer.search import create_search_index
+
+
+def recreate_search(apps, schema_editor):
+    # SQLite rebuilds the table for the new column, which drops the FTS triggers
+    create_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('summarizer', '0005_summaryjob_started_at'),
+    ]
+
+    operations = [
+        # Reversed last, after RemoveField has rebuilt the table again
+        migrations.RunPython(migrations.RunPython.noop, recreate_search),
+        migrations.AddField(
+            model_name='summaryhistory',
+            name='model',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.RunPython(recreate_search, migrations.RunPython.noop),
+    ]
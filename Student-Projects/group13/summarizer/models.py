@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import User
 
@@ -15,13 +17,104 @@ class SummaryHistory(models.Model):
     
     # The original text the user submitted.
     input_text = models.TextField()
+
+    # SHA-256 of input_text, used to find duplicate inputs quickly.
+    input_hash = models.CharField(max_length=64, db_index=True, default='')
     
     # The summarized result generated by the app.
     summary_text = models.TextField()
+
+    # Model that wrote summary_text; only rows of the configured model
+    # answer later requests for the same input (empty for older rows).
+    model = models.CharField(max_length=200, blank=True, default='')
     
     # Timestamp automatically set when the record is created.
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Serves the history page: one user's rows, newest first
+            # (id breaks ties between rows with the same timestamp)
+            models.Index(fields=['user', '-created_at', '-id'], name='summary_user_created_idx'),
+        ]
+
     def __str__(self):
         # Show first 50 characters for easy identification
         return f"{self.user.username} - {self.input_text[:50]}"
+
+
+class SummaryCacheStats(models.Model):
+    """
+    Daily counters of how each summary request was answered:
+    from the cache, from an existing history row, or by the remote model.
+    """
+    date = models.DateField(unique=True)
+
+    # Answered from Django's cache
+    cache_hits = models.PositiveIntegerField(default=0)
+
+    # Answered from an existing SummaryHistory row with the same input
+    history_hits = models.PositiveIntegerField(default=0)
+
+    # Sent to the HuggingFace Inference API
+    misses = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-date']
+        verbose_name_plural = 'summary cache stats'
+
+    @property
+    def hit_rate(self):
+        total = self.cache_hits + self.history_hits + self.misses
+        return (self.cache_hits + self.history_hits) / total if total else 0.0
+
+    def __str__(self):
+        return f"{self.date}: {self.hit_rate:.0%} hit rate"
+
+
+class SummaryJob(models.Model):
+    """
+    A summarization request processed in the background.
+    The web request only creates the job; a worker thread (or the
+    process_summary_jobs management command) fills in the summary,
+    and the result page polls the job's status.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    # Random id, so job URLs cannot be guessed
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    # Owner of the job; history is saved for logged-in users only
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, null=True, blank=True, related_name='summary_jobs')
+
+    input_text = models.TextField()
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=PENDING, db_index=True)
+
+    # Filled in when the job finishes
+    summary_text = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Set each time a worker claims the job; a job running for longer than
+    # SUMMARY_JOB_TIMEOUT is assumed lost (its thread or process died)
+    started_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def is_finished(self):
+        return self.status in (self.DONE, self.FAILED)
+
+    def __str__(self):
+        return f"{self.status} - {self.input_text[:50]}"
@@ -0,0 +1,110 @@
+"""
+Full-text search over SummaryHistory (input and summary text).
+
+The search index depends on the database of the settings module:
+- SQLite (dev): an FTS5 table kept in sync by triggers
+- PostgreSQL (prod): a GIN index on a tsvector expression
+Both are created by migration 0004. Other databases fall back to icontains.
+
+Note: on SQLite, a later migration that rebuilds the summaryhistory table
+drops its triggers; recreate them with create_search_index().
+"""
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+HISTORY_TABLE = "summarizer_summaryhistory"
+FTS_TABLE = "summarizer_summaryhistory_fts"
+
+# Must be the same expression as the index, so PostgreSQL can use it
+PG_DOCUMENT = "to_tsvector('english', input_text || ' ' || summary_text)"
+
+SQLITE_SQL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        input_text, summary_text, content='{HISTORY_TABLE}', content_rowid='id')""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {HISTORY_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, input_text, summary_text)
+        VALUES (new.id, new.input_text, new.summary_text);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {HISTORY_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, input_text, summary_text)
+        VALUES ('delete', old.id, old.input_text, old.summary_text);
+    END""",
+    # Only re-index when the text changes (not when created_at is bumped)
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+        AFTER UPDATE OF input_text, summary_text ON {HISTORY_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, input_text, summary_text)
+        VALUES ('delete', old.id, old.input_text, old.summary_text);
+        INSERT INTO {FTS_TABLE}(rowid, input_text, summary_text)
+        VALUES (new.id, new.input_text, new.summary_text);
+    END""",
+    # Index the rows that already exist
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRES_SQL = [
+    f"CREATE INDEX IF NOT EXISTS summary_search_idx ON {HISTORY_TABLE} USING GIN ({PG_DOCUMENT})",
+]
+
+POSTGRES_DROP_SQL = [
+    "DROP INDEX IF EXISTS summary_search_idx",
+]
+
+
+def _run(schema_editor, statements):
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def create_search_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_SQL)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_SQL)
+
+
+def drop_search_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_DROP_SQL)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_DROP_SQL)
+
+
+def _fts5_query(query):
+    # Quote every word, so characters like - : * " are searched literally
+    # instead of being read as FTS5 syntax. Words are combined with AND.
+    return " ".join('"{}"'.format(word.replace('"', '""')) for word in query.split())
+
+
+def search_history(queryset, query):
+    """
+    Filters a SummaryHistory queryset to rows whose input or summary
+    matches `query` (all words must match).
+    """
+    vendor = connections[queryset.db].vendor
+
+    if vendor == "sqlite":
+        matches = RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+            [_fts5_query(query)])
+        return queryset.filter(id__in=matches)
+
+    if vendor == "postgresql":
+        matches = RawSQL(
+            f"SELECT id FROM {HISTORY_TABLE} "
+            f"WHERE {PG_DOCUMENT} @@ websearch_to_tsquery('english', %s)",
+            [query])
+        return queryset.filter(id__in=matches)
+
+    for word in query.split():
+        queryset = queryset.filter(Q(input_text__icontains=word) | Q(summary_text__icontains=word))
+    return queryset
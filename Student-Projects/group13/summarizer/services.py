@@ -0,0 +1,133 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+from huggingface_hub import InferenceClient
+
+from . import local_backend
+from .models import SummaryCacheStats, SummaryHistory
+
+SUMMARY_MODEL = "facebook/bart-large-cnn"
+
+# One InferenceClient per process, shared by all requests.
+# It keeps its HTTP connections open, so repeated calls skip the TLS handshake.
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Returns the shared HuggingFace InferenceClient (created on first use).
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = InferenceClient(api_key=settings.HUGGINGFACE_API_KEY)
+    return _client
+
+
+def text_hash(text):
+    """
+    Content hash of the input text, used as the cache key and stored on
+    SummaryHistory so duplicate inputs can be found with an index lookup.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def model_name():
+    # Model of the configured backend (part of the cache key)
+    if settings.SUMMARY_BACKEND == "local":
+        return settings.LOCAL_SUMMARY_MODEL
+    return SUMMARY_MODEL
+
+
+def summarize_remote(text):
+    result = get_client().summarization(text, model=SUMMARY_MODEL)
+    return result["summary_text"]
+
+
+def summarize_with_backend(text):
+    """
+    Runs the configured backend without any caching:
+    "remote" -> HuggingFace Inference API, "local" -> local worker process.
+    """
+    if settings.SUMMARY_BACKEND == "local":
+        return local_backend.summarize(text)
+    return summarize_remote(text)
+
+
+def _cache_key(digest):
+    return f"summary:{model_name()}:{digest}"
+
+
+def _count(field):
+    # Daily counters shown in the admin (one row per day)
+    today = timezone.localdate()
+    SummaryCacheStats.objects.get_or_create(date=today)
+    SummaryCacheStats.objects.filter(date=today).update(**{field: F(field) + 1})
+
+
+def cached_summary(text):
+    """
+    Returns the cached summary of `text`, or None.
+    Only a cache lookup, cheap enough to run inside the web request.
+    """
+    summary = cache.get(_cache_key(text_hash(text)))
+    if summary is not None:
+        _count("cache_hits")
+    return summary
+
+
+def summarize_text(text):
+    """
+    Returns the summary of `text`.
+    Lookup order:
+    1. Django cache (content hash key)
+    2. An existing SummaryHistory row with the same input and model
+    3. The configured backend (result is cached afterwards)
+    """
+    summary = cached_summary(text)
+    if summary is not None:
+        return summary
+
+    digest = text_hash(text)
+    key = _cache_key(digest)
+
+    summary = (
+        SummaryHistory.objects.filter(input_hash=digest, model=model_name())
+        .values_list("summary_text", flat=True)
+        .first()
+    )
+    if summary is not None:
+        _count("history_hits")
+    else:
+        summary = summarize_with_backend(text)
+        _count("misses")
+
+    cache.set(key, summary, settings.SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+def save_history(user, text, summary):
+    """
+    Saves a summary to the user's history.
+    If the user already summarized the same text, the existing row is
+    reused (moved to the top of the history) instead of adding a duplicate.
+    """
+    digest = text_hash(text)
+    model = model_name()
+    updated = SummaryHistory.objects.filter(user=user, input_hash=digest).update(
+        summary_text=summary, model=model, created_at=timezone.now())
+
+    if not updated:
+        SummaryHistory.objects.create(
+            user=user,
+            input_text=text,
+            input_hash=digest,
+            summary_text=summary,
+            model=model
+        )
@@ -1,6 +1,23 @@
-from django.test import TestCase
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from . import local_backend, validators
+from .jobs import reclaim_stale_jobs, run_pending_jobs
+from .local_backend import SummaryWorker
+from .models import SummaryCacheStats, SummaryHistory, SummaryJob
+from .services import save_history, summarize_text
+from .views import HISTORY_PAGE_SIZE
+from .validators import english_only_validator, max_words_validator
 
 User = get_user_model()
 
@@ -26,3 +43,268 @@ class EmailLoginTests(TestCase):
 
         # Check that user is authenticated
         self.assertTrue("_auth_user_id" in self.client.session)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    SUMMARY_JOB_RUNNER="command",
+)
+class SummaryCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser",
+            email="test@example.com",
+            password="testpassword123"
+        )
+        self.text = "The quick brown fox jumps over the lazy dog. " * 5
+
+        # Fake remote client: counts calls instead of hitting the API
+        self.client_mock = mock.Mock()
+        self.client_mock.summarization.return_value = {"summary_text": "A fox jumps."}
+        patcher = mock.patch("summarizer.services.get_client", return_value=self.client_mock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_same_text_calls_remote_model_once(self):
+        self.assertEqual(summarize_text(self.text), "A fox jumps.")
+        self.assertEqual(summarize_text(self.text), "A fox jumps.")
+
+        self.assertEqual(self.client_mock.summarization.call_count, 1)
+        stats = SummaryCacheStats.objects.get()
+        self.assertEqual((stats.misses, stats.cache_hits), (1, 1))
+
+    def test_history_row_answers_after_cache_is_cleared(self):
+        save_history(self.user, self.text, summarize_text(self.text))
+        cache.clear()
+
+        self.assertEqual(summarize_text(self.text), "A fox jumps.")
+        self.assertEqual(self.client_mock.summarization.call_count, 1)
+        self.assertEqual(SummaryCacheStats.objects.get().history_hits, 1)
+
+    @override_settings(LOCAL_SUMMARY_MODEL="local-model")
+    def test_history_row_of_other_model_is_not_reused(self):
+        save_history(self.user, self.text, summarize_text(self.text))
+        cache.clear()
+
+        with override_settings(SUMMARY_BACKEND="local"), \
+                mock.patch.object(local_backend, "summarize", return_value="Local summary.") as local:
+            self.assertEqual(summarize_text(self.text), "Local summary.")
+            # Cached under the local model's key only
+            self.assertEqual(summarize_text(self.text), "Local summary.")
+
+        self.assertEqual(local.call_count, 1)
+        self.assertEqual(summarize_text(self.text), "A fox jumps.")
+        self.assertEqual(SummaryCacheStats.objects.get().history_hits, 1)
+
+    def test_duplicate_input_reuses_history_row(self):
+        self.client.force_login(self.user)
+        self.client.post(reverse("sum"), {"text": self.text})
+        run_pending_jobs()
+        self.client.post(reverse("sum"), {"text": self.text})
+
+        self.assertEqual(SummaryHistory.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(self.client_mock.summarization.call_count, 1)
+
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    SUMMARY_JOB_RUNNER="command",
+)
+class SummaryJobTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.text = "The quick brown fox jumps over the lazy dog. " * 5
+
+        self.client_mock = mock.Mock()
+        self.client_mock.summarization.return_value = {"summary_text": "A fox jumps."}
+        patcher = mock.patch("summarizer.services.get_client", return_value=self.client_mock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def submit(self):
+        response = self.client.post(reverse("sum"), {"text": self.text})
+        self.assertRedirects(response, reverse("summary_result"))
+        return SummaryJob.objects.get(pk=self.client.session["summary_job"])
+
+    def test_post_returns_before_the_model_runs(self):
+        job = self.submit()
+
+        self.assertEqual(job.status, SummaryJob.PENDING)
+        self.client_mock.summarization.assert_not_called()
+
+        status_url = reverse("summary_status", args=[job.pk])
+        self.assertEqual(self.client.get(status_url).json()["status"], "pending")
+
+        run_pending_jobs()
+        data = self.client.get(status_url).json()
+        self.assertEqual((data["status"], data["summary"]), ("done", "A fox jumps."))
+
+    def test_failed_job_reports_error(self):
+        self.client_mock.summarization.side_effect = RuntimeError("API down")
+        job = self.submit()
+        run_pending_jobs()
+
+        data = self.client.get(reverse("summary_status", args=[job.pk])).json()
+        self.assertEqual((data["status"], data["error"]), ("failed", "API down"))
+
+    def test_lost_running_job_is_retried_then_failed(self):
+        job = self.submit()
+        # Claimed by a worker that died 20 minutes ago
+        started = timezone.now() - timedelta(minutes=20)
+        SummaryJob.objects.filter(pk=job.pk).update(
+            status=SummaryJob.RUNNING, started_at=started, attempts=1)
+
+        run_pending_jobs()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (SummaryJob.DONE, 2))
+
+        # Out of attempts: failed, so the result page stops polling
+        SummaryJob.objects.filter(pk=job.pk).update(
+            status=SummaryJob.RUNNING, started_at=started)
+        data = self.client.get(reverse("summary_status", args=[job.pk])).json()
+        self.assertEqual(data["status"], "failed")
+
+    def test_recent_running_job_is_not_reclaimed(self):
+        job = SummaryJob.objects.create(
+            input_text=self.text, status=SummaryJob.RUNNING,
+            started_at=timezone.now(), attempts=1)
+
+        self.assertEqual(reclaim_stale_jobs(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, SummaryJob.RUNNING)
+
+    def test_status_of_another_sessions_job_is_hidden(self):
+        job = SummaryJob.objects.create(input_text=self.text)
+        response = self.client.get(reverse("summary_status", args=[job.pk]))
+        self.assertEqual(response.status_code, 404)
+
+
+class HistoryTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser",
+            email="test@example.com",
+            password="testpassword123"
+        )
+        self.client.force_login(self.user)
+        for i in range(5):
+            save_history(self.user, f"Input number {i} about topic{i}.", f"Summary {i}")
+
+    def page_ids(self, response):
+        return [h.pk for h in response.context["histories"]]
+
+    def test_keyset_pages_cover_history_once(self):
+        expected = list(
+            SummaryHistory.objects.order_by("-created_at", "-id").values_list("pk", flat=True))
+
+        seen = []
+        response = self.client.get(reverse("history"))
+        while True:
+            seen += self.page_ids(response)
+            self.assertLessEqual(len(response.context["histories"]), HISTORY_PAGE_SIZE)
+            if not response.context["has_next"]:
+                break
+            response = self.client.get(
+                reverse("history"), {"after": response.context["next_cursor"]})
+        self.assertEqual(seen, expected)
+
+        # Previous from the second page is the first page
+        second = self.client.get(reverse("history"), {"after": expected[HISTORY_PAGE_SIZE - 1]})
+        first = self.client.get(
+            reverse("history"), {"before": second.context["previous_cursor"]})
+        self.assertEqual(self.page_ids(first), expected[:HISTORY_PAGE_SIZE])
+        self.assertFalse(first.context["has_previous"])
+
+    def test_list_defers_input_text(self):
+        response = self.client.get(reverse("history"))
+        history = response.context["histories"][0]
+
+        self.assertIn("input_text", history.get_deferred_fields())
+        self.assertTrue(history.input_preview.startswith("Input number"))
+
+    def test_search_matches_input_and_summary(self):
+        response = self.client.get(reverse("history"), {"q": "topic3"})
+        self.assertEqual([h.summary_text for h in response.context["histories"]], ["Summary 3"])
+
+        # Rows updated after the migration are re-indexed
+        save_history(self.user, "Input number 3 about topic3.", "Changed summary")
+        response = self.client.get(reverse("history"), {"q": "changed"})
+        self.assertEqual(len(response.context["histories"]), 1)
+
+        # FTS5 syntax characters are searched as plain text
+        response = self.client.get(reverse("history"), {"q": 'topic3" OR -'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_is_limited_to_owner(self):
+        history = SummaryHistory.objects.first()
+        url = reverse("history_detail", args=[history.pk])
+        self.assertEqual(self.client.get(url).json()["input_text"], history.input_text)
+
+        other = User.objects.create_user(username="other", password="testpassword123")
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class LocalBackendTests(SimpleTestCase):
+
+    def setUp(self):
+        def summarize_batch(texts):
+            time.sleep(0.05)
+            return [text.upper() for text in texts]
+
+        # Port 0: any free port
+        self.worker = SummaryWorker(
+            summarize_batch, address=("127.0.0.1", 0), max_batch=8, max_wait=0.2)
+        threading.Thread(target=self.worker.serve_forever, daemon=True).start()
+        self.addCleanup(self.worker.close)
+
+    def test_concurrent_requests_are_batched(self):
+        host, port = self.worker.address
+        texts = [f"text {i}" for i in range(6)]
+
+        with override_settings(LOCAL_SUMMARY_HOST=host, LOCAL_SUMMARY_PORT=port):
+            with ThreadPoolExecutor(max_workers=len(texts)) as pool:
+                summaries = list(pool.map(local_backend.summarize, texts))
+
+        self.assertEqual(summaries, [text.upper() for text in texts])
+        self.assertGreater(max(self.worker.batch_sizes), 1)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class ValidatorTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_english_prose_skips_langdetect(self):
+        text = "The city council met on Tuesday to discuss the new public transport plan."
+        with mock.patch.object(validators, "_get_factory") as factory:
+            english_only_validator(text)
+        factory.assert_not_called()
+
+    def test_non_latin_script_is_rejected_without_langdetect(self):
+        with mock.patch.object(validators, "_get_factory") as factory:
+            with self.assertRaisesMessage(ValidationError, "Only English text is supported."):
+                english_only_validator("شورای شهر روز سه‌شنبه برای بررسی طرح جدید تشکیل جلسه داد.")
+        factory.assert_not_called()
+
+    def test_latin_script_falls_back_to_langdetect(self):
+        text = "Le conseil municipal s'est réuni mardi pour discuter du nouveau plan de transport."
+        with self.assertRaisesMessage(ValidationError, "Only English text is supported."):
+            english_only_validator(text)
+
+        # Decision is cached: the second call does not run langdetect again
+        with mock.patch.object(validators, "_get_factory") as factory:
+            with self.assertRaises(ValidationError):
+                english_only_validator(text)
+        factory.assert_not_called()
+
+    def test_max_words(self):
+        max_words_validator("word " * 500)
+        with self.assertRaisesMessage(ValidationError, "You wrote 501."):
+            max_words_validator("word " * 501)
@@ -8,6 +8,12 @@ urlpatterns = [
     # Page that displays the summary result after processing
     path('result/', views.summary_result_view, name='summary_result'),
 
-    # Page showing the user's saved summary history (paginated)
+    # JSON status of a background summary job (polled by the result page)
+    path('result/<uuid:job_id>/status/', views.summary_status_view, name='summary_status'),
+
+    # Page showing the user's saved summary history (paginated, searchable)
     path('history/', views.history_view, name='history'),
+
+    # Full input text of one history entry (loaded when "View More" is opened)
+    path('history/<int:pk>/', views.history_detail_view, name='history_detail'),
 ]
\ No newline at end of file
@@ -1,25 +1,115 @@
+import hashlib
 import re
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from langdetect import detect, LangDetectException
-from django.core.exceptions import ValidationError
+from langdetect import DetectorFactory, LangDetectException
+from langdetect.detector_factory import PROFILES_DIRECTORY
+
+MAX_WORDS = 500
+
+# A 'word' is any sequence of alphanumeric characters
+WORD_RE = re.compile(r'\b\w+\b')
+
+# Very common English words. Plain ASCII text where they make up a large
+# share of the words is accepted as English without running langdetect.
+ENGLISH_COMMON_WORDS = frozenset(
+    "the of and to in is that for it was on with as be by this are at from "
+    "or an have has had not but which they their will would can we he she".split()
+)
+ENGLISH_COMMON_RATIO = 0.2
+MIN_WORDS_FOR_SHORTCUT = 8
+
 
 def max_words_validator(value):
     """
     Validates that the input text does not exceed the allowed word limit.
     A 'word' is any sequence of alphanumeric characters.
     """
-    words = re.findall(r'\b\w+\b', value)
-    if len(words) > 500:
-        raise ValidationError(f"Max 500 words allowed. You wrote {len(words)}.")
+    # Words are separated by at least one character,
+    # so short texts cannot exceed the limit: no need to count
+    if len(value) < 2 * MAX_WORDS:
+        return
+
+    count = len(WORD_RE.findall(value))
+    if count > MAX_WORDS:
+        raise ValidationError(f"Max {MAX_WORDS} words allowed. You wrote {count}.")
+
+
+# One langdetect factory per process: the language profiles are loaded once,
+# and the fixed seed makes the result the same for the same text.
+# (A Detector can only be used for one text, so one is created per call.)
+_factory = None
+_factory_lock = threading.Lock()
+
+
+def _get_factory():
+    global _factory
+    if _factory is None:
+        with _factory_lock:
+            if _factory is None:
+                factory = DetectorFactory()
+                factory.load_profile(PROFILES_DIRECTORY)
+                factory.seed = 0
+                _factory = factory
+    return _factory
+
+
+def _script_check(value):
+    """
+    Cheap checks before langdetect.
+    Returns "en", "other" or None (undecided).
+    """
+    if value.isascii():
+        words = WORD_RE.findall(value.lower())
+        if len(words) >= MIN_WORDS_FOR_SHORTCUT:
+            common = sum(1 for word in words if word in ENGLISH_COMMON_WORDS)
+            if common / len(words) >= ENGLISH_COMMON_RATIO:
+                return "en"
+        return None
+
+    # Mostly non-Latin letters (Persian, Arabic, Cyrillic, CJK, ...)
+    letters = [ch for ch in value if ch.isalpha()]
+    if letters:
+        latin = sum(1 for ch in letters if ch <= '\u024f')
+        if latin / len(letters) < 0.5:
+            return "other"
+    return None
+
+
+def detect_language(value):
+    """
+    Returns "en", "other" or "unknown" for the given text.
+    Decisions are cached by content hash.
+    """
+    key = "lang:" + hashlib.sha256(value.encode("utf-8")).hexdigest()
+    decision = cache.get(key)
+    if decision is not None:
+        return decision
+
+    decision = _script_check(value)
+    if decision is None:
+        try:
+            detector = _get_factory().create()
+            detector.append(value)
+            decision = "en" if detector.detect() == "en" else "other"
+        except LangDetectException:
+            decision = "unknown"
+
+    cache.set(key, decision, settings.SUMMARY_CACHE_TIMEOUT)
+    return decision
+
 
 def english_only_validator(value):
     """
-    Detects input language using langdetect.
     Requires the text to be English ('en').
+    Uses a cheap script / common-word check first and langdetect only
+    when that is not conclusive.
     """
-    try:
-        detected = detect(value)
-        if detected != 'en':
-            raise ValidationError("Only English text is supported.")
-    except LangDetectException:
-        raise ValidationError("Unable to detect language. Please enter English text.")
\ No newline at end of file
+    decision = detect_language(value)
+    if decision == "other":
+        raise ValidationError("Only English text is supported.")
+    if decision == "unknown":
+        raise ValidationError("Unable to detect language. Please enter English text.")
@@ -1,11 +1,19 @@
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render, redirect
+from django.shortcuts import get_object_or_404, render, redirect
 from django.contrib import messages
-from django.conf import settings
-from django.core.paginator import Paginator
-from huggingface_hub import InferenceClient
+from django.db.models import Q
+from django.db.models.functions import Left
+from django.http import JsonResponse
 from .forms import SummaryForm
-from .models import SummaryHistory
+from .jobs import reclaim_stale_jobs, schedule_job, submit_job
+from .models import SummaryHistory, SummaryJob
+from .search import search_history
+
+HISTORY_PAGE_SIZE = 2
+
+# Characters of input_text loaded for the history list
+# (one more than is shown, so the template knows when to add "...")
+INPUT_PREVIEW_CHARS = 81
 
 
 def summary_view(request):
@@ -13,9 +21,8 @@ def summary_view(request):
     Main summarizer view.
     Handles:
     - Form submission
-    - Calling the HuggingFace summarization model
-    - Saving history (if the user is logged in)
-    - Storing data temporarily in the session
+    - Submitting a background summary job (the request does not wait for the model)
+    - Storing the job id temporarily in the session
     """
     if request.method == "POST":
         form = SummaryForm(request.POST)
@@ -23,66 +30,153 @@ def summary_view(request):
         if form.is_valid():
             text = form.cleaned_data['text']
 
-            # HuggingFace summarization API call
-            client = InferenceClient(api_key=settings.HUGGINGFACE_API_KEY)
-            result = client.summarization(
-                text, model="facebook/bart-large-cnn")
-            summary = result["summary_text"]
+            # Background job: cached texts finish right away,
+            # others are summarized by the HuggingFace model in a worker
+            user = request.user if request.user.is_authenticated else None
+            job = submit_job(text, user)
             
-            # Store result temporarily in session
-            request.session['summary'] = summary
-            request.session['original_text'] = text
-            
-            # Save history for logged-in users
-            if request.user.is_authenticated:
-                SummaryHistory.objects.create(
-                    user=request.user,
-                    input_text=text,
-                    summary_text=summary
-                )
-            messages.success(
-                request, "Your summary has been generated successfully!")
+            # Store the job id temporarily in session
+            request.session['summary_job'] = str(job.pk)
+
+            if job.status == SummaryJob.DONE:
+                messages.success(
+                    request, "Your summary has been generated successfully!")
             return redirect('summary_result')
 
     else:
 
         # When loading the page normally: clear leftover session data
-        request.session.pop('summary', None)
-        request.session.pop('original_text', None)
+        request.session.pop('summary_job', None)
         form = SummaryForm()
 
     return render(request, "summarizer/home.html", {"form": form})
 
 
+def _session_job(request, job_id=None):
+    """
+    Returns the summary job stored in the session (or None).
+    If job_id is given, it must match the session's job.
+    """
+    session_job_id = request.session.get('summary_job')
+    if not session_job_id or (job_id is not None and str(job_id) != session_job_id):
+        return None
+    return SummaryJob.objects.filter(pk=session_job_id).first()
+
+
 def summary_result_view(request):
     """
-    Shows the final summary result after processing.
-    Prevents direct access if no summary exists in the session.
+    Shows the summary result.
+    While the job is still running, the page polls summary_status.
+    Prevents direct access if no job exists in the session.
     """
-    summary = request.session.get('summary')
-    original_text = request.session.get('original_text')
+    job = _session_job(request)
     
     # Protect the page from direct access
-    if not summary:
+    if job is None:
         messages.warning(
             request, "No summary found. Please submit text first.")
         return redirect('sum')  
 
     return render(request, "summarizer/result.html", {
-        "summary": summary,
-        "original_text": original_text
+        "job": job,
+        "summary": job.summary_text,
+        "original_text": job.input_text
     })
 
+
+def summary_status_view(request, job_id):
+    """
+    JSON status of a summary job, polled by the result page.
+    """
+    job = _session_job(request, job_id)
+    if job is None:
+        return JsonResponse({"error": "Job not found"}, status=404)
+
+    # A job whose worker died would stay "running" forever: retry or fail it
+    if job.status == SummaryJob.RUNNING and reclaim_stale_jobs(pk=job.pk):
+        job.refresh_from_db()
+        if job.status == SummaryJob.PENDING:
+            schedule_job(job.pk)
+
+    return JsonResponse({
+        "status": job.status,
+        "summary": job.summary_text,
+        "error": job.error,
+    })
+
+def _history_cursor(request, param):
+    """
+    Returns (created_at, pk) of the history row given in the `after` or
+    `before` query parameter, or None. Only the user's own rows are accepted.
+    """
+    pk = request.GET.get(param, '')
+    if not pk.isdigit():
+        return None
+    return (
+        SummaryHistory.objects.filter(user=request.user, pk=pk)
+        .values_list('created_at', 'pk')
+        .first()
+    )
+
+
 @login_required
 def history_view(request):
     """
-    Displays the logged-in user's summary history with pagination.
+    Displays the logged-in user's summary history, newest first.
+    - Keyset pagination: ?after=<id> / ?before=<id> continue from a row,
+      so every page is an index range scan instead of an OFFSET
+    - Optional full-text search with ?q=
+    - Only a preview of input_text is loaded; the full text is fetched
+      from history_detail when the user opens it
     """
     # Filter history by current user only
-    histories = SummaryHistory.objects.filter(user=request.user).order_by('-created_at')
-    
-    # Clean pagination (handles invalid pages automatically)
-    paginator = Paginator(histories, 2)
-    page_obj = paginator.get_page(request.GET.get('page'))
+    histories = SummaryHistory.objects.filter(user=request.user)
 
-    return render(request, "summarizer/history.html", {"page_obj": page_obj})
\ No newline at end of file
+    query = request.GET.get('q', '').strip()
+    if query:
+        histories = search_history(histories, query)
+
+    histories = histories.defer('input_text').annotate(
+        input_preview=Left('input_text', INPUT_PREVIEW_CHARS))
+
+    after = _history_cursor(request, 'after')
+    before = _history_cursor(request, 'before') if after is None else None
+
+    if before is not None:
+        # Previous page: the rows just newer than the cursor, read upwards
+        created_at, pk = before
+        rows = list(
+            histories.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+            .order_by('created_at', 'id')[:HISTORY_PAGE_SIZE + 1]
+        )
+        has_previous = len(rows) > HISTORY_PAGE_SIZE
+        has_next = True
+        rows = rows[:HISTORY_PAGE_SIZE][::-1]
+    else:
+        if after is not None:
+            created_at, pk = after
+            histories = histories.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+        rows = list(histories.order_by('-created_at', '-id')[:HISTORY_PAGE_SIZE + 1])
+        has_previous = after is not None
+        has_next = len(rows) > HISTORY_PAGE_SIZE
+        rows = rows[:HISTORY_PAGE_SIZE]
+
+    return render(request, "summarizer/history.html", {
+        "histories": rows,
+        "query": query,
+        "has_previous": has_previous and bool(rows),
+        "has_next": has_next and bool(rows),
+        "previous_cursor": rows[0].pk if rows else None,
+        "next_cursor": rows[-1].pk if rows else None,
+    })
+
+
+@login_required
+def history_detail_view(request, pk):
+    """
+    JSON with the full input text of one history row (loaded on demand).
+    """
+    history = get_object_or_404(
+        SummaryHistory.objects.only('input_text'), pk=pk, user=request.user)
+    return JsonResponse({"input_text": history.input_text})
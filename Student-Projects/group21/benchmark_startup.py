@@ -0,0 +1,54 @@
+import glob
+import os
+import sys
+import tempfile
+import time
+
+import yamnet
+
+
+# اندازه‌گیری زمان cold start و warm start
+#
+# - load مدل YAMNet (از TF-Hub بار اول، یا از model/yamnet روی دیسک)
+# - استخراج embedding بدون کش (decode + YAMNet)
+# - استخراج embedding همون فایل‌ها از کش (فقط هش فایل + خوندن از memmap)
+#
+# اجرا:
+#   python benchmark_startup.py                  (فایل‌های data/genres_original)
+#   python benchmark_startup.py song1.wav song2.mp3
+
+
+def main():
+    files = sys.argv[1:] or sorted(
+        glob.glob(os.path.join("data", "genres_original", "*", "*.wav"))
+    )
+    if not files:
+        print("No audio files found")
+        return
+
+    source = "local (model/yamnet)" if os.path.isdir(yamnet.YAMNET_DIR) else "TF-Hub download"
+    yamnet.load_yamnet()
+    print(f"YAMNet load from {source}: {yamnet.load_seconds:.2f}s")
+
+    # یک کش خالی موقت، تا کش اصلی پروژه دست نخوره
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = yamnet.EmbeddingCache(tmp_dir)
+
+        started = time.perf_counter()
+        for path in files:
+            yamnet.embed_file(path, cache)
+        cold = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for path in files:
+            yamnet.embed_file(path, cache)
+        warm = time.perf_counter() - started
+
+    n = len(files)
+    print(f"Files: {n}")
+    print(f"Cold (no cache):  {cold:.2f}s total, {cold / n * 1000:.1f} ms/file")
+    print(f"Warm (cache hit): {warm:.2f}s total, {warm / n * 1000:.1f} ms/file")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,21 @@
-import librosa
+import argparse
+import csv
 import numpy as np
-import tensorflow_hub as hub
 import joblib
 import os
 
+from yamnet import (
+    EMBEDDING_SIZE,
+    SAMPLE_RATE,
+    WINDOW_SECONDS,
+    embed_file,
+    embed_files,
+    embed_waveform,
+    stream_waveform
+)
+
 
 # ثابت‌های کلی پروژه
-SAMPLE_RATE = 16000              # نرخ نمونه‌برداری استاندارد برای YAMNet
 MODEL_DIR = "model"              # پوشه‌ای که مدل و فایل‌های مربوطه داخلش ذخیره میشن
 
 MODEL_PATH = os.path.join(MODEL_DIR, "svm_model.pkl")
@@ -14,11 +23,6 @@ SCALER_PATH = os.path.join(MODEL_DIR, "scaler.pkl")
 ENCODER_PATH = os.path.join(MODEL_DIR, "label_encoder.pkl")
 
 
-# بارگذاری مدل YAMNet
-# این مدل از قبل train شده و فقط برای استخراج ویژگی استفاده میشه
-YAMNET = hub.load("https://tfhub.dev/google/yamnet/1")
-
-
 # متغیرهای lazy-load شده
 # اینا اولش None هستن و فقط وقتی لازم بشه load میشن
 svm_model = None
@@ -54,20 +58,15 @@ def extract_yamnet_features(audio_path, progress_callback=None):
     این تابع فایل صوتی رو می‌گیره،
     می‌فرسته به YAMNet
     و embedding نهایی رو برمی‌گردونه
+    (مدل YAMNet یک بار load میشه و embedding فایل‌های تکراری از کش خونده میشه)
     """
-    # لود فایل صوتی و تبدیل به mono
-    audio, _ = librosa.load(audio_path, sr=SAMPLE_RATE, mono=True)
-    waveform = audio.astype(np.float32)
-
-    # گرفتن embedding از YAMNet
-    scores, embeddings, _ = YAMNET(waveform)
+    features = embed_file(audio_path)
 
     # برای آپدیت progress (اینجا فقط یه مرحله داریم)
     if progress_callback:
         progress_callback(1, 1)
 
-    # میانگین گرفتن از embedding‌ها برای یک بردار نهایی
-    return np.mean(embeddings.numpy(), axis=0)
+    return features
 
 
 # پیش‌بینی ژانر به همراه confidence
@@ -86,24 +85,203 @@ def predict_genre_with_confidence(audio_path, progress_callback=None):
         progress_callback
     )
 
+    predicted_genres, confidence_dicts = classify_features([features])
+    return predicted_genres[0], confidence_dicts[0]
+
+
+# پیش‌بینی ژانر روی بردارهای ویژگی آماده
+def classify_features(feature_vectors):
+    """
+    پیش‌بینی ژانر برای چند بردار ویژگی با یک بار صدا زدن SVM
+    خروجی: (لیست ژانرها، لیست دیکشنری‌های confidence)
+    """
+
     # نرمال‌سازی ویژگی‌ها با اسکیلری که موقع train استفاده شده
-    features = scaler.transform([features])
+    features = scaler.transform(np.asarray(feature_vectors))
 
     # گرفتن احتمال هر کلاس از SVM
-    probabilities = svm_model.predict_proba(features)[0]
-
-    # ایندکس ژانری که بیشترین احتمال رو داره
-    predicted_index = np.argmax(probabilities)
+    probabilities = svm_model.predict_proba(features)
 
     # تبدیل لیبل عددی به اسم ژانر
-    predicted_genre = label_encoder.inverse_transform(
-        [predicted_index]
-    )[0]
+    genre_names = label_encoder.inverse_transform(
+        np.arange(probabilities.shape[1])
+    )
+    predicted_genres = genre_names[np.argmax(probabilities, axis=1)]
 
     # ساخت دیکشنری confidence برای نمایش در UI
-    confidence_dict = {
-        label_encoder.inverse_transform([i])[0]: prob
-        for i, prob in enumerate(probabilities)
-    }
+    confidence_dicts = [
+        dict(zip(genre_names, row)) for row in probabilities
+    ]
+
+    return list(predicted_genres), confidence_dicts
+
+
+# پیش‌بینی ژانر برای چند فایل (مثلاً کل یک فولدر)
+def predict_genres_batch(audio_paths, progress_callback=None, workers=None):
+    """
+    - decode فایل‌ها داخل چند worker
+    - فریم‌های چند فایل با هم از YAMNet رد میشن
+    - همه فایل‌ها با هم به SVM داده میشن
+
+    خروجی: (results, errors)
+        results: لیست دیکشنری با کلیدهای path, predicted_genre, confidence_scores
+                 (به همون ترتیب audio_paths)
+        errors:  دیکشنری مسیر فایل -> پیام خطا
+    """
+    load_model_if_needed()
+
+    # Thread به جای Process: این تابع از داخل UI صدا زده میشه
+    features, errors = embed_files(
+        audio_paths,
+        workers=workers,
+        progress_callback=progress_callback,
+        use_processes=False
+    )
+
+    ok_paths = [path for path in audio_paths if path in features]
+    if not ok_paths:
+        return [], errors
+
+    predicted_genres, confidence_dicts = classify_features(
+        [features[path] for path in ok_paths]
+    )
+
+    results = [
+        {
+            "path": path,
+            "predicted_genre": genre,
+            "confidence_scores": scores
+        }
+        for path, genre, scores in zip(ok_paths, predicted_genres, confidence_dicts)
+    ]
+    return results, errors
+
+
+# پیش‌بینی بخش به بخش برای فایل‌های طولانی (مثلاً میکس‌های یک ساعته)
+def predict_genre_timeline(audio_path, window_seconds=WINDOW_SECONDS):
+    """
+    فایل صوتی بخش به بخش خونده میشه و برای هر بخش
+    (به ترتیب زمانی) یک دیکشنری yield میشه:
+
+        start, end                 : زمان شروع و پایان بخش (ثانیه)
+        predicted_genre            : ژانر همین بخش
+        confidence_scores          : احتمال هر ژانر برای همین بخش
+        overall_genre              : ژانر کل فایل تا اینجا
+        overall_confidence_scores  : احتمال هر ژانر برای کل فایل تا اینجا
+
+    نتیجه کلی از میانگین embedding همه فریم‌ها تا اینجا حساب میشه
+    (مثل پیش‌بینی معمولی روی کل فایل)، ولی فقط جمع embeddingها نگه
+    داشته میشه؛ حافظه مستقل از طول فایله.
+    """
+    load_model_if_needed()
+
+    embedding_sum = np.zeros(EMBEDDING_SIZE, dtype=np.float64)
+    frame_count = 0
+    start = 0.0
+
+    for waveform in stream_waveform(audio_path, window_seconds):
+        frames = embed_waveform(waveform)
+
+        embedding_sum += frames.sum(axis=0)
+        frame_count += len(frames)
+
+        # بخش فعلی و کل فایل تا اینجا، با یک بار صدا زدن SVM
+        genres, confidences = classify_features([
+            frames.mean(axis=0),
+            embedding_sum / frame_count
+        ])
+
+        end = start + len(waveform) / SAMPLE_RATE
+        yield {
+            "start": start,
+            "end": end,
+            "predicted_genre": genres[0],
+            "confidence_scores": confidences[0],
+            "overall_genre": genres[1],
+            "overall_confidence_scores": confidences[1]
+        }
+        start = end
+
+
+# ادغام بخش‌های پشت سر هم با ژانر یکسان
+def merge_timeline(segments):
+    """
+    خروجی: لیست (start, end, genre)
+    """
+    timeline = []
+    for segment in segments:
+        if timeline and timeline[-1][2] == segment["predicted_genre"]:
+            timeline[-1] = (timeline[-1][0], segment["end"], timeline[-1][2])
+        else:
+            timeline.append((segment["start"], segment["end"], segment["predicted_genre"]))
+    return timeline
+
+
+def format_time(seconds):
+    # نمایش زمان به شکل hh:mm:ss
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+# ذخیره نتایج پیش‌بینی دسته‌ای در CSV
+def export_results_csv(results, csv_path, errors=None):
+    """
+    هر فایل یک سطر: مسیر، ژانر پیش‌بینی‌شده و احتمال هر ژانر
+    فایل‌هایی که خطا داشتن هم با ستون error ثبت میشن
+    """
+    genres = sorted({g for r in results for g in r["confidence_scores"]})
+
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["file", "predicted_genre", *genres, "error"])
+
+        for r in results:
+            writer.writerow([
+                r["path"],
+                r["predicted_genre"],
+                *(f"{r['confidence_scores'][g]:.4f}" for g in genres),
+                ""
+            ])
+
+        for path, error in (errors or {}).items():
+            writer.writerow([path, "", *([""] * len(genres)), error])
+
+
+# اجرا از ترمینال: timeline ژانر یک فایل طولانی
+#   python predict.py mix.wav
+#   python predict.py mix.wav --window 15
+def main():
+    parser = argparse.ArgumentParser(description="Genre timeline of a long audio file")
+    parser.add_argument("audio_path")
+    parser.add_argument("--window", type=int, default=WINDOW_SECONDS,
+                        help="window length in seconds")
+    args = parser.parse_args()
+
+    segments = []
+    for segment in predict_genre_timeline(args.audio_path, args.window):
+        # برای timeline فقط زمان و ژانر لازمه
+        segments.append({
+            "start": segment["start"],
+            "end": segment["end"],
+            "predicted_genre": segment["predicted_genre"]
+        })
+        score = segment["confidence_scores"][segment["predicted_genre"]]
+        print(
+            f"{format_time(segment['start'])} - {format_time(segment['end'])}  "
+            f"{segment['predicted_genre']:<10} {score * 100:5.1f}%   "
+            f"(overall: {segment['overall_genre']})"
+        )
+
+    if not segments:
+        print("Empty audio file")
+        return
+
+    print("\n🎧 Timeline:")
+    for start, end, genre in merge_timeline(segments):
+        print(f"{format_time(start)} - {format_time(end)}  {genre}")
+
+    print(f"\n🎵 Overall genre: {segment['overall_genre']}")
+
 
-    return predicted_genre, confidence_dict
+if __name__ == "__main__":
+    main()
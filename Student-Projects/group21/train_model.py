@@ -1,18 +1,15 @@
+import argparse
 import os
-import librosa
+import time
 import numpy as np
-import tensorflow_hub as hub
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.svm import SVC
 import joblib
 
-
-# لود کردن مدل YAMNet
+# مدل YAMNet و کش embedding
 # (دقیقاً همونی که موقع پیش‌بینی استفاده می‌کنیم)
-yamnet_model = hub.load("https://tfhub.dev/google/yamnet/1")
-
-TARGET_SAMPLE_RATE = 16000
+from yamnet import BATCH_FILES, embed_file, embed_files
 
 
 # استخراج ویژگی از یک فایل صوتی
@@ -22,64 +19,97 @@ def extract_audio_features(audio_file_path):
     - فایل صوتی رو لود می‌کنه
     - می‌فرستتش داخل YAMNet
     - در نهایت یک embedding عددی برمی‌گردونه
+    (برای اینکه طول ویژگی‌ها ثابت باشه، میانگین embedding فریم‌ها)
+    فایل‌هایی که قبلاً پردازش شدن از کش خونده میشن.
     """
 
-    audio_signal, _ = librosa.load(
-        audio_file_path,
-        sr=TARGET_SAMPLE_RATE,
-        mono=True
-    )
+    return embed_file(audio_file_path)
 
-    waveform = audio_signal.astype(np.float32)
 
-    # خروجی YAMNet شامل score، embedding و spectrogram هست
-    _, embeddings, _ = yamnet_model(waveform)
+# لیست فایل‌های دیتاست به همراه ژانر هر کدوم
+def list_dataset_files(dataset_root_path):
+    dataset_files = []
 
-    # برای اینکه طول ویژگی‌ها ثابت باشه، میانگین می‌گیریم
-    return np.mean(embeddings.numpy(), axis=0)
+    for genre_name in sorted(os.listdir(dataset_root_path)):
+        genre_folder_path = os.path.join(dataset_root_path, genre_name)
+
+        # اگه فایل بود یا فولدر نبود، بی‌خیالش می‌شیم
+        if not os.path.isdir(genre_folder_path):
+            continue
+
+        for file_name in sorted(os.listdir(genre_folder_path)):
+            if file_name.endswith(".wav"):
+                dataset_files.append((os.path.join(genre_folder_path, file_name), genre_name))
+
+    return dataset_files
 
 
 # ساخت دیتاست از فولدر ژانرها
-def build_training_dataset(dataset_root_path):
+def build_training_dataset(dataset_root_path, workers=None, batch_size=BATCH_FILES):
     """
     ساخت X و y از ساختار فولدری دیتاست
     هر فولدر = یک ژانر
-    """
 
-    feature_vectors = []
-    genre_labels = []
+    - decode فایل‌ها موازی داخل چند پروسه انجام میشه
+    - صوت‌ها دسته‌ای از YAMNet رد میشن
+    - هر دسته بلافاصله در کش ذخیره میشه؛ اگه آموزش وسط کار قطع بشه،
+      اجرای بعدی فقط فایل‌های باقی‌مونده رو پردازش می‌کنه
+    """
 
-    for genre_name in os.listdir(dataset_root_path):
-        genre_folder_path = os.path.join(dataset_root_path, genre_name)
+    dataset_files = list_dataset_files(dataset_root_path)
+    audio_paths = [path for path, _ in dataset_files]
 
-        # اگه فایل بود یا فولدر نبود، بی‌خیالش می‌شیم
-        if not os.path.isdir(genre_folder_path):
-            continue
+    started = time.perf_counter()
+    state = {"last": 0}
 
-        for file_name in os.listdir(genre_folder_path):
-            if not file_name.endswith(".wav"):
-                continue
+    def show_progress(done, total):
+        # گزارش هر ۵۰ فایل یک بار
+        if done == total or done - state["last"] >= 50:
+            state["last"] = done
+            print(f"   {done}/{total} files")
 
-            audio_file_path = os.path.join(genre_folder_path, file_name)
+    features, errors = embed_files(
+        audio_paths, workers=workers, batch_size=batch_size,
+        progress_callback=show_progress
+    )
+    elapsed = time.perf_counter() - started
 
-            try:
-                features = extract_audio_features(audio_file_path)
-                feature_vectors.append(features)
-                genre_labels.append(genre_name)
+    for audio_file_path, error in errors.items():
+        # اگه یه فایل خراب بود، کل آموزش نخوابه
+        print(f"❌ Error while processing file {audio_file_path}: {error}")
 
-            except Exception as error:
-                # اگه یه فایل خراب بود، کل آموزش نخوابه
-                print(f"❌ Error while processing file {audio_file_path}: {error}")
+    feature_vectors = []
+    genre_labels = []
+    for audio_file_path, genre_name in dataset_files:
+        if audio_file_path in features:
+            feature_vectors.append(features[audio_file_path])
+            genre_labels.append(genre_name)
+
+    # گزارش سرعت استخراج ویژگی
+    if dataset_files:
+        print(
+            f"⏱️ {len(dataset_files)} files in {elapsed:.1f}s "
+            f"({len(dataset_files) / max(elapsed, 1e-9):.1f} files/sec)"
+        )
 
     return np.array(feature_vectors), np.array(genre_labels)
 
 
 # آموزش مدل
 def main():
+    parser = argparse.ArgumentParser(description="Train the genre classifier")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of decode processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_FILES,
+                        help="files per YAMNet batch")
+    args = parser.parse_args()
+
     print("📁 Building dataset...")
 
     X_features, y_genres = build_training_dataset(
-        "data/genres_original"
+        "data/genres_original",
+        workers=args.workers,
+        batch_size=args.batch_size
     )
 
     print("🏷️ Encoding genre labels...")
@@ -1,6 +1,10 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-from predict import predict_genre_with_confidence
+from predict import (
+    predict_genre_with_confidence,
+    predict_genres_batch,
+    export_results_csv
+)
 import os
 import threading
 import subprocess
@@ -112,16 +116,7 @@ def handle_file_selection():
             )
 
         # ذخیره نتیجه در تاریخچه
-        song_history.append({
-            "track_name": track_name,
-            "predicted_genre": predicted_genre,
-            "confidence_scores": confidence_scores
-        })
-
-        history_listbox.insert(
-            tk.END,
-            f"{track_name}  →  {predicted_genre}"
-        )
+        add_to_history(track_name, predicted_genre, confidence_scores)
 
     except FileNotFoundError:
         # اگر مدل هنوز train نشده باشه
@@ -136,6 +131,125 @@ def handle_file_selection():
         messagebox.showerror("Error", str(error))
 
 
+# نمایش نتیجه در تاریخچه
+def add_to_history(track_name, predicted_genre, confidence_scores):
+    song_history.append({
+        "track_name": track_name,
+        "predicted_genre": predicted_genre,
+        "confidence_scores": confidence_scores
+    })
+
+    history_listbox.insert(
+        tk.END,
+        f"{track_name}  →  {predicted_genre}"
+    )
+
+
+# پسوندهای صوتی قابل پردازش
+AUDIO_EXTENSIONS = (".wav", ".mp3")
+
+
+# دسته‌بندی همه فایل‌های یک فولدر
+def handle_folder_selection():
+    """
+    انتخاب یک فولدر و پیش‌بینی ژانر همه فایل‌های صوتی داخلش
+    - پردازش داخل یه thread جدا (UI قفل نمیشه)
+    - decode فایل‌ها داخل چند worker و عبور دسته‌ای از YAMNet
+    - در پایان، امکان ذخیره نتایج در CSV
+    """
+    folder_path = filedialog.askdirectory()
+    if not folder_path:
+        return
+
+    audio_paths = sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(folder_path)
+        for name in names
+        if name.lower().endswith(AUDIO_EXTENSIONS)
+    )
+
+    if not audio_paths:
+        messagebox.showinfo("No Audio Files", "No .wav or .mp3 files found in this folder.")
+        return
+
+    # ریست کردن UI
+    result_label.config(text="")
+    confidence_box.delete("1.0", tk.END)
+    progress_bar["value"] = 0
+    status_label.config(text=f"Processing {len(audio_paths)} files ...")
+    select_button.config(state="disabled")
+    folder_button.config(state="disabled")
+
+    # Tk فقط از thread اصلی قابل تغییره؛ آپدیت‌ها با after فرستاده میشن
+    def update_progress_ui(current, total):
+        def update():
+            percent = int((current / total) * 100)
+            progress_bar["value"] = percent
+            status_label.config(
+                text=f"Processing folder ... {current}/{total} files ({percent}%)"
+            )
+        main_window.after(0, update)
+
+    def show_results(results, errors):
+        select_button.config(state="normal")
+        folder_button.config(state="normal")
+        status_label.config(
+            text=f"Processing completed: {len(results)} files, {len(errors)} errors"
+        )
+
+        # تعداد فایل‌های هر ژانر
+        genre_counts = {}
+        for r in results:
+            track_name = os.path.splitext(os.path.basename(r["path"]))[0]
+            add_to_history(track_name, r["predicted_genre"], r["confidence_scores"])
+            genre_counts[r["predicted_genre"]] = genre_counts.get(r["predicted_genre"], 0) + 1
+
+        result_label.config(
+            text=f"📁 {os.path.basename(folder_path)}\n🎧 {len(results)} tracks classified"
+        )
+        for genre, count in sorted(genre_counts.items(), key=lambda x: x[1], reverse=True):
+            confidence_box.insert(tk.END, f"{genre}: {count} tracks\n")
+        for path, error in errors.items():
+            confidence_box.insert(tk.END, f"❌ {os.path.basename(path)}: {error}\n")
+
+        csv_path = filedialog.asksaveasfilename(
+            title="Export results to CSV",
+            defaultextension=".csv",
+            initialfile="genres.csv",
+            filetypes=[("CSV Files", "*.csv")]
+        )
+        if csv_path:
+            export_results_csv(results, csv_path, errors)
+            status_label.config(text=f"Results saved to {os.path.basename(csv_path)}")
+
+    def show_error(error):
+        select_button.config(state="normal")
+        folder_button.config(state="normal")
+
+        if isinstance(error, FileNotFoundError):
+            # اگر مدل هنوز train نشده باشه
+            messagebox.showerror(
+                "Model Not Trained",
+                "Model is not trained yet.\nPlease train the model first."
+            )
+        else:
+            status_label.config(text="Error")
+            messagebox.showerror("Error", str(error))
+
+    def run_batch():
+        try:
+            results, errors = predict_genres_batch(
+                audio_paths,
+                progress_callback=update_progress_ui
+            )
+            main_window.after(0, show_results, results, errors)
+        except Exception as error:
+            main_window.after(0, show_error, error)
+
+    # اجرای پردازش داخل Thread
+    threading.Thread(target=run_batch, daemon=True).start()
+
+
 # کلیک روی آیتم‌های تاریخچه
 def handle_history_selection(event):
     """
@@ -167,7 +281,7 @@ def handle_history_selection(event):
 # تنظیمات کلی رابط گرافیکی
 main_window = tk.Tk()
 main_window.title("Tune Sense")
-main_window.geometry("760x480")
+main_window.geometry("760x520")
 main_window.resizable(False, False)
 
 
@@ -201,6 +315,15 @@ select_button = tk.Button(
 )
 select_button.pack(pady=6)
 
+folder_button = tk.Button(
+    left_panel,
+    text="Classify Folder",
+    font=("Arial", 12),
+    width=24,
+    command=handle_folder_selection
+)
+folder_button.pack(pady=6)
+
 progress_bar = ttk.Progressbar(
     left_panel,
     length=400,
@@ -0,0 +1,375 @@
+import hashlib
+import itertools
+import math
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import librosa
+import numpy as np
+
+
+# ثابت‌های مشترک بین train و predict
+SAMPLE_RATE = 16000              # نرخ نمونه‌برداری استاندارد برای YAMNet
+EMBEDDING_SIZE = 1024            # طول embedding هر فریم YAMNet
+
+# فریم‌بندی YAMNet: هر فریم 0.975 ثانیه، با گام 0.48 ثانیه
+FRAME_SAMPLES = 15600
+HOP_SAMPLES = 7680
+
+# تعداد فایل‌هایی که با هم از YAMNet رد میشن
+BATCH_FILES = 16
+
+# طول هر بخش در حالت streaming (برابر طول کلیپ‌های دیتاست GTZAN)
+WINDOW_SECONDS = 30
+
+YAMNET_HANDLE = "https://tfhub.dev/google/yamnet/1"
+YAMNET_DIR = os.path.join("model", "yamnet")   # نسخه محلی مدل روی دیسک
+CACHE_DIR = "cache"                            # کش embedding فایل‌ها
+
+
+# مدل YAMNet فقط یک بار در هر پروسه load میشه
+_yamnet = None
+_yamnet_lock = threading.Lock()
+
+# زمان load شدن مدل (برای گزارش cold start)
+load_seconds = None
+
+
+def load_yamnet():
+    """
+    مدل YAMNet رو برمی‌گردونه.
+    بار اول از TF-Hub دانلود و داخل model/yamnet کپی میشه،
+    از اون به بعد مستقیم از دیسک load میشه
+    (بدون وابستگی به resolve شدن آدرس TF-Hub).
+    """
+    global _yamnet, load_seconds
+
+    with _yamnet_lock:
+        if _yamnet is not None:
+            return _yamnet
+
+        import tensorflow_hub as hub
+
+        started = time.perf_counter()
+
+        if not os.path.isdir(YAMNET_DIR):
+            # hub.resolve مدل رو دانلود می‌کنه و مسیر SavedModel رو برمی‌گردونه
+            shutil.copytree(hub.resolve(YAMNET_HANDLE), YAMNET_DIR)
+
+        _yamnet = hub.load(YAMNET_DIR)
+        load_seconds = time.perf_counter() - started
+
+    return _yamnet
+
+
+def load_waveform(audio_path):
+    # لود فایل صوتی، تبدیل به mono و 16kHz
+    audio, _ = librosa.load(audio_path, sr=SAMPLE_RATE, mono=True)
+    return audio.astype(np.float32)
+
+
+def _load_windows(audio_path, window_seconds):
+    # هر بار فقط یک بخش از فایل decode میشه
+    offset = 0.0
+    while True:
+        audio, _ = librosa.load(
+            audio_path, sr=SAMPLE_RATE, mono=True,
+            offset=offset, duration=window_seconds
+        )
+        if len(audio) == 0:
+            return
+        yield audio.astype(np.float32)
+        offset += window_seconds
+
+
+def stream_waveform(audio_path, window_seconds=WINDOW_SECONDS):
+    """
+    خوندن فایل صوتی بخش به بخش (هر بخش window_seconds ثانیه، 16kHz mono).
+    در هر لحظه فقط یک بخش داخل حافظه‌ست، پس طول فایل مهم نیست.
+    """
+    native_sr = librosa.get_samplerate(audio_path)
+
+    # هر "فریم" librosa.stream یک ثانیه‌ست، هر block یک بخش کامل
+    blocks = librosa.stream(
+        audio_path,
+        block_length=int(window_seconds),
+        frame_length=native_sr,
+        hop_length=native_sr,
+        mono=True
+    )
+
+    try:
+        first = next(blocks, None)
+    except RuntimeError:
+        # فرمت‌هایی که soundfile نمی‌تونه بخونه (مثل بعضی mp3ها):
+        # خوندن بخش به بخش با offset (کندتر، ولی حافظه همچنان محدود)
+        yield from _load_windows(audio_path, window_seconds)
+        return
+
+    if first is None:
+        return
+
+    for block in itertools.chain([first], blocks):
+        if native_sr != SAMPLE_RATE:
+            block = librosa.resample(block, orig_sr=native_sr, target_sr=SAMPLE_RATE)
+        yield block.astype(np.float32)
+
+
+def embed_waveform(waveform):
+    # embedding هر فریم YAMNet، با شکل (frames, 1024)
+    _, embeddings, _ = load_yamnet()(waveform)
+    return embeddings.numpy()
+
+
+def _frame_count(num_samples):
+    # همون تعداد فریمی که YAMNet برای این طول صوت تولید می‌کنه
+    return 1 + math.ceil(max(0, num_samples - FRAME_SAMPLES) / HOP_SAMPLES)
+
+
+def embed_waveforms(waveforms):
+    """
+    embedding چند صوت با یک بار اجرای YAMNet.
+
+    صوت‌ها پشت سر هم داخل یک waveform قرار می‌گیرن؛ شروع هر کدوم
+    روی مضرب گام فریم‌هاست و بینشون سکوت کافی هست، پس هیچ فریمی
+    بین دو فایل مشترک نیست و فریم‌های هر فایل دقیقاً مثل اجرای جداگانه‌ست.
+    """
+    counts = [_frame_count(len(w)) for w in waveforms]
+    offsets = []
+    total = 0
+    for n in counts:
+        offsets.append(total)
+        # n فریم + دو گام سکوت (بیشتر از طول یک فریم)
+        total += (n + 2) * HOP_SAMPLES
+
+    combined = np.zeros(total, dtype=np.float32)
+    for offset, waveform in zip(offsets, waveforms):
+        combined[offset:offset + len(waveform)] = waveform
+
+    frames = embed_waveform(combined)
+    return [
+        frames[offset // HOP_SAMPLES: offset // HOP_SAMPLES + n]
+        for offset, n in zip(offsets, counts)
+    ]
+
+
+def file_hash(audio_path):
+    # هش محتوای فایل؛ اگه فایل جابه‌جا یا rename بشه، کش هنوز معتبره
+    digest = hashlib.sha256()
+    with open(audio_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    کش embedding فایل‌های صوتی روی دیسک.
+
+    - embeddings.f32 : بردارها پشت سر هم (float32)، به صورت memory-map خونده میشه
+    - index.txt      : هش محتوای فایل در هر خط، شماره خط = شماره ردیف بردار
+
+    هر دو فایل فقط append میشن.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, dim=EMBEDDING_SIZE):
+        self.dim = dim
+        self.data_path = os.path.join(cache_dir, "embeddings.f32")
+        self.index_path = os.path.join(cache_dir, "index.txt")
+        self._lock = threading.Lock()
+        self._data = None
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    def _load_index(self):
+        keys = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                keys = [line.strip() for line in f if line.strip()]
+
+        row_bytes = self.dim * 4
+        data_size = 0
+        if os.path.exists(self.data_path):
+            data_size = os.path.getsize(self.data_path)
+
+        # اگه برنامه وسط نوشتن بسته شده باشه، دو فایل رو هم‌اندازه می‌کنیم
+        rows = min(len(keys), data_size // row_bytes)
+        if data_size != rows * row_bytes:
+            with open(self.data_path, "r+b") as f:
+                f.truncate(rows * row_bytes)
+        if rows != len(keys):
+            keys = keys[:rows]
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                f.writelines(k + "\n" for k in keys)
+
+        return {key: row for row, key in enumerate(keys)}
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def get(self, key):
+        with self._lock:
+            row = self._index.get(key)
+            if row is None:
+                return None
+
+            if self._data is None or len(self._data) < len(self._index):
+                self._data = np.memmap(
+                    self.data_path, dtype=np.float32, mode="r",
+                    shape=(len(self._index), self.dim)
+                )
+            return np.array(self._data[row])
+
+    def put(self, key, vector):
+        vector = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+
+        with self._lock:
+            if key in self._index:
+                return
+
+            # اول داده، بعد index (تا index هیچ‌وقت به ردیف ناقص اشاره نکنه)
+            with open(self.data_path, "ab") as f:
+                f.write(vector.tobytes())
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(key + "\n")
+
+            self._index[key] = len(self._index)
+
+
+_cache = None
+
+
+def get_cache():
+    # یک کش مشترک برای کل پروسه
+    global _cache
+    if _cache is None:
+        _cache = EmbeddingCache()
+    return _cache
+
+
+def embed_file(audio_path, cache=None):
+    """
+    embedding میانگین یک فایل صوتی.
+    اگه فایلی با همین محتوا قبلاً پردازش شده باشه،
+    نه decode میشه و نه از YAMNet رد میشه.
+    """
+    if cache is None:
+        cache = get_cache()
+    key = file_hash(audio_path)
+
+    vector = cache.get(key)
+    if vector is not None:
+        return vector
+
+    # میانگین گرفتن از embedding‌ها برای یک بردار نهایی
+    vector = np.mean(embed_waveform(load_waveform(audio_path)), axis=0)
+    cache.put(key, vector)
+    return vector
+
+
+def _decode(audio_path):
+    # اجرا داخل worker: فقط decode، بدون TensorFlow
+    try:
+        return audio_path, load_waveform(audio_path), None
+    except Exception as error:
+        return audio_path, None, str(error)
+
+
+def embed_files(audio_paths, workers=None, batch_size=BATCH_FILES,
+                progress_callback=None, cache=None, use_processes=True):
+    """
+    embedding میانگین چند فایل صوتی به صورت موازی.
+
+    - فایل‌هایی که در کش هستن مستقیم خونده میشن
+    - بقیه داخل یک pool از workerها decode میشن
+    - صوت‌های decode شده دسته‌ای (batch_size فایل) از YAMNet رد میشن
+    - نتیجه هر دسته بلافاصله در کش ذخیره میشه، پس اگه کار نصفه بمونه
+      اجرای بعدی از همون‌جا ادامه پیدا می‌کنه
+
+    خروجی: (results, errors)
+        results: دیکشنری مسیر فایل -> embedding
+        errors:  دیکشنری مسیر فایل -> پیام خطا
+    """
+    if cache is None:
+        cache = get_cache()
+
+    results = {}
+    errors = {}
+    keys = {}
+    pending = []
+    total = len(audio_paths)
+
+    def report():
+        if progress_callback:
+            progress_callback(len(results) + len(errors), total)
+
+    for audio_path in audio_paths:
+        try:
+            key = file_hash(audio_path)
+        except OSError as error:
+            errors[audio_path] = str(error)
+            continue
+
+        vector = cache.get(key)
+        if vector is None:
+            keys[audio_path] = key
+            pending.append(audio_path)
+        else:
+            results[audio_path] = vector
+    report()
+
+    if not pending:
+        return results, errors
+
+    batch = []
+
+    def flush():
+        for (audio_path, _), frames in zip(batch, embed_waveforms([w for _, w in batch])):
+            vector = np.mean(frames, axis=0)
+            cache.put(keys[audio_path], vector)
+            results[audio_path] = vector
+        batch.clear()
+        report()
+
+    # Thread برای جاهایی که پروسه جدید ممکن نیست (مثلاً داخل UI)
+    pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+
+    with pool_class(max_workers=workers) as pool:
+        # تعداد decodeهای در جریان محدوده، تا حافظه با تعداد فایل‌ها زیاد نشه
+        max_in_flight = 2 * batch_size
+        in_flight = deque()
+        queue = iter(pending)
+
+        for audio_path in queue:
+            in_flight.append(pool.submit(_decode, audio_path))
+            if len(in_flight) >= max_in_flight:
+                break
+
+        while in_flight:
+            audio_path, waveform, error = in_flight.popleft().result()
+
+            next_path = next(queue, None)
+            if next_path is not None:
+                in_flight.append(pool.submit(_decode, next_path))
+
+            if error is not None:
+                errors[audio_path] = error
+                report()
+                continue
+
+            batch.append((audio_path, waveform))
+            if len(batch) >= batch_size:
+                flush()
+
+        if batch:
+            flush()
+
+    return results, errors
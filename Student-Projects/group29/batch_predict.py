@@ -0,0 +1,225 @@
+"""
+Batch prediction script for Cat vs Dog.
+- Loads the saved model once
+- Predicts every image in the given files and directories
+- Decodes images in parallel and runs batched predictions
+- Prints label and confidence per image, then images/second
+- Optional: benchmarks batch size 1 against batched prediction
+- Optional: keeps running as a local HTTP endpoint
+Usage:
+    python batch_predict.py images/
+    python batch_predict.py cat1.jpg dog1.png more_images/ --batch-size 64
+    python batch_predict.py --serve --port 8000
+    python batch_predict.py images/ --benchmark
+
+HTTP endpoint (POST /predict):
+    curl --data-binary @cat.jpg http://127.0.0.1:8000/predict
+    curl -H "Content-Type: application/json" -d '{"paths": ["images/"]}' http://127.0.0.1:8000/predict
+"""
+
+import argparse
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from PIL import Image
+
+IMG_SIZE = 64
+BATCH_SIZE = 32
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def find_images(paths):
+    """Expand directories (recursively) into image files, keep files as given."""
+    images = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                images.extend(
+                    os.path.join(root, name)
+                    for name in sorted(names)
+                    if name.lower().endswith(IMAGE_EXTENSIONS)
+                )
+        else:
+            images.append(path)
+    return images
+
+
+def load_image(source):
+    # Same preprocessing as predict.py; source is a path or raw image bytes
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    image = Image.open(source).convert("RGB")
+    image = image.resize((IMG_SIZE, IMG_SIZE))
+    return np.asarray(image, dtype=np.float32) / 255.0
+
+
+def to_result(prediction):
+    label = "Dog" if prediction > 0.5 else "Cat"
+    confidence = prediction if label == "Dog" else 1 - prediction
+    return label, float(confidence)
+
+
+class BatchPredictor:
+    """Model loaded once; images are decoded by a thread pool and predicted in batches."""
+
+    def __init__(self, model_path="model.h5", workers=None, batch_size=BATCH_SIZE):
+        import tensorflow as tf
+
+        self.model = tf.keras.models.load_model(model_path)
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.batch_size = batch_size
+        # Keras models are not safe to call from several threads at once
+        self.lock = threading.Lock()
+
+    def _decode(self, source):
+        try:
+            return load_image(source), None
+        except Exception as error:
+            return None, str(error)
+
+    def predict(self, sources):
+        """Yield (source, label, confidence, error) in input order."""
+        chunks = [sources[i:i + self.batch_size] for i in range(0, len(sources), self.batch_size)]
+        if not chunks:
+            return
+
+        decoding = self.pool.map(self._decode, chunks[0])
+        for i, chunk in enumerate(chunks):
+            decoded = list(decoding)
+            # Decode the next batch while this one is being predicted
+            if i + 1 < len(chunks):
+                decoding = self.pool.map(self._decode, chunks[i + 1])
+
+            images = [image for image, error in decoded if error is None]
+            predictions = iter(())
+            if images:
+                with self.lock:
+                    predictions = iter(np.ravel(self.model.predict_on_batch(np.stack(images))))
+
+            for source, (_, error) in zip(chunk, decoded):
+                if error is not None:
+                    yield source, None, None, error
+                else:
+                    label, confidence = to_result(next(predictions))
+                    yield source, label, confidence, None
+
+
+def predict_paths(predictor, paths):
+    images = find_images(paths)
+
+    started = time.perf_counter()
+    count = 0
+    for path, label, confidence, error in predictor.predict(images):
+        if error is not None:
+            print(f"{path}: error: {error}")
+            continue
+        count += 1
+        print(f"{path}: {label} ({confidence:.2f})")
+    seconds = time.perf_counter() - started
+
+    if count:
+        print(f"\n{count} images in {seconds:.2f}s ({count / seconds:.1f} images/second)")
+
+
+def benchmark(predictor, paths):
+    """Images/second of one-image-at-a-time prediction vs batched prediction."""
+    images = find_images(paths)
+    batch_size = predictor.batch_size
+
+    for size in (1, batch_size):
+        predictor.batch_size = size
+        started = time.perf_counter()
+        count = sum(1 for *_, error in predictor.predict(images) if error is None)
+        seconds = time.perf_counter() - started
+        print(f"batch size {size:>3}: {count} images in {seconds:.2f}s "
+              f"({count / seconds:.1f} images/second)")
+
+    predictor.batch_size = batch_size
+
+
+def serve(predictor, host, port):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != "/predict":
+                self.send_error(404)
+                return
+
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            is_json = self.headers.get("Content-Type", "").startswith("application/json")
+            if is_json:
+                # {"paths": [...]}: files or directories on this machine
+                try:
+                    paths = json.loads(body)["paths"]
+                except (ValueError, KeyError, TypeError):
+                    paths = None
+                # A bare string would be iterated character by character
+                if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+                    self.send_error(400, 'Expected JSON body {"paths": [...]}')
+                    return
+                sources = find_images(paths)
+            else:
+                # Raw image bytes: one image
+                sources = [body]
+
+            results = []
+            for source, label, confidence, error in predictor.predict(sources):
+                result = {"path": source} if isinstance(source, str) else {}
+                if error is not None:
+                    result["error"] = error
+                else:
+                    result.update(label=label, confidence=confidence)
+                results.append(result)
+
+            # One raw image -> one result object, paths -> list of results
+            # (empty when the paths hold no images)
+            data = json.dumps(results if is_json else results[0])
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data.encode("utf-8"))
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Serving on http://{host}:{port}/predict (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Predict Cat vs Dog for many images")
+    parser.add_argument("paths", nargs="*", help="image files and/or directories")
+    parser.add_argument("--model", default="model.h5")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="image decoding threads (default: based on CPU count)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="compare images/second of batch size 1 and --batch-size")
+    parser.add_argument("--serve", action="store_true", help="run as a local HTTP endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    if not args.paths and not args.serve:
+        parser.error("give image paths or --serve")
+
+    started = time.perf_counter()
+    predictor = BatchPredictor(args.model, args.workers, args.batch_size)
+    print(f"Model loaded in {time.perf_counter() - started:.1f}s")
+
+    if args.paths and args.benchmark:
+        benchmark(predictor, args.paths)
+    elif args.paths:
+        predict_paths(predictor, args.paths)
+    if args.serve:
+        serve(predictor, args.host, args.port)
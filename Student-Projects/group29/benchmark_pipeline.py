@@ -0,0 +1,61 @@
+"""
+Benchmark for the Cat vs Dog input pipeline.
+- Runs the original pipeline (sequential map, per-image augmentation, no cache)
+- Runs the new pipeline from pipeline.py
+- Prints epoch time and images/second for each epoch
+  (epoch 1 of the new pipeline fills the cache, later epochs read from it)
+Usage:
+    python benchmark_pipeline.py
+    python benchmark_pipeline.py --epochs 3
+"""
+
+import argparse
+import time
+
+import tensorflow as tf
+
+from pipeline import (
+    BATCH_SIZE,
+    IMG_SIZE,
+    SHUFFLE_BUFFER,
+    data_augmentation,
+    load_splits,
+    make_train_pipeline,
+)
+
+
+def make_original_pipeline(dataset):
+    # The pipeline train.py used before (kept here for comparison)
+    def preprocess(image, label):
+        image = tf.image.resize(image, (IMG_SIZE, IMG_SIZE))
+        image = image / 255.0
+        return image, label
+
+    return (
+        dataset
+        .map(preprocess)
+        .map(lambda x, y: (data_augmentation(x), y))
+        .shuffle(SHUFFLE_BUFFER)
+        .batch(BATCH_SIZE)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+
+
+def run(name, dataset, epochs):
+    for epoch in range(epochs):
+        images = 0
+        started = time.perf_counter()
+        for batch, _ in dataset:
+            images += int(batch.shape[0])
+        seconds = time.perf_counter() - started
+        print(f"{name:<9} epoch {epoch + 1}: {seconds:6.1f}s, {images / seconds:7.0f} images/sec")
+
+
+parser = argparse.ArgumentParser(description="Benchmark the training input pipeline")
+parser.add_argument("--epochs", type=int, default=2)
+args = parser.parse_args()
+
+train_ds, _, _ = load_splits()
+
+run("original", make_original_pipeline(train_ds), args.epochs)
+run("new", make_train_pipeline(train_ds), args.epochs)
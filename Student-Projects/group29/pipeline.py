@@ -0,0 +1,83 @@
+"""
+Input pipeline for Cat vs Dog training.
+- Loads dataset from TensorFlow Datasets and splits it 70/15/15
+- Decodes and resizes images in parallel
+- Caches the resized images in memory (as uint8, ~4x smaller than float32)
+- Shuffles the cached images, batches, then augments whole batches
+- Prefetches so the CPU prepares the next batch while the model trains
+"""
+
+import tensorflow as tf
+import tensorflow_datasets as tfds
+
+AUTOTUNE = tf.data.AUTOTUNE
+
+IMG_SIZE = 64
+BATCH_SIZE = 32
+SHUFFLE_BUFFER = 1000
+
+# Data augmentation (train only)
+data_augmentation = tf.keras.Sequential([
+    tf.keras.layers.RandomFlip("horizontal"),
+    tf.keras.layers.RandomRotation(0.1),
+])
+
+
+def load_splits():
+    """Return (train_ds, val_ds, test_ds) of raw (image, label) pairs."""
+    dataset, info = tfds.load(
+        "cats_vs_dogs",
+        split="train",
+        as_supervised=True,
+        with_info=True
+    )
+
+    total = info.splits["train"].num_examples
+    train_size = int(0.7 * total)
+    val_size = int(0.15 * total)
+
+    train_ds = dataset.take(train_size)
+    val_ds = dataset.skip(train_size).take(val_size)
+    test_ds = dataset.skip(train_size + val_size)
+    return train_ds, val_ds, test_ds
+
+
+def resize(image, label):
+    # Resized pixels stay in [0, 255], so uint8 keeps them compact in the cache
+    image = tf.image.resize(image, (IMG_SIZE, IMG_SIZE))
+    image = tf.cast(tf.round(image), tf.uint8)
+    return image, label
+
+
+def normalize(images, labels):
+    images = tf.cast(images, tf.float32) / 255.0  # Normalize pixels to [0,1]
+    return images, labels
+
+
+def augment(images, labels):
+    # One call per batch instead of one per image
+    return data_augmentation(images, training=True), labels
+
+
+def make_train_pipeline(dataset):
+    return (
+        dataset
+        .map(resize, num_parallel_calls=AUTOTUNE)
+        .cache()
+        .shuffle(SHUFFLE_BUFFER)
+        .batch(BATCH_SIZE)
+        .map(normalize, num_parallel_calls=AUTOTUNE)
+        .map(augment, num_parallel_calls=AUTOTUNE)
+        .prefetch(AUTOTUNE)
+    )
+
+
+def make_eval_pipeline(dataset):
+    return (
+        dataset
+        .map(resize, num_parallel_calls=AUTOTUNE)
+        .cache()
+        .batch(BATCH_SIZE)
+        .map(normalize, num_parallel_calls=AUTOTUNE)
+        .prefetch(AUTOTUNE)
+    )
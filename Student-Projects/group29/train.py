@@ -1,61 +1,44 @@
 """
 Training script for Cat vs Dog classification using TensorFlow/Keras.
 - Loads dataset from TensorFlow Datasets
-- Preprocesses images (resize + normalize)
-- Adds data augmentation
+- Preprocesses images (resize + normalize) in a parallel, cached tf.data pipeline
+- Adds data augmentation (per batch)
 - Builds a Sequential CNN
-- Trains with EarlyStopping
+- Trains with EarlyStopping, printing epoch time and images/second
 - Saves trained model as 'model.h5'
 """
 
+import argparse
+import time
+
 import tensorflow as tf
-import tensorflow_datasets as tfds
 
-# -------------------------------
-# 1. Load dataset
-# -------------------------------
-dataset, info = tfds.load(
-    "cats_vs_dogs",
-    split="train",
-    as_supervised=True,
-    with_info=True
+from pipeline import IMG_SIZE, load_splits, make_eval_pipeline, make_train_pipeline
+
+parser = argparse.ArgumentParser(description="Train the Cat vs Dog CNN")
+parser.add_argument(
+    "--mixed-precision",
+    action="store_true",
+    help="compute in bfloat16 (faster on CPUs with bfloat16 support)"
 )
+args = parser.parse_args()
 
-TOTAL = info.splits["train"].num_examples
-train_size = int(0.7 * TOTAL)
-val_size = int(0.15 * TOTAL)
+if args.mixed_precision:
+    tf.keras.mixed_precision.set_global_policy("mixed_bfloat16")
 
-train_ds = dataset.take(train_size)
-val_ds = dataset.skip(train_size).take(val_size)
-test_ds = dataset.skip(train_size + val_size)
+# -------------------------------
+# 1. Load dataset
+# -------------------------------
+train_ds, val_ds, test_ds = load_splits()
+train_images = int(train_ds.cardinality())
 
 # -------------------------------
 # 2. Preprocessing
 # -------------------------------
-IMG_SIZE = 64
-
-def preprocess(image, label):
-    image = tf.image.resize(image, (IMG_SIZE, IMG_SIZE))
-    image = image / 255.0  # Normalize pixels to [0,1]
-    return image, label
-
-# Data augmentation (train only)
-data_augmentation = tf.keras.Sequential([
-    tf.keras.layers.RandomFlip("horizontal"),
-    tf.keras.layers.RandomRotation(0.1),
-])
-
-train_ds = (
-    train_ds
-    .map(preprocess)
-    .map(lambda x, y: (data_augmentation(x), y))
-    .shuffle(1000)
-    .batch(32)
-    .prefetch(tf.data.AUTOTUNE)
-)
-
-val_ds = val_ds.map(preprocess).batch(32)
-test_ds = test_ds.map(preprocess).batch(32)
+# Parallel resize, cache, shuffle, batch-then-augment, prefetch (see pipeline.py)
+train_ds = make_train_pipeline(train_ds)
+val_ds = make_eval_pipeline(val_ds)
+test_ds = make_eval_pipeline(test_ds)
 
 # -------------------------------
 # 3. Model
@@ -75,7 +58,8 @@ model = tf.keras.Sequential([
     tf.keras.layers.Flatten(),
     tf.keras.layers.Dense(128, activation="relu"),
     tf.keras.layers.Dropout(0.5),
-    tf.keras.layers.Dense(1, activation="sigmoid")
+    # Keep the output in float32 so the loss stays stable with mixed precision
+    tf.keras.layers.Dense(1, activation="sigmoid", dtype="float32")
 ])
 
 # -------------------------------
@@ -96,11 +80,27 @@ early_stop = tf.keras.callbacks.EarlyStopping(
     restore_best_weights=True
 )
 
+class EpochTimer(tf.keras.callbacks.Callback):
+    """Prints epoch time and training throughput (images/second)."""
+
+    def __init__(self, images_per_epoch):
+        super().__init__()
+        self.images_per_epoch = images_per_epoch
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.started = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        seconds = time.perf_counter() - self.started
+        print(f"Epoch {epoch + 1}: {seconds:.1f}s, "
+              f"{self.images_per_epoch / seconds:.0f} images/sec")
+
+
 model.fit(
     train_ds,
     validation_data=val_ds,
     epochs=15,
-    callbacks=[early_stop]
+    callbacks=[early_stop, EpochTimer(train_images)]
 )
 
 # -------------------------------
@@ -3,6 +3,11 @@ ASGI config for Coffee project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The recommendation and chat views are async (the chat streams the AI reply),
+so run the project with an ASGI server to serve many chats per worker:
+
+    uvicorn Coffee.asgi:application --workers 4
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -14,3 +19,11 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Coffee.settings')
 
 application = get_asgi_application()
+
+# Serve static files in development (runserver does this by itself)
+from django.conf import settings  # noqa: E402
+
+if settings.DEBUG:
+    from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+
+    application = ASGIStaticFilesHandler(application)
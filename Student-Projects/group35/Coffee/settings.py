@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -128,3 +129,33 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
+
+
+# OpenRouter (AI barista)
+OPENROUTER_API_KEY = os.environ.get('OPENROUTER_API_KEY', '')
+OPENROUTER_API_URL = os.environ.get(
+    'OPENROUTER_API_URL', 'https://openrouter.ai/api/v1/chat/completions')
+
+# Connections kept open to OpenRouter (shared by all requests of a worker)
+OPENROUTER_POOL_SIZE = 10
+# Open connections of the async views (one per streaming reply in progress)
+OPENROUTER_ASYNC_CONNECTIONS = 200
+
+# Cache (file based, so the prewarm_recommendations command and the
+# web workers share the same entries)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', BASE_DIR / 'django_cache'),
+    }
+}
+
+# How long a cached recommendation is reused (seconds)
+RECOMMENDATION_CACHE_TTL = 60 * 60 * 6
+
+# Chat memory
+# Approximate tokens of recent messages sent with each chat message;
+# older messages are folded into a rolling summary of the conversation
+CHAT_TOKEN_BUDGET = 1500
+# Always keep at least this many recent messages word for word
+CHAT_KEEP_RECENT = 4
@@ -4,7 +4,10 @@ Registers models for easy management in admin panel
 """
 
 from django.contrib import admin
-from .models import Menu, CoffeeMood
+from .models import (
+    Menu, CoffeeMood, CoffeeMoodDailyStats, Conversation, ConversationMessage,
+    RecommendationCacheStats,
+)
 
 
 @admin.register(Menu)
@@ -44,6 +47,12 @@ class CoffeeMoodAdmin(admin.ModelAdmin):
     # Number of items per page
     list_per_page = 50
     
+    # Browse by date (uses the created_at index)
+    date_hierarchy = 'created_at'
+    
+    # Skip the extra COUNT(*) over the whole table on filtered pages
+    show_full_result_count = False
+    
     # Organize fields into sections
     fieldsets = (
         ('اطلاعات مشتری', {  # "Customer Information"
@@ -52,4 +61,58 @@ class CoffeeMoodAdmin(admin.ModelAdmin):
         ('جزئیات', {  # "Details"
             'fields': ('description', 'time_of_day', 'created_at')
         }),
-    )
\ No newline at end of file
+    )
+
+
+@admin.register(CoffeeMoodDailyStats)
+class CoffeeMoodDailyStatsAdmin(admin.ModelAdmin):
+    """
+    Daily request counts per mood and taste (read-only rollup)
+    """
+    list_display = ['date', 'mood', 'taste', 'count']
+    list_filter = ['mood', 'taste']
+    date_hierarchy = 'date'
+    readonly_fields = ['date', 'mood', 'taste', 'count']
+    list_per_page = 100
+    
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(RecommendationCacheStats)
+class RecommendationCacheStatsAdmin(admin.ModelAdmin):
+    """
+    Daily hit rate of the recommendation cache (read-only)
+    """
+    list_display = ['date', 'hits', 'misses', 'bypassed', 'hit_rate_display']
+    readonly_fields = ['date', 'hits', 'misses', 'bypassed']
+    
+    @admin.display(description="نرخ استفاده از کش")  # "Cache hit rate"
+    def hit_rate_display(self, obj):
+        return f"{obj.hit_rate:.0%}"
+    
+    def has_add_permission(self, request):
+        return False
+
+
+class ConversationMessageInline(admin.TabularInline):
+    """
+    Recent messages of a conversation (read-only)
+    """
+    model = ConversationMessage
+    fields = ['role', 'content', 'tokens', 'created_at']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+
+@admin.register(Conversation)
+class ConversationAdmin(admin.ModelAdmin):
+    """
+    Admin interface for Conversation model
+    Shows the rolling summary and the recent messages
+    """
+    list_display = ['id', 'coffee_mood', 'created_at', 'updated_at']
+    readonly_fields = ['coffee_mood', 'summary', 'created_at', 'updated_at']
+    inlines = [ConversationMessageInline]
+    list_per_page = 50
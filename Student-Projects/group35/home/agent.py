@@ -4,8 +4,177 @@ Handles communication with OpenRouter API (GPT-4o-mini)
 Builds prompts and manages conversation context
 """
 
-import os
+import asyncio
+import json
+import threading
+import weakref
+
+import httpx
 import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+# Model used on OpenRouter
+MODEL = "gpt-4o-mini"  # Using free tier model
+
+# System prompt for recommendations
+SYSTEM_PROMPT = """تو یک باریستای حرفه‌ای و دوستانه هستی که به فارسی صحبت می‌کنی.
+                
+وظیفه‌ات اینه که:
+1. بر اساس حال و احوال مشتری، بهترین قهوه رو پیشنهاد بدی
+2. دلیلش رو به زبون ساده توضیح بدی
+3. لحن دوستانه و صمیمی داشته باشی
+4. اگر نیاز بود، نکاتی درباره طرز تهیه یا زمان مصرف بگی
+
+همیشه پاسخت رو با ایموجی مناسب شروع کن و حداکثر 4-5 جمله باشه."""
+# System prompt: "You are a professional and friendly barista who speaks Persian.
+# Your job: 1) Recommend best coffee based on customer's mood
+# 2) Explain reason simply, 3) Use friendly tone
+# 4) Provide preparation tips if needed
+# Always start with emoji, max 4-5 sentences."
+
+
+# ask_ai / astream_ai_with_history return messages starting with these on errors
+ERROR_PREFIXES = ("❌", "⚠️")
+
+
+def is_error(result):
+    """
+    True if result is an error message instead of an AI response
+    """
+    return result.startswith(ERROR_PREFIXES)
+
+
+# One HTTP session per process, shared by all requests
+# Keeps connections to OpenRouter open, so each call skips the TCP/TLS handshake
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Return the shared requests.Session (created on first use)
+    
+    Returns:
+        requests.Session: Session with a connection pool and auth headers
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=settings.OPENROUTER_POOL_SIZE
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({
+                    "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
+                    "Content-Type": "application/json"
+                })
+                _session = session
+    return _session
+
+
+def chat_completion(messages, temperature, max_tokens):
+    """
+    Send messages to OpenRouter and return the reply text
+    Raises requests exceptions on network/HTTP errors
+    
+    Args:
+        messages (list): List of message dicts with 'role' and 'content'
+        temperature (float): Creativity level
+        max_tokens (int): Maximum response length
+        
+    Returns:
+        str: AI's response text
+    """
+    payload = {
+        "model": MODEL,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+    response = get_session().post(settings.OPENROUTER_API_URL, json=payload, timeout=30)
+    response.raise_for_status()  # Raise exception for HTTP errors
+    return response.json()["choices"][0]["message"]["content"]
+
+
+# Async client for the async views, one per event loop
+# (an httpx.AsyncClient cannot be shared between event loops;
+# under uvicorn there is one loop per worker, so one client per worker)
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client():
+    """
+    Return the shared httpx.AsyncClient of the running event loop
+    
+    Returns:
+        httpx.AsyncClient: Client with a connection pool and auth headers
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            headers={
+                "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
+                "Content-Type": "application/json"
+            },
+            limits=httpx.Limits(max_connections=settings.OPENROUTER_ASYNC_CONNECTIONS),
+            timeout=httpx.Timeout(30, connect=10)
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def achat_completion(messages, temperature, max_tokens):
+    """
+    Async version of chat_completion
+    Raises httpx exceptions on network/HTTP errors
+    """
+    payload = {
+        "model": MODEL,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+    response = await get_async_client().post(settings.OPENROUTER_API_URL, json=payload)
+    response.raise_for_status()
+    return response.json()["choices"][0]["message"]["content"]
+
+
+async def astream_chat_completion(messages, temperature, max_tokens):
+    """
+    Stream the reply from OpenRouter (server-sent events)
+    Raises httpx exceptions on network/HTTP errors
+    
+    Yields:
+        str: Pieces of the response text as they arrive
+    """
+    payload = {
+        "model": MODEL,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "stream": True
+    }
+    async with get_async_client().stream(
+        "POST", settings.OPENROUTER_API_URL, json=payload
+    ) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            # Skip keep-alive comments (": OPENROUTER PROCESSING") and empty lines
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            
+            delta = json.loads(data)["choices"][0].get("delta", {})
+            if delta.get("content"):
+                yield delta["content"]
 
 
 def ask_ai(prompt):
@@ -18,57 +187,19 @@ def ask_ai(prompt):
     Returns:
         str: AI's response text
     """
-    # Get API key from environment variable
-    OPENROUTER_API_KEY = "sk"
-    
     # Check if API key is configured
-    if not OPENROUTER_API_KEY:
+    if not settings.OPENROUTER_API_KEY:
         return "⚠️ کلید API تنظیم نشده است. لطفاً متغیر محیطی OPENROUTER_API_KEY را تنظیم کنید."
         # "⚠️ API key not configured. Please set OPENROUTER_API_KEY environment variable."
     
-    # OpenRouter API endpoint
-    url = "https://openrouter.ai/api/v1/chat/completions"
-    
-    # Request headers
-    headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
-    # Request payload with system prompt and user message
-    payload = {
-        "model": "gpt-4o-mini",  # Using free tier model
-        "messages": [
-            {
-                "role": "system", 
-                "content": """تو یک باریستای حرفه‌ای و دوستانه هستی که به فارسی صحبت می‌کنی.
-                
-وظیفه‌ات اینه که:
-1. بر اساس حال و احوال مشتری، بهترین قهوه رو پیشنهاد بدی
-2. دلیلش رو به زبون ساده توضیح بدی
-3. لحن دوستانه و صمیمی داشته باشی
-4. اگر نیاز بود، نکاتی درباره طرز تهیه یا زمان مصرف بگی
-
-همیشه پاسخت رو با ایموجی مناسب شروع کن و حداکثر 4-5 جمله باشه."""
-                # System prompt: "You are a professional and friendly barista who speaks Persian.
-                # Your job: 1) Recommend best coffee based on customer's mood
-                # 2) Explain reason simply, 3) Use friendly tone
-                # 4) Provide preparation tips if needed
-                # Always start with emoji, max 4-5 sentences."
-            },
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.8,  # Creativity level
-        "max_tokens": 500     # Maximum response length
-    }
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
     
     try:
-        # Send POST request to OpenRouter
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()  # Raise exception for HTTP errors
-        
-        # Extract and return AI response
-        return response.json()["choices"][0]["message"]["content"]
+        # Temperature 0.8: creative recommendations
+        return chat_completion(messages, temperature=0.8, max_tokens=500)
         
     except requests.exceptions.RequestException as e:
         # Handle request/network errors
@@ -81,6 +212,29 @@ def ask_ai(prompt):
         # "❌ Unexpected error"
 
 
+async def aask_ai(prompt):
+    """
+    Async version of ask_ai (used by the async recommendation view)
+    """
+    # Check if API key is configured
+    if not settings.OPENROUTER_API_KEY:
+        return "⚠️ کلید API تنظیم نشده است. لطفاً متغیر محیطی OPENROUTER_API_KEY را تنظیم کنید."
+    
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+    
+    try:
+        return await achat_completion(messages, temperature=0.8, max_tokens=500)
+        
+    except httpx.HTTPError as e:
+        return f"❌ خطا در ارتباط با سرویس هوش مصنوعی: {str(e)}"
+        
+    except Exception as e:
+        return f"❌ خطای غیرمنتظره: {str(e)}"
+
+
 def build_prompt(data):
     """
     Build a prompt from user form data
@@ -127,51 +281,63 @@ def build_prompt(data):
     return prompt
 
 
-def ask_ai_with_history(conversation_history):
+async def astream_ai_with_history(conversation_history):
     """
-    Send full conversation history to AI for contextual responses
-    Used for chat continuation after initial recommendation
+    Send conversation history to AI for contextual responses, streamed
+    Used for chat continuation after initial recommendation (chat widget)
+    On errors the error message is yielded as the last piece
     
     Args:
         conversation_history (list): List of message dicts with 'role' and 'content'
-        
-    Returns:
-        str: AI's contextual response
-    """
-    # Get API key
-    OPENROUTER_API_KEY = "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"
+            (built by conversation.build_messages: summary + recent messages)
     
+    Yields:
+        str: Pieces of the AI's response as they arrive
+    """
     # Check if API key is configured
-    if not OPENROUTER_API_KEY:
-        return "⚠️ کلید API تنظیم نشده است."
-        # "⚠️ API key not configured."
-    
-    # OpenRouter API endpoint
-    url = "https://openrouter.ai/api/v1/chat/completions"
-    
-    # Request headers
-    headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
-    # Request payload with full conversation history
-    payload = {
-        "model": "gpt-4o-mini",
-        "messages": conversation_history,  # Include all previous messages
-        "temperature": 0.7,  # Slightly lower for more consistent responses
-        "max_tokens": 400
-    }
+    if not settings.OPENROUTER_API_KEY:
+        yield "⚠️ کلید API تنظیم نشده است."
+        return
     
     try:
-        # Send request with conversation context
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-        
-        # Return AI's response
-        return response.json()["choices"][0]["message"]["content"]
+        async for piece in astream_chat_completion(
+            conversation_history, temperature=0.7, max_tokens=400
+        ):
+            yield piece
         
     except Exception as e:
-        # Handle errors
-        return f"❌ خطا: {str(e)}"
-        # "❌ Error"
+        yield f"❌ خطا: {str(e)}"
+
+
+async def asummarize_conversation(previous_summary, messages):
+    """
+    Fold old chat messages into the rolling conversation summary
+    Raises on errors (the caller keeps a plain-text fallback)
+    
+    Args:
+        previous_summary (str): Current summary (may be empty)
+        messages (list): Old message dicts with 'role' and 'content'
+        
+    Returns:
+        str: Updated summary
+    """
+    lines = []
+    if previous_summary:
+        lines.append(f"خلاصه قبلی: {previous_summary}")
+        # "Previous summary: ..."
+    for message in messages:
+        speaker = "مشتری" if message["role"] == "user" else "باریستا"
+        # "Customer" / "Barista"
+        lines.append(f"{speaker}: {message['content']}")
+    
+    summary_messages = [
+        {
+            "role": "system",
+            "content": "این گفتگوی یک مشتری با باریستا رو در حداکثر 5 جمله خلاصه کن. "
+                       "حال مشتری، ذائقه‌اش و قهوه‌هایی که پیشنهاد شده رو حتماً نگه دار."
+            # "Summarize this customer-barista conversation in at most 5 sentences.
+            # Always keep the customer's mood, taste and the suggested coffees."
+        },
+        {"role": "user", "content": "\n".join(lines)}
+    ]
+    return await achat_completion(summary_messages, temperature=0.3, max_tokens=200)
@@ -0,0 +1,152 @@
+"""
+Analytics over CoffeeMood requests
+Counts are kept in CoffeeMoodDailyStats (one row per day x mood x taste),
+so "what's trending" reads at most days x moods x tastes rollup rows,
+however many requests are stored.
+"""
+
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import CoffeeMood, CoffeeMoodDailyStats
+from .recommendations import MOODS, canonical
+
+# Rollup bucket for moods that do not map to one canonical mood
+OTHER_MOOD = 'سایر'
+
+
+def rollup_mood(mood):
+    """
+    Canonical mood for the rollup (free text is grouped into a few moods)
+    """
+    return canonical(mood, MOODS) or OTHER_MOOD
+
+
+def record_request(coffee_mood):
+    """
+    Add one request to the daily rollup (called after CoffeeMood is created)
+    """
+    key = {
+        'date': timezone.localdate(coffee_mood.created_at),
+        'mood': rollup_mood(coffee_mood.mood),
+        'taste': coffee_mood.taste,
+    }
+    # Atomic increment: concurrent requests do not lose counts
+    CoffeeMoodDailyStats.objects.get_or_create(**key)
+    CoffeeMoodDailyStats.objects.filter(**key).update(count=F('count') + 1)
+
+
+def save_request(data):
+    """
+    Create the CoffeeMood record of a form submission and count it
+    
+    Args:
+        data (dict): Form cleaned data
+        
+    Returns:
+        CoffeeMood: New record
+    """
+    with transaction.atomic():
+        coffee_mood = CoffeeMood.objects.create(
+            mood=data['mood'],
+            time_of_day='',  # Can be added if needed
+            taste=data['taste'],
+            last_coffee=data['last_coffee'],
+            description=data.get('description', '')
+        )
+        record_request(coffee_mood)
+    return coffee_mood
+
+
+def rebuild_rollups(days=None):
+    """
+    Recompute the rollup from CoffeeMood (batch job, e.g. after importing
+    data or for rows created before the rollup existed)
+    
+    Args:
+        days (int): Only rebuild the last N days (None: everything)
+        
+    Returns:
+        int: Number of rollup rows written
+    """
+    requests = CoffeeMood.objects.order_by()
+    stats = CoffeeMoodDailyStats.objects.all()
+    if days is not None:
+        since = timezone.localdate() - timedelta(days=days - 1)
+        start = timezone.make_aware(datetime.combine(since, time.min))
+        requests = requests.filter(created_at__gte=start)
+        stats = stats.filter(date__gte=since)
+    
+    counts = Counter()
+    for created_at, mood, taste in requests.values_list('created_at', 'mood', 'taste').iterator():
+        counts[(timezone.localdate(created_at), rollup_mood(mood), taste)] += 1
+    
+    with transaction.atomic():
+        stats.delete()
+        CoffeeMoodDailyStats.objects.bulk_create([
+            CoffeeMoodDailyStats(date=date, mood=mood, taste=taste, count=count)
+            for (date, mood, taste), count in counts.items()
+        ], batch_size=500)
+    return len(counts)
+
+
+def _totals(rows, field):
+    # rows: (mood, taste, count) -> {value: count}
+    totals = Counter()
+    for row in rows:
+        totals[row[field]] += row['count']
+    return totals
+
+
+def trending(days=7, limit=5):
+    """
+    What's trending: request counts of the last `days` days compared with
+    the `days` before, by mood, taste and mood x taste
+    Reads only rollup rows (at most 2 x days x moods x tastes)
+    
+    Returns:
+        dict: JSON-ready report
+    """
+    today = timezone.localdate()
+    since = today - timedelta(days=days - 1)
+    previous_since = since - timedelta(days=days)
+    
+    def period(start, end):
+        return list(
+            CoffeeMoodDailyStats.objects
+            .filter(date__gte=start, date__lte=end)
+            .values('mood', 'taste')
+            .annotate(count=Sum('count'))
+        )
+    
+    current = period(since, today)
+    previous = period(previous_since, since - timedelta(days=1))
+    
+    def ranking(field):
+        now, before = _totals(current, field), _totals(previous, field)
+        return [
+            {field: value, 'count': count, 'previous': before[value], 'change': count - before[value]}
+            for value, count in now.most_common()
+        ]
+    
+    moods = ranking('mood')
+    combinations = sorted(current, key=lambda row: row['count'], reverse=True)[:limit]
+    
+    return {
+        'since': since.isoformat(),
+        'until': today.isoformat(),
+        'total': sum(row['count'] for row in current),
+        'previous_total': sum(row['count'] for row in previous),
+        'moods': moods[:limit],
+        'tastes': ranking('taste')[:limit],
+        'combinations': combinations,
+        # Moods that grew most compared with the previous period
+        'rising': sorted(
+            (row for row in moods if row['change'] > 0),
+            key=lambda row: row['change'], reverse=True
+        )[:limit],
+    }
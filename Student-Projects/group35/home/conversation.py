@@ -0,0 +1,193 @@
+"""
+Conversation store for the AI barista chat
+Keeps chat history in the database (not in the session) and bounds what is
+sent to the AI: recent messages within a token budget plus a rolling
+summary of everything older
+"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .agent import asummarize_conversation
+from .models import Conversation, ConversationMessage
+
+# System message of the chat
+SYSTEM_MESSAGE = {"role": "system", "content": "تو یک باریستای حرفهای هستی"}
+
+# Rough average for Persian/English text; no tokenizer is needed for a budget
+CHARS_PER_TOKEN = 3
+
+# Fallback summary size when the AI summary fails
+SUMMARY_MAX_CHARS = 1500
+
+# Compactions running in the background (a reference keeps each task alive)
+_compactions = set()
+
+
+def estimate_tokens(text):
+    """
+    Approximate number of tokens in text
+    """
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def start_conversation(prompt, result, coffee_mood=None):
+    """
+    Create a conversation from the initial recommendation
+    
+    Args:
+        prompt (str): Prompt built from the form
+        result (str): AI recommendation
+        coffee_mood (CoffeeMood): Request that started the chat
+        
+    Returns:
+        Conversation: New conversation
+    """
+    conversation = Conversation.objects.create(coffee_mood=coffee_mood)
+    ConversationMessage.objects.bulk_create([
+        ConversationMessage(conversation=conversation, role="user",
+                            content=prompt, tokens=estimate_tokens(prompt)),
+        ConversationMessage(conversation=conversation, role="assistant",
+                            content=result, tokens=estimate_tokens(result)),
+    ])
+    return conversation
+
+
+def get_conversation(conversation_id):
+    """
+    Return the conversation with this id, or None
+    """
+    if conversation_id is None:
+        return None
+    return Conversation.objects.filter(pk=conversation_id).first()
+
+
+def build_messages(conversation, user_message):
+    """
+    Messages to send to the AI for a new user message:
+    system message, summary of older messages, then as many recent
+    messages as fit in CHAT_TOKEN_BUDGET
+    
+    Returns:
+        list: Message dicts with 'role' and 'content'
+    """
+    budget = settings.CHAT_TOKEN_BUDGET - estimate_tokens(user_message)
+    
+    # Newest first, stop when the budget is used up
+    recent = []
+    for message in conversation.messages.order_by('-id'):
+        budget -= message.tokens
+        if budget < 0 and len(recent) >= settings.CHAT_KEEP_RECENT:
+            break
+        recent.append({"role": message.role, "content": message.content})
+    recent.reverse()
+    
+    messages = [SYSTEM_MESSAGE]
+    if conversation.summary:
+        messages.append({
+            "role": "system",
+            "content": f"خلاصه گفتگوی قبلی: {conversation.summary}"
+            # "Summary of the earlier conversation: ..."
+        })
+    return messages + recent + [{"role": "user", "content": user_message}]
+
+
+def save_turn(conversation, user_message, ai_response):
+    """
+    Save a user message and the AI response
+    """
+    ConversationMessage.objects.bulk_create([
+        ConversationMessage(conversation=conversation, role="user",
+                            content=user_message, tokens=estimate_tokens(user_message)),
+        ConversationMessage(conversation=conversation, role="assistant",
+                            content=ai_response, tokens=estimate_tokens(ai_response)),
+    ])
+
+
+def _fallback_summary(previous_summary, messages):
+    # Plain-text summary when the AI is not reachable: keep the newest part
+    text = " ".join([previous_summary] + [m["content"] for m in messages]).strip()
+    return text[-SUMMARY_MAX_CHARS:]
+
+
+def _messages_to_fold(conversation):
+    # Oldest messages beyond CHAT_TOKEN_BUDGET (the last CHAT_KEEP_RECENT stay)
+    # and the stored summary they extend (reloaded: another compaction may
+    # have changed it since the conversation was loaded)
+    with transaction.atomic():
+        conversation.refresh_from_db(fields=['summary'])
+        messages = list(conversation.messages.all())
+    total = sum(message.tokens for message in messages)
+    
+    old = []
+    while total > settings.CHAT_TOKEN_BUDGET and len(messages) > settings.CHAT_KEEP_RECENT:
+        message = messages.pop(0)
+        total -= message.tokens
+        old.append(message)
+    return old, conversation.summary
+
+
+def _fold(conversation, old, previous_summary, summary):
+    # Replace the old messages by the summary, only if the stored summary is
+    # still the one it was built from and no other compaction has folded
+    # these messages in the meantime; returns False otherwise
+    with transaction.atomic():
+        updated = Conversation.objects.filter(
+            pk=conversation.pk, summary=previous_summary
+        ).update(summary=summary, updated_at=timezone.now())
+        deleted, _ = ConversationMessage.objects.filter(pk__in=[m.pk for m in old]).delete()
+        if not updated or deleted != len(old):
+            transaction.set_rollback(True)
+            return False
+    conversation.summary = summary
+    return True
+
+
+async def acompact(conversation):
+    """
+    Fold the oldest messages into the rolling summary until the stored
+    messages fit in CHAT_TOKEN_BUDGET (the last CHAT_KEEP_RECENT stay)
+    Keeps the stored history bounded
+    """
+    while True:
+        old, previous_summary = await sync_to_async(_messages_to_fold)(conversation)
+        if not old:
+            return
+        
+        old_messages = [{"role": m.role, "content": m.content} for m in old]
+        summary = None
+        if settings.OPENROUTER_API_KEY:
+            try:
+                summary = await asummarize_conversation(previous_summary, old_messages)
+            except Exception:
+                pass
+        if not summary:
+            summary = _fallback_summary(previous_summary, old_messages)
+        
+        # Another compaction got there first: start again from its summary
+        if await sync_to_async(_fold)(conversation, old, previous_summary, summary):
+            return
+
+
+def compact_later(conversation):
+    """
+    Start acompact in the background of the running event loop,
+    so a streamed reply can finish without waiting for the summary
+    (without a long-running loop, e.g. under WSGI, an interrupted compaction
+    is simply done by the next turn)
+    """
+    task = asyncio.create_task(acompact(conversation))
+    _compactions.add(task)
+    task.add_done_callback(_compactions.discard)
+
+
+async def wait_for_compactions():
+    """
+    Wait until the background compactions have finished
+    """
+    while _compactions:
+        await asyncio.gather(*_compactions, return_exceptions=True)
@@ -0,0 +1,46 @@
+"""
+Fill the recommendation cache for every mood x taste x last coffee combination
+
+Usage:
+    python manage.py prewarm_recommendations
+    python manage.py prewarm_recommendations --force --workers 8
+    python manage.py prewarm_recommendations --stats
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from home.models import RecommendationCacheStats
+from home.recommendations import prewarm
+
+
+class Command(BaseCommand):
+    help = "Pre-compute cached AI recommendations and report the cache hit rate"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help="refresh combinations that are already cached")
+        parser.add_argument('--workers', type=int, default=4,
+                            help="concurrent AI requests (default: 4)")
+        parser.add_argument('--stats', action='store_true',
+                            help="only report the hit rate of the last 7 days")
+
+    def handle(self, *args, **options):
+        if not options['stats']:
+            counts = prewarm(force=options['force'], workers=options['workers'])
+            self.stdout.write(
+                f"filled {counts['filled']}, already cached {counts['skipped']}, "
+                f"failed {counts['failed']}"
+            )
+
+        since = timezone.localdate() - timedelta(days=6)
+        rows = RecommendationCacheStats.objects.filter(date__gte=since)
+        for row in rows:
+            self.stdout.write(
+                f"{row.date}: {row.hits} hits, {row.misses} misses, "
+                f"{row.bypassed} not cacheable ({row.hit_rate:.0%} hit rate)"
+            )
+        if not rows:
+            self.stdout.write("no requests in the last 7 days")
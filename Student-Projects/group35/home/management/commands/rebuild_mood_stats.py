@@ -0,0 +1,24 @@
+"""
+Recompute the daily mood/taste rollup from CoffeeMood records
+(new requests are counted as they arrive; this is for old or imported data)
+
+Usage:
+    python manage.py rebuild_mood_stats
+    python manage.py rebuild_mood_stats --days 7
+"""
+
+from django.core.management.base import BaseCommand
+
+from home.analytics import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild CoffeeMoodDailyStats from CoffeeMood"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help="only rebuild the last N days (default: everything)")
+
+    def handle(self, *args, **options):
+        rows = rebuild_rollups(days=options['days'])
+        self.stdout.write(f"wrote {rows} rollup rows")
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0003_conversation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationCacheStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='تاریخ')),
+                ('hits', models.PositiveIntegerField(default=0, verbose_name='از کش')),
+                ('misses', models.PositiveIntegerField(default=0, verbose_name='ارسال به AI')),
+                ('bypassed', models.PositiveIntegerField(default=0, verbose_name='بدون کش')),
+            ],
+            options={
+                'verbose_name': 'آمار کش پیشنهادها',
+                'verbose_name_plural': 'آمار کش پیشنهادها',
+                'ordering': ['-date'],
+            },
+        ),
+    ]
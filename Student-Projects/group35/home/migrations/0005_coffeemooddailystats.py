@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0004_recommendationcachestats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='coffeemood',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='تاریخ ایجاد'),
+        ),
+        migrations.CreateModel(
+            name='CoffeeMoodDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='تاریخ')),
+                ('mood', models.CharField(max_length=50, verbose_name='حال و احوال')),
+                ('taste', models.CharField(max_length=50, verbose_name='ذائقه')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='تعداد')),
+            ],
+            options={
+                'verbose_name': 'آمار روزانه درخواست\u200cها',
+                'verbose_name_plural': 'آمار روزانه درخواست\u200cها',
+                'ordering': ['-date', '-count'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'mood', 'taste'), name='unique_daily_mood_taste')],
+            },
+        ),
+    ]
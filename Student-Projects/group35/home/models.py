@@ -27,7 +27,8 @@ class CoffeeMood(models.Model):
     description = models.CharField(max_length=255, verbose_name="توضیحات")
     
     # Timestamp of when the record was created
-    created_at = models.DateTimeField(auto_now_add=True, verbose_name="تاریخ ایجاد")
+    # Indexed: admin list and date filters sort/filter by it
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name="تاریخ ایجاد")
     
     class Meta:
         verbose_name = "درخواست پیشنهاد قهوه"  # "Coffee Recommendation Request"
@@ -38,6 +39,114 @@ class CoffeeMood(models.Model):
         return f"{self.mood} - {self.taste} ({self.created_at.strftime('%Y-%m-%d')})"
 
 
+class CoffeeMoodDailyStats(models.Model):
+    """
+    Number of CoffeeMood requests per day x mood x taste
+    Updated on every new request (see analytics.record_request), so reports
+    read a few rollup rows instead of scanning CoffeeMood
+    """
+    date = models.DateField(verbose_name="تاریخ")
+    
+    # Canonical mood (see recommendations.MOODS) or "سایر" (other)
+    mood = models.CharField(max_length=50, verbose_name="حال و احوال")
+    
+    taste = models.CharField(max_length=50, verbose_name="ذائقه")
+    
+    count = models.PositiveIntegerField(default=0, verbose_name="تعداد")
+    
+    class Meta:
+        verbose_name = "آمار روزانه درخواست‌ها"  # "Daily request stats"
+        verbose_name_plural = "آمار روزانه درخواست‌ها"
+        ordering = ['-date', '-count']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'mood', 'taste'], name='unique_daily_mood_taste'),
+        ]
+    
+    def __str__(self):
+        return f"{self.date}: {self.mood} - {self.taste} ({self.count})"
+
+
+class RecommendationCacheStats(models.Model):
+    """
+    Daily counters of the recommendation cache
+    Shown in the admin panel (hit rate of common mood/taste requests)
+    """
+    date = models.DateField(unique=True, verbose_name="تاریخ")
+    
+    # Answered from the cache
+    hits = models.PositiveIntegerField(default=0, verbose_name="از کش")
+    
+    # Cacheable, but sent to the AI (then cached)
+    misses = models.PositiveIntegerField(default=0, verbose_name="ارسال به AI")
+    
+    # Not cacheable (free-text description or unknown mood/last coffee)
+    bypassed = models.PositiveIntegerField(default=0, verbose_name="بدون کش")
+    
+    class Meta:
+        verbose_name = "آمار کش پیشنهادها"  # "Recommendation cache stats"
+        verbose_name_plural = "آمار کش پیشنهادها"
+        ordering = ['-date']
+    
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses + self.bypassed
+        return self.hits / total if total else 0.0
+    
+    def __str__(self):
+        return f"{self.date}: {self.hit_rate:.0%}"
+
+
+class Conversation(models.Model):
+    """
+    Chat with the AI barista after a recommendation
+    Stored in the database; the session only keeps the conversation id
+    """
+    # Recommendation request that started the chat
+    coffee_mood = models.ForeignKey(
+        CoffeeMood, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='conversations', verbose_name="درخواست پیشنهاد"
+    )
+    
+    # Rolling summary of messages that no longer fit in the token budget
+    summary = models.TextField(blank=True, verbose_name="خلاصه گفتگو")
+    
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="تاریخ ایجاد")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="آخرین پیام")
+    
+    class Meta:
+        verbose_name = "گفتگو"  # "Conversation"
+        verbose_name_plural = "گفتگوها"  # "Conversations"
+    
+    def __str__(self):
+        return f"گفتگو {self.pk} ({self.created_at.strftime('%Y-%m-%d')})"
+
+
+class ConversationMessage(models.Model):
+    """
+    One recent message of a conversation (user or assistant)
+    Old messages are deleted once they are folded into the summary
+    """
+    conversation = models.ForeignKey(
+        Conversation, on_delete=models.CASCADE, related_name='messages'
+    )
+    
+    # "user" or "assistant"
+    role = models.CharField(max_length=10)
+    
+    content = models.TextField()
+    
+    # Approximate token count of content (see conversation.estimate_tokens)
+    tokens = models.PositiveIntegerField()
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"{self.role}: {self.content[:50]}"
+
+
 class Menu(models.Model):
     """
     Cafe menu items (optional - can use DEFAULT_MENU_ITEMS in views.py instead)
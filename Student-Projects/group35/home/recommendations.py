@@ -0,0 +1,197 @@
+"""
+Recommendation cache
+Form answers are normalized to a small set of canonical choices
+(mood x taste x last coffee), so common requests share one cached AI answer.
+Requests with a free-text description, or with a mood / last coffee that
+does not map to exactly one choice, always go to the AI.
+"""
+
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from .agent import MODEL, aask_ai, ask_ai, build_prompt, is_error
+from .forms import CoffeeAgentForm
+from .models import RecommendationCacheStats
+
+# Canonical mood -> words that select it (Persian and English)
+MOODS = {
+    'خسته': ('خسته', 'خستم', 'بی حال', 'خواب', 'کسل', 'tired', 'sleepy'),
+    'استرس دارم': ('استرس', 'مضطرب', 'نگران', 'عصبی', 'stress', 'anxious'),
+    'شاد': ('شاد', 'خوشحال', 'خوب', 'سرحال', 'پرانرژی', 'happy', 'good'),
+    'آرام': ('آروم', 'آرام', 'ریلکس', 'calm', 'relaxed'),
+    'غمگین': ('غمگین', 'ناراحت', 'دلگیر', 'sad'),
+    'بی حوصله': ('حوصله', 'bored'),
+}
+
+# Canonical last coffee -> words that select it
+LAST_COFFEE = {
+    'چند ساعت پیش': ('ساعت', 'الان', 'hour'),
+    'امروز صبح': ('صبح', 'امروز', 'today', 'morning'),
+    'دیروز': ('دیروز', 'yesterday'),
+    'چند روز پیش': ('چند روز', 'روز پیش', 'days'),
+    'یه هفته پیش یا بیشتر': ('هفته', 'ماه', 'سال', 'week', 'month'),
+}
+
+# Answers with a negation ("خسته نیستم") or many words are not normalized
+NEGATIONS = ('نیستم', 'نیست', 'نه', 'ندارم', 'نداره', 'اصلا', 'not', 'no')
+MAX_WORDS = 4
+
+
+def normalize_text(text):
+    """
+    Lower case, Persian ye/kaf, ZWNJ -> space, no punctuation or emoji
+    """
+    text = text.replace('ي', 'ی').replace('ك', 'ک').replace('\u200c', ' ')
+    text = re.sub(r'[^\w\s]', ' ', text.lower())
+    return ' '.join(text.split())
+
+
+def canonical(value, table):
+    """
+    Canonical choice for a free-text answer, or None if it matches
+    none or several choices
+    """
+    text = normalize_text(value)
+    words = text.split()
+    if not words or len(words) > MAX_WORDS:
+        return None
+    if any(word in NEGATIONS or word.startswith('نمی') for word in words):
+        return None
+    
+    matches = [
+        choice for choice, keywords in table.items()
+        if any(normalize_text(keyword) in text for keyword in keywords)
+    ]
+    return matches[0] if len(matches) == 1 else None
+
+
+def normalize_choices(data):
+    """
+    Canonical form data for caching, or None if the request is not cacheable
+    
+    Args:
+        data (dict): Form cleaned data
+        
+    Returns:
+        dict or None: mood, taste, last_coffee (canonical values)
+    """
+    if data.get('description', '').strip():
+        return None
+    
+    mood = canonical(data['mood'], MOODS)
+    last_coffee = canonical(data['last_coffee'], LAST_COFFEE)
+    if mood is None or last_coffee is None:
+        return None
+    
+    return {'mood': mood, 'taste': data['taste'], 'last_coffee': last_coffee}
+
+
+def cache_key(choices):
+    # Hashed: the choices contain spaces and non-ASCII text
+    text = f"{MODEL}|{choices['mood']}|{choices['taste']}|{choices['last_coffee']}"
+    return "recommendation:" + hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _count(field):
+    # Daily counters shown in the admin panel
+    today = timezone.localdate()
+    RecommendationCacheStats.objects.get_or_create(date=today)
+    RecommendationCacheStats.objects.filter(date=today).update(**{field: F(field) + 1})
+
+
+def _lookup(data):
+    """
+    Cache lookup for the form data
+    
+    Returns:
+        tuple: (prompt, key, result) - key is None if the request is not
+        cacheable, result is None if the AI has to be asked
+    """
+    choices = normalize_choices(data)
+    if choices is None:
+        _count('bypassed')
+        return build_prompt(data), None, None
+    
+    key = cache_key(choices)
+    result = cache.get(key)
+    _count('hits' if result is not None else 'misses')
+    return build_prompt(choices), key, result
+
+
+def _store(key, result):
+    # Never cache error messages
+    if key is not None and not is_error(result):
+        cache.set(key, result, settings.RECOMMENDATION_CACHE_TTL)
+
+
+def get_recommendation(data):
+    """
+    AI recommendation for the form data, from the cache when possible
+    
+    Args:
+        data (dict): Form cleaned data
+        
+    Returns:
+        tuple: (prompt, result) - the prompt is the one the answer belongs to
+    """
+    prompt, key, result = _lookup(data)
+    if result is None:
+        result = ask_ai(prompt)
+        _store(key, result)
+    return prompt, result
+
+
+async def aget_recommendation(data):
+    """
+    Async version of get_recommendation (used by the async view)
+    Cache and database work runs in a thread, the AI request on the event loop
+    """
+    prompt, key, result = await sync_to_async(_lookup)(data)
+    if result is None:
+        result = await aask_ai(prompt)
+        await sync_to_async(_store)(key, result)
+    return prompt, result
+
+
+def all_choices():
+    """
+    Every canonical mood x taste x last coffee combination
+    """
+    tastes = [value for value, _ in CoffeeAgentForm.base_fields['taste'].choices if value]
+    for mood, taste, last_coffee in product(MOODS, tastes, LAST_COFFEE):
+        yield {'mood': mood, 'taste': taste, 'last_coffee': last_coffee}
+
+
+def prewarm(force=False, workers=4):
+    """
+    Fill the cache with an AI answer for every combination
+    
+    Args:
+        force (bool): Also refresh combinations that are already cached
+        workers (int): Concurrent AI requests
+        
+    Returns:
+        dict: Number of combinations filled, skipped (already cached) and failed
+    """
+    todo = [choices for choices in all_choices() if force or cache.get(cache_key(choices)) is None]
+    counts = {'filled': 0, 'skipped': len(list(all_choices())) - len(todo), 'failed': 0}
+    
+    def fill(choices):
+        result = ask_ai(build_prompt(choices))
+        if is_error(result):
+            return False
+        cache.set(cache_key(choices), result, settings.RECOMMENDATION_CACHE_TTL)
+        return True
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for ok in pool.map(fill, todo):
+            counts['filled' if ok else 'failed'] += 1
+    return counts
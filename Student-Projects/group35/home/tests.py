@@ -1,3 +1,360 @@
-from django.test import TestCase
+import asyncio
+import json
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import httpx
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import agent, conversation as conversation_module
+from .conversation import (
+    SYSTEM_MESSAGE, acompact, build_messages, estimate_tokens, save_turn, start_conversation,
+    wait_for_compactions
+)
+from .analytics import rebuild_rollups, trending
+from .models import (
+    CoffeeMood, CoffeeMoodDailyStats, Conversation, ConversationMessage, RecommendationCacheStats
+)
+from .recommendations import all_choices, cache_key, normalize_choices, prewarm
+
+REPLY = '☕ یک اسپرسو بخور'
+
+FORM_DATA = {
+    'mood': 'خسته‌ام',
+    'taste': 'تلخ',
+    'last_coffee': 'دیروز',
+    'description': '',
+}
+
+
+async def read_stream(response):
+    # Chat replies are async streams (consumed like the ASGI server does)
+    return b''.join([chunk async for chunk in response.streaming_content]).decode()
+
+
+async def read_reply(response):
+    # The reply, once the background compaction it started has finished
+    reply = await read_stream(response)
+    await wait_for_compactions()
+    return reply
+
+
+class FakeOpenRouterMixin:
+    """
+    Replaces the OpenRouter calls (sync, async and streaming)
+    self.sent collects the messages of every call; set self.error to fail them
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.sent = []
+        self.error = None
+
+        def complete(messages, temperature, max_tokens):
+            self.sent.append(messages)
+            if self.error:
+                raise self.error
+            return REPLY
+
+        async def acomplete(messages, temperature, max_tokens):
+            return complete(messages, temperature, max_tokens)
+
+        async def astream(messages, temperature, max_tokens):
+            complete(messages, temperature, max_tokens)
+            for word in REPLY.split(' ')[:-1]:
+                yield word + ' '
+            yield REPLY.split(' ')[-1]
+
+        for name, fake in [('chat_completion', complete),
+                           ('achat_completion', acomplete),
+                           ('astream_chat_completion', astream)]:
+            patcher = mock.patch.object(agent, name, fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def chat(self, message):
+        response = self.client.post(
+            reverse('chat_continue'),
+            data=json.dumps({'message': message}),
+            content_type='application/json'
+        )
+        if response.streaming:
+            response.reply = async_to_sync(read_reply)(response)
+        return response
+
+
+@override_settings(
+    OPENROUTER_API_KEY='test-key',
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    CHAT_TOKEN_BUDGET=200,
+    CHAT_KEEP_RECENT=2,
+)
+class ConversationTests(FakeOpenRouterMixin, TestCase):
+
+    def test_session_keeps_only_conversation_id(self):
+        self.client.post(reverse('ai_recommendation'), FORM_DATA)
+        response = self.chat('چرا اسپرسو؟')
+
+        self.assertEqual(response.reply, REPLY)
+        self.assertNotIn('conversation_history', self.client.session)
+        conversation = Conversation.objects.get(pk=self.client.session['conversation_id'])
+        self.assertEqual(conversation.messages.count(), 4)
+
+    def test_history_is_bounded_by_token_budget(self):
+        self.client.post(reverse('ai_recommendation'), FORM_DATA)
+        for i in range(10):
+            self.chat(f'سوال شماره {i} ' * 10)
+
+        conversation = Conversation.objects.get()
+        total = sum(m.tokens for m in conversation.messages.all())
+        self.assertLessEqual(total, 200)
+        self.assertTrue(conversation.summary)
+
+        # The last chat request: system, summary, recent messages, new message
+        # (the other calls are summaries)
+        sent = [messages for messages in self.sent if messages[0] == SYSTEM_MESSAGE][-1]
+        self.assertIn('خلاصه گفتگوی قبلی', sent[1]['content'])
+        self.assertEqual(sent[-1]['content'], 'سوال شماره 9 ' * 10)
+        self.assertLessEqual(sum(estimate_tokens(m['content']) for m in sent[2:]), 200)
+
+    def test_turn_is_saved_before_background_compaction(self):
+        self.client.post(reverse('ai_recommendation'), FORM_DATA)
+        self.async_client.cookies = self.client.cookies
+        release = asyncio.Event()
+
+        async def slow_summary(previous_summary, messages):
+            await release.wait()
+            return 'خلاصه'
+
+        async def chat_while_summarizing():
+            response = await self.async_client.post(
+                reverse('chat_continue'),
+                data=json.dumps({'message': 'سوال ' * 100}),
+                content_type='application/json'
+            )
+            reply = await read_stream(response)
+            # The stream has ended while the summary is still being written
+            saved = await ConversationMessage.objects.acount()
+            release.set()
+            await wait_for_compactions()
+            return reply, saved
+
+        with mock.patch.object(conversation_module, 'asummarize_conversation', slow_summary):
+            reply, saved = async_to_sync(chat_while_summarizing)()
+
+        self.assertEqual((reply, saved), (REPLY, 4))
+        self.assertEqual(Conversation.objects.get().summary, 'خلاصه')
+        self.assertLess(ConversationMessage.objects.count(), 4)
+
+    def test_concurrent_compactions_keep_every_folded_message(self):
+        conversation = start_conversation('پیام1 ' * 50, 'پیام2 ' * 50)
+        save_turn(conversation, 'پیام3 ' * 50, 'پیام4 ' * 50)
+        # Loaded at the start of both requests, before any compaction
+        first_copy = Conversation.objects.get(pk=conversation.pk)
+        second_copy = Conversation.objects.get(pk=conversation.pk)
+        gates = [asyncio.Event(), asyncio.Event()]
+        calls = []
+
+        async def slow_summary(previous_summary, messages):
+            calls.append(len(messages))
+            await gates[min(len(calls), 2) - 1].wait()
+            labels = [m['content'].split()[0] for m in messages]
+            return ' '.join([previous_summary] + labels).strip()
+
+        async def wait_for_call(count):
+            while len(calls) < count:
+                await asyncio.sleep(0.01)
+
+        async def interleaved_compactions():
+            first = asyncio.create_task(acompact(first_copy))
+            await wait_for_call(1)
+            # A turn is saved while the first summary is being written
+            await sync_to_async(save_turn)(conversation, 'پیام5 ' * 50, 'پیام6 ' * 50)
+            second = asyncio.create_task(acompact(second_copy))
+            await wait_for_call(2)
+            gates[0].set()
+            await first
+            gates[1].set()
+            await second
+
+        with mock.patch.object(conversation_module, 'asummarize_conversation', slow_summary):
+            async_to_sync(interleaved_compactions)()
+
+        conversation.refresh_from_db()
+        # The second compaction lost the race and folded again from the new summary
+        self.assertEqual(calls, [2, 4, 2])
+        self.assertEqual(conversation.summary, 'پیام1 پیام2 پیام3 پیام4')
+        remaining = [m.content.split()[0] for m in conversation.messages.all()]
+        self.assertEqual(remaining, ['پیام5', 'پیام6'])
+
+    @override_settings(CHAT_KEEP_RECENT=1)
+    def test_summary_falls_back_when_ai_fails(self):
+        conversation = start_conversation('پرامپت ' * 200, 'پاسخ')
+        self.error = ConnectionError('down')
+
+        async_to_sync(acompact)(conversation)
+
+        conversation.refresh_from_db()
+        self.assertIn('پرامپت', conversation.summary)
+        self.assertEqual(ConversationMessage.objects.filter(conversation=conversation).count(), 1)
+
+    def test_build_messages_keeps_recent_messages(self):
+        conversation = start_conversation('پرامپت', 'پاسخ')
+        messages = build_messages(conversation, 'سلام')
+
+        self.assertEqual([m['role'] for m in messages], ['system', 'user', 'assistant', 'user'])
+        self.assertEqual(estimate_tokens('abc'), 2)
+
+
+@override_settings(
+    OPENROUTER_API_KEY='test-key',
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class RecommendationCacheTests(FakeOpenRouterMixin, TestCase):
+
+    def test_same_choices_call_ai_once(self):
+        self.client.post(reverse('ai_recommendation'), FORM_DATA)
+        # Different wording, same canonical choices
+        response = self.client.post(reverse('ai_recommendation'), dict(FORM_DATA, mood='خستم!'))
+
+        self.assertEqual(response.context['result'], REPLY)
+        self.assertEqual(len(self.sent), 1)
+        stats = RecommendationCacheStats.objects.get()
+        self.assertEqual((stats.hits, stats.misses), (1, 1))
+
+    def test_description_bypasses_cache(self):
+        data = dict(FORM_DATA, description='بدون شکر لطفاً')
+        self.client.post(reverse('ai_recommendation'), data)
+        self.client.post(reverse('ai_recommendation'), data)
+
+        self.assertEqual(len(self.sent), 2)
+        self.assertEqual(RecommendationCacheStats.objects.get().bypassed, 2)
+
+    def test_unclear_answers_are_not_normalized(self):
+        self.assertIsNone(normalize_choices(dict(FORM_DATA, mood='خسته نیستم')))
+        self.assertIsNone(normalize_choices(dict(FORM_DATA, mood='خسته و نگران')))
+        self.assertIsNone(normalize_choices(dict(FORM_DATA, last_coffee='دیروز صبح')))
+
+    def test_errors_are_not_cached(self):
+        self.error = ConnectionError('down')
+        self.client.post(reverse('ai_recommendation'), FORM_DATA)
+
+        self.assertIsNone(cache.get(cache_key(normalize_choices(FORM_DATA))))
+
+    def test_prewarm_fills_every_combination(self):
+        counts = prewarm(workers=2)
+        total = len(list(all_choices()))
+
+        self.assertEqual(counts, {'filled': total, 'skipped': 0, 'failed': 0})
+        self.assertEqual(prewarm()['skipped'], total)
+        self.assertEqual(len(self.sent), total)
+
+        # Requests are now answered without the AI
+        self.client.post(reverse('ai_recommendation'), FORM_DATA)
+        self.assertEqual(len(self.sent), total)
+
+
+@override_settings(
+    OPENROUTER_API_KEY='test-key',
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class StreamingChatTests(FakeOpenRouterMixin, TestCase):
+
+    def test_failed_reply_is_streamed_but_not_saved(self):
+        self.client.post(reverse('ai_recommendation'), FORM_DATA)
+        self.error = ConnectionError('down')
+        response = self.chat('سلام')
+
+        self.assertTrue(response.reply.startswith('❌'))
+        self.assertEqual(ConversationMessage.objects.count(), 2)
+
+    def test_chat_without_conversation_is_rejected(self):
+        response = self.chat('سلام')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
+
+
+class SSEParsingTests(TestCase):
+
+    def test_stream_yields_content_deltas(self):
+        events = [
+            ': OPENROUTER PROCESSING',
+            'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            'data: {"choices": [{"delta": {"content": "☕ "}}]}',
+            'data: {"choices": [{"delta": {"content": "اسپرسو"}}]}',
+            'data: [DONE]',
+        ]
+        body = '\n\n'.join(events).encode()
+
+        def handler(request):
+            self.assertTrue(json.loads(request.content)['stream'])
+            return httpx.Response(200, content=body)
+
+        async def collect():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with mock.patch.object(agent, 'get_async_client', return_value=client):
+                return [piece async for piece in agent.astream_chat_completion([], 0.7, 400)]
+
+        self.assertEqual(async_to_sync(collect)(), ['☕ ', 'اسپرسو'])
+
+
+@override_settings(
+    OPENROUTER_API_KEY='test-key',
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class AnalyticsTests(FakeOpenRouterMixin, TestCase):
+
+    def submit(self, **data):
+        self.client.post(reverse('ai_recommendation'), dict(FORM_DATA, **data))
+
+    def test_requests_are_counted_in_rollup(self):
+        self.submit()
+        self.submit(mood='خستم!')
+        self.submit(mood='یه حس عجیب', taste='ملایم')
+
+        counts = {(row.mood, row.taste): row.count for row in CoffeeMoodDailyStats.objects.all()}
+        self.assertEqual(counts, {('خسته', 'تلخ'): 2, ('سایر', 'ملایم'): 1})
+
+    def test_rebuild_matches_incremental_rollup(self):
+        for mood in ['خسته‌ام', 'شادم', 'استرس دارم', 'خسته']:
+            self.submit(mood=mood)
+        expected = set(CoffeeMoodDailyStats.objects.values_list('date', 'mood', 'taste', 'count'))
+
+        self.assertEqual(rebuild_rollups(days=7), 3)
+        self.assertEqual(
+            set(CoffeeMoodDailyStats.objects.values_list('date', 'mood', 'taste', 'count')), expected)
+
+    def test_trending_compares_with_previous_week(self):
+        today = timezone.localdate()
+        CoffeeMoodDailyStats.objects.bulk_create([
+            CoffeeMoodDailyStats(date=today, mood='خسته', taste='تلخ', count=5),
+            CoffeeMoodDailyStats(date=today - timedelta(days=3), mood='شاد', taste='ملایم', count=2),
+            CoffeeMoodDailyStats(date=today - timedelta(days=10), mood='خسته', taste='تلخ', count=1),
+            CoffeeMoodDailyStats(date=today - timedelta(days=30), mood='شاد', taste='تلخ', count=9),
+        ])
+        report = trending(days=7)
+
+        self.assertEqual((report['total'], report['previous_total']), (7, 1))
+        self.assertEqual(report['moods'][0], {'mood': 'خسته', 'count': 5, 'previous': 1, 'change': 4})
+        self.assertEqual(report['rising'][0]['mood'], 'خسته')
+
+    def test_trending_endpoint_is_staff_only(self):
+        url = reverse('trending')
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        staff = get_user_model().objects.create_user('staff', password='pass', is_staff=True)
+        self.client.force_login(staff)
+        self.submit()
+        data = self.client.get(url).json()
+        self.assertEqual(data['moods'][0]['mood'], 'خسته')
+
+
+class SessionPoolTests(TestCase):
+
+    def test_session_is_shared(self):
+        self.assertIs(agent.get_session(), agent.get_session())
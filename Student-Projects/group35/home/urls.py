@@ -4,7 +4,7 @@ Maps URLs to their corresponding views
 """
 
 from django.urls import path
-from .views import MenuView, AIRecommendationView, ChatContinueView
+from .views import MenuView, AIRecommendationView, ChatContinueView, TrendingView
 
 urlpatterns = [
     # Main menu page - shows cafe menu items
@@ -15,4 +15,7 @@ urlpatterns = [
     
     # AJAX endpoint for chat continuation
     path('chat-continue/', ChatContinueView.as_view(), name='chat_continue'),
+    
+    # Analytics: what's trending this week (staff only, JSON)
+    path('analytics/trending/', TrendingView.as_view(), name='trending'),
 ]
\ No newline at end of file
@@ -3,13 +3,18 @@ Django Views for Coffee AI Recommendation System
 Handles menu display, AI recommendations, and chat functionality
 """
 
+from asgiref.sync import sync_to_async
+from django.contrib.admin.views.decorators import staff_member_required
 from django.shortcuts import render
+from django.utils.decorators import method_decorator
 from django.views import View
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.templatetags.static import static
 from .forms import CoffeeAgentForm
-from .models import CoffeeMood
-from .agent import ask_ai, build_prompt, ask_ai_with_history
+from .agent import astream_ai_with_history, is_error
+from .analytics import save_request, trending
+from .conversation import build_messages, compact_later, get_conversation, save_turn, start_conversation
+from .recommendations import aget_recommendation
 import json
 
 
@@ -94,41 +99,36 @@ class AIRecommendationView(View):
     Handles form display, submission, and AI responses
     """
     
-    def get(self, request):
+    async def get(self, request):
         """
         Display the recommendation form
         """
         form = CoffeeAgentForm()
         return render(request, 'ai_recommendation.html', {'form': form})
     
-    def post(self, request):
+    async def post(self, request):
         """
         Process form submission and get AI recommendation
-        Saves conversation to database and session
+        Saves conversation to database (its id to the session)
+        The worker is not blocked while waiting for the AI
         """
         form = CoffeeAgentForm(request.POST)
         
         if form.is_valid():
-            # Save user input to database
-            coffee_mood = CoffeeMood.objects.create(
-                mood=form.cleaned_data['mood'],
-                time_of_day='',  # Can be added if needed
-                taste=form.cleaned_data['taste'],
-                last_coffee=form.cleaned_data['last_coffee'],
-                description=form.cleaned_data.get('description', '')
-            )
+            # Save user input to database (and count it in the daily stats)
+            coffee_mood = await sync_to_async(save_request)(form.cleaned_data)
             
-            # Build prompt and get AI response
-            prompt = build_prompt(form.cleaned_data)
-            result = ask_ai(prompt)
+            # Get AI response (cached for common mood/taste combinations)
+            prompt, result = await aget_recommendation(form.cleaned_data)
             
-            # Save conversation history to session for chat continuation
-            request.session['conversation_history'] = [
-                {"role": "system", "content": "تو یک باریستای حرفهای هستی"},
-                {"role": "user", "content": prompt},
-                {"role": "assistant", "content": result}
-            ]
-            request.session['coffee_mood_id'] = coffee_mood.id
+            # Save conversation for chat continuation
+            # (only its id goes into the session)
+            conversation = await sync_to_async(start_conversation)(prompt, result, coffee_mood)
+            await sync_to_async(_update_session)(
+                request.session,
+                conversation_id=conversation.id,
+                coffee_mood_id=coffee_mood.id
+            )
             
             # Return form with result and enable chat
             return render(request, 'ai_recommendation.html', {
@@ -145,51 +145,31 @@ class ChatContinueView(View):
     """
     Handle continued conversation with AI
     AJAX endpoint for chat messages
+    The reply is streamed as plain text while the AI writes it
     """
     
-    def post(self, request):
+    async def post(self, request):
         """
-        Process chat message and return AI response
-        Uses conversation history from session
+        Process chat message and stream the AI response
+        Sends the conversation summary and recent messages (within the token budget)
         """
         try:
             # Parse JSON request body
             data = json.loads(request.body)
             user_message = data.get('message', '')
             
-            # Get conversation history from session
-            conversation_history = request.session.get('conversation_history', [])
+            # Get conversation of this session
+            conversation = await sync_to_async(_session_conversation)(request)
             
             # Validate that a conversation exists
-            if not conversation_history:
+            if conversation is None:
                 return JsonResponse({
                     'error': 'لطفاً ابتدا از صفحه پیشنهاد استفاده کنید',
                     'success': False
                 }, status=400)
             
-            # Add new user message to history
-            conversation_history.append({
-                "role": "user",
-                "content": user_message
-            })
-            
-            # Get AI response with full conversation context
-            ai_response = ask_ai_with_history(conversation_history)
-            
-            # Add AI response to history
-            conversation_history.append({
-                "role": "assistant",
-                "content": ai_response
-            })
-            
-            # Save updated history to session
-            request.session['conversation_history'] = conversation_history
-            
-            # Return successful response
-            return JsonResponse({
-                'response': ai_response,
-                'success': True
-            })
+            # Summary + recent messages as context
+            messages = await sync_to_async(build_messages)(conversation, user_message)
             
         except json.JSONDecodeError:
             return JsonResponse({
@@ -203,4 +183,55 @@ class ChatContinueView(View):
             return JsonResponse({
                 'error': str(e),
                 'success': False
-            }, status=500)
\ No newline at end of file
+            }, status=500)
+        
+        return StreamingHttpResponse(
+            self.stream_reply(conversation, user_message, messages),
+            content_type='text/plain; charset=utf-8',
+            # Tell proxies (nginx) not to buffer the stream
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+    
+    async def stream_reply(self, conversation, user_message, messages):
+        """
+        Yield the AI response piece by piece, then save the turn
+        """
+        pieces = []
+        failed = False
+        async for piece in astream_ai_with_history(messages):
+            failed = failed or is_error(piece)
+            pieces.append(piece)
+            yield piece
+        
+        # Save both messages right away, so the next message sees them
+        # Failed replies are not saved
+        if not failed:
+            await sync_to_async(save_turn)(conversation, user_message, ''.join(pieces))
+            # Older messages are folded into the summary in the background
+            # (the stream ends without waiting for the AI summary)
+            compact_later(conversation)
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class TrendingView(View):
+    """
+    Analytics dashboard endpoint (staff only)
+    What's trending: requests of the last N days by mood and taste,
+    compared with the N days before; read from the daily rollup
+    """
+    
+    def get(self, request):
+        try:
+            days = min(max(int(request.GET.get('days', 7)), 1), 90)
+        except ValueError:
+            days = 7
+        return JsonResponse(trending(days=days), json_dumps_params={'ensure_ascii': False})
+
+
+def _session_conversation(request):
+    # Session data is loaded from the database, so this runs in a thread
+    return get_conversation(request.session.get('conversation_id'))
+
+
+def _update_session(session, **values):
+    session.update(values)
@@ -0,0 +1,99 @@
+"""
+Load test for the async recommendation and chat views
+Simulates many users at the same time: each one gets a recommendation,
+then sends chat messages and reads the streamed replies.
+Reports time to first token, full reply time and chat messages per second.
+
+Run against the fake OpenRouter server and an ASGI server:
+    python loadtest/fake_openrouter.py --port 9000
+    OPENROUTER_API_KEY=test \\
+    OPENROUTER_API_URL=http://127.0.0.1:9000/api/v1/chat/completions \\
+        uvicorn Coffee.asgi:application --port 8000
+    python loadtest/chat_load.py --users 200 --messages 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+FORM_DATA = {
+    'mood': 'خسته‌ام',
+    'taste': 'تلخ',
+    'last_coffee': 'دیروز',
+    'description': '',
+}
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+async def run_user(index, args, results):
+    limits = httpx.Limits(max_connections=1)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=120) as client:
+        # Form page sets the CSRF cookie
+        await client.get('/ai-recommendation/')
+        csrf = client.cookies['csrftoken']
+        
+        started = time.perf_counter()
+        response = await client.post('/ai-recommendation/', data=dict(
+            FORM_DATA, csrfmiddlewaretoken=csrf
+        ))
+        response.raise_for_status()
+        results['recommendation'].append(time.perf_counter() - started)
+        
+        for i in range(args.messages):
+            started = time.perf_counter()
+            first_token = None
+            async with client.stream(
+                'POST', '/chat-continue/',
+                json={'message': f'سوال {i} از کاربر {index}'},
+                headers={'X-CSRFToken': csrf}
+            ) as response:
+                response.raise_for_status()
+                async for _ in response.aiter_bytes():
+                    if first_token is None:
+                        first_token = time.perf_counter() - started
+            results['first_token'].append(first_token)
+            results['reply'].append(time.perf_counter() - started)
+
+
+def report(name, values):
+    print(f"{name:<22} mean {statistics.mean(values) * 1000:7.0f} ms   "
+          f"p50 {percentile(values, 50) * 1000:7.0f} ms   "
+          f"p95 {percentile(values, 95) * 1000:7.0f} ms")
+
+
+async def main(args):
+    results = {'recommendation': [], 'first_token': [], 'reply': []}
+    
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(run_user(i, args, results) for i in range(args.users)),
+        return_exceptions=True
+    )
+    seconds = time.perf_counter() - started
+    
+    errors = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    print(f"{args.users} concurrent users, {args.messages} chat messages each, "
+          f"{len(errors)} failed users")
+    if errors:
+        print(f"first error: {errors[0]!r}")
+    if results['reply']:
+        report("recommendation", results['recommendation'])
+        report("chat first token", results['first_token'])
+        report("chat full reply", results['reply'])
+        print(f"{len(results['reply']) / seconds:.1f} chat messages/second "
+              f"({seconds:.1f}s total)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent chat load test")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--messages", type=int, default=3, help="chat messages per user")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,98 @@
+"""
+Fake OpenRouter server for load tests
+Answers POST /api/v1/chat/completions like OpenRouter (streamed server-sent
+events or plain JSON) after a fixed delay per token, without any model.
+Only uses the standard library.
+
+Usage:
+    python loadtest/fake_openrouter.py --port 9000 --tokens 40 --token-delay 0.02
+"""
+
+import argparse
+import asyncio
+import json
+
+# Words of the fake reply (repeated up to --tokens)
+REPLY_WORDS = "☕ یه اسپرسو دوبل بخور تا حسابی سرحال بشی".split()
+
+
+def write_chunk(writer, data):
+    # HTTP/1.1 chunked transfer encoding
+    writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+
+async def handle(reader, writer, args):
+    try:
+        # Keep-alive: several requests per connection
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            payload = json.loads(body or b"{}")
+            words = [REPLY_WORDS[i % len(REPLY_WORDS)] for i in range(args.tokens)]
+            
+            await asyncio.sleep(args.first_token_delay)
+            
+            if payload.get("stream"):
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: text/event-stream\r\n"
+                    b"Transfer-Encoding: chunked\r\n\r\n"
+                )
+                for i, word in enumerate(words):
+                    event = {"choices": [{"delta": {"content": word if i == 0 else " " + word}}]}
+                    write_chunk(writer, f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode())
+                    await writer.drain()
+                    await asyncio.sleep(args.token_delay)
+                write_chunk(writer, b"data: [DONE]\n\n")
+                writer.write(b"0\r\n\r\n")
+            else:
+                await asyncio.sleep(args.token_delay * len(words))
+                data = json.dumps({
+                    "choices": [{"message": {"role": "assistant", "content": " ".join(words)}}]
+                }, ensure_ascii=False).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n" % len(data) + data
+                )
+            await writer.drain()
+    
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def main(args):
+    server = await asyncio.start_server(
+        lambda reader, writer: handle(reader, writer, args), args.host, args.port, backlog=1024
+    )
+    print(f"Fake OpenRouter on http://{args.host}:{args.port}/api/v1/chat/completions")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake OpenRouter server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--tokens", type=int, default=40, help="tokens per reply")
+    parser.add_argument("--first-token-delay", type=float, default=0.3,
+                        help="seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.02,
+                        help="seconds between tokens")
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass